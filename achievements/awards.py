@@ -0,0 +1,92 @@
+"""Set-based award statements shared by the backfill and batch check paths"""
+from typing import Dict, List
+
+from sqlalchemy import select, func, false, values, column, String
+from sqlalchemy.dialects.postgresql import insert
+
+from users.models import UserModel
+from .models import AchievementModel, UserAchievementModel
+
+
+def _upsert_awards(source):
+    """
+    INSERT the (user_id, achievement_id, target_value) rows of source as earned.
+
+    Rows that already exist but were never earned (progress only) are
+    completed; already earned rows are left untouched.
+    """
+    stmt = insert(UserAchievementModel).from_select(
+        ["user_id", "achievement_id", "earned_at", "current_progress", "is_notified"],
+        select(
+            source.c.user_id,
+            source.c.achievement_id,
+            func.now(),
+            source.c.target_value,
+            false()
+        )
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "achievement_id"],
+        set_={
+            "earned_at": stmt.excluded.earned_at,
+            "current_progress": stmt.excluded.current_progress,
+            "updated_at": func.now(),
+        },
+        where=UserAchievementModel.earned_at.is_(None)
+    )
+
+
+def award_from_metric_query(metric_query, achievement_ids: List[str]):
+    """
+    Build one INSERT ... SELECT awarding every achievement in achievement_ids
+    to each user whose (user_id, value) metric reaches its target_value.
+    """
+    metric = metric_query.subquery()
+    source = select(
+        metric.c.user_id,
+        AchievementModel.achievement_id,
+        AchievementModel.target_value
+    ).select_from(
+        metric
+    ).join(
+        UserModel, UserModel.user_id == metric.c.user_id
+    ).join(
+        AchievementModel, AchievementModel.achievement_id.in_(achievement_ids)
+    ).where(
+        metric.c.value >= AchievementModel.target_value
+    ).subquery()
+    return _upsert_awards(source)
+
+
+def award_from_metric_rows(metric_rows, achievements_by_metric: Dict[str, List[str]]):
+    """
+    Build one INSERT ... SELECT awarding achievements from (user_id, metric, value)
+    rows covering any number of users and metrics.
+
+    Each row is compared against the target_value of every achievement on its
+    metric in a single join, so a whole chunk of users is evaluated at once.
+    """
+    milestones = values(
+        column("achievement_id", String), column("metric", String), name="milestones"
+    ).data([
+        (achievement_id, metric)
+        for metric, achievement_ids in achievements_by_metric.items()
+        for achievement_id in achievement_ids
+    ])
+
+    source = select(
+        metric_rows.c.user_id,
+        AchievementModel.achievement_id,
+        AchievementModel.target_value
+    ).select_from(
+        metric_rows
+    ).join(
+        UserModel, UserModel.user_id == metric_rows.c.user_id
+    ).join(
+        milestones, milestones.c.metric == metric_rows.c.metric
+    ).join(
+        AchievementModel, AchievementModel.achievement_id == milestones.c.achievement_id
+    ).where(
+        metric_rows.c.value >= AchievementModel.target_value
+    ).subquery()
+    return _upsert_awards(source)
@@ -0,0 +1,128 @@
+import logging
+from typing import Callable, Dict, List, Optional, Any
+
+from sqlalchemy import select, func, and_, literal, String
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from users.models import UserModel
+from .models import AchievementCounterModel
+from .metrics import METRIC_QUERIES, ACHIEVEMENT_METRICS, COUNTER_METRICS, achievements_by_metric
+from .awards import award_from_metric_query
+
+logger = logging.getLogger(__name__)
+
+
+def seed_counter_from_metric_query(metric_name: str, metric_query):
+    """
+    Build one INSERT ... SELECT setting a counter from its metric query.
+    Counters never move down, so re-seeding cannot undo live increments.
+    """
+    metric = metric_query.subquery()
+    source = select(
+        metric.c.user_id,
+        literal(metric_name, String),
+        metric.c.value
+    ).select_from(
+        metric
+    ).join(
+        UserModel, UserModel.user_id == metric.c.user_id
+    )
+
+    stmt = insert(AchievementCounterModel).from_select(["user_id", "metric", "value"], source)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "metric"],
+        set_={
+            "value": stmt.excluded.value,
+            "updated_at": func.now(),
+        },
+        where=AchievementCounterModel.value < stmt.excluded.value
+    )
+
+
+class AchievementBackfillService:
+    """Grant achievements to existing users who already qualify for them"""
+
+    def __init__(self, db: Session, chunk_size: int = 5000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def backfill(
+        self,
+        achievement_ids: Optional[List[str]] = None,
+        start_after: Optional[str] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        seed_counters: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Walk all users in user_id order, one chunk at a time, awarding every
+        qualifying achievement with one statement per metric per chunk.
+        With seed_counters, the per-user achievement counters are brought up
+        to date as well so live completions continue from the right value.
+
+        Each chunk is committed on its own, so an interrupted run can be
+        resumed by passing the last reported user_id as start_after.
+        """
+        requested = achievement_ids or list(ACHIEVEMENT_METRICS.keys())
+        grouped = achievements_by_metric(requested)
+        skipped = [a for a in requested if a not in ACHIEVEMENT_METRICS]
+        if skipped:
+            logger.warning(f"No server-side metric for {', '.join(skipped)}; skipping")
+
+        total_users = self.db.query(func.count(UserModel.id)).scalar()
+        state = {
+            "total_users": total_users,
+            "users_processed": 0,
+            "awarded": 0,
+            "last_user_id": start_after,
+            "skipped_achievements": skipped,
+        }
+
+        while True:
+            last_user_id, chunk_count = self._next_chunk(state["last_user_id"])
+            if not chunk_count:
+                break
+
+            awarded = 0
+            for metric, metric_achievement_ids in grouped.items():
+                user_filter = self._chunk_filter(state["last_user_id"], last_user_id)
+                stmt = award_from_metric_query(METRIC_QUERIES[metric](user_filter), metric_achievement_ids)
+                awarded += self.db.execute(stmt).rowcount
+            if seed_counters:
+                for metric in COUNTER_METRICS:
+                    user_filter = self._chunk_filter(state["last_user_id"], last_user_id)
+                    self.db.execute(seed_counter_from_metric_query(metric, METRIC_QUERIES[metric](user_filter)))
+            self.db.commit()
+
+            state["users_processed"] += chunk_count
+            state["awarded"] += awarded
+            state["last_user_id"] = last_user_id
+
+            logger.info(
+                f"Backfilled {state['users_processed']}/{total_users} users, "
+                f"{state['awarded']} achievements awarded (last user_id: {last_user_id})"
+            )
+            if progress:
+                progress(dict(state))
+
+        return state
+
+    def _next_chunk(self, start_after: Optional[str]):
+        """Return (last user_id, size) of the next chunk of users after start_after"""
+        query = select(UserModel.user_id).order_by(UserModel.user_id).limit(self.chunk_size)
+        if start_after is not None:
+            query = query.where(UserModel.user_id > start_after)
+        chunk = query.subquery()
+
+        return self.db.execute(
+            select(func.max(chunk.c.user_id), func.count())
+        ).one()
+
+    @staticmethod
+    def _chunk_filter(start_after: Optional[str], last_user_id: str):
+        """Restrict a metric query to the user_id range of the current chunk"""
+        def user_filter(column):
+            if start_after is None:
+                return column <= last_user_id
+            return and_(column > start_after, column <= last_user_id)
+        return user_filter
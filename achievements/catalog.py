@@ -0,0 +1,106 @@
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import or_, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from core.system_state import get_state, set_state
+from .models import AchievementModel
+from .default_achievements import DEFAULT_ACHIEVEMENTS
+
+logger = logging.getLogger(__name__)
+
+CATALOG_HASH_KEY = "achievements.catalog_hash"
+
+# Columns owned by the definitions in default_achievements.py
+CATALOG_FIELDS = [
+    "title", "description", "icon_code_point", "color",
+    "type", "rarity", "target_value", "is_secret",
+]
+
+
+def catalog_hash(definitions: List[Dict[str, Any]]) -> str:
+    """Content hash of the achievement definitions, independent of their order"""
+    canonical = json.dumps(
+        sorted(definitions, key=lambda d: d["achievement_id"]),
+        sort_keys=True
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class AchievementCatalogService:
+    """Keep the achievements table in line with the predefined definitions"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def sync(self, definitions: List[Dict[str, Any]] = DEFAULT_ACHIEVEMENTS) -> Dict[str, Any]:
+        """
+        Diff the definitions against the catalog with a single fetch and write
+        only what changed with one INSERT ... ON CONFLICT DO UPDATE.
+        """
+        columns = [AchievementModel.achievement_id] + [getattr(AchievementModel, f) for f in CATALOG_FIELDS]
+        existing = {row.achievement_id: row for row in self.db.query(*columns).all()}
+
+        created, updated, changes = [], [], []
+        for definition in definitions:
+            current = existing.get(definition["achievement_id"])
+            if current is None:
+                created.append(definition["achievement_id"])
+                changes.append(definition)
+                continue
+            changed_fields = [f for f in CATALOG_FIELDS if getattr(current, f) != definition.get(f)]
+            if changed_fields:
+                updated.append({"achievement_id": definition["achievement_id"], "fields": changed_fields})
+                changes.append(definition)
+
+        if changes:
+            stmt = insert(AchievementModel).values(
+                [{"achievement_id": d["achievement_id"], **{f: d.get(f) for f in CATALOG_FIELDS}} for d in changes]
+            )
+            # The WHERE keeps concurrent syncs from rewriting rows that already match
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["achievement_id"],
+                set_={**{f: getattr(stmt.excluded, f) for f in CATALOG_FIELDS}, "updated_at": func.now()},
+                where=or_(*[getattr(AchievementModel, f).is_distinct_from(getattr(stmt.excluded, f)) for f in CATALOG_FIELDS])
+            )
+            self.db.execute(stmt)
+
+        content_hash = catalog_hash(definitions)
+        set_state(self.db, CATALOG_HASH_KEY, content_hash)
+        self.db.commit()
+
+        return {
+            "created": created,
+            "updated": updated,
+            "unchanged_count": len(definitions) - len(changes),
+            "catalog_hash": content_hash,
+        }
+
+    def sync_if_changed(self, definitions: List[Dict[str, Any]] = DEFAULT_ACHIEVEMENTS) -> Optional[Dict[str, Any]]:
+        """Sync only when the definitions differ from the last synced version"""
+        if get_state(self.db, CATALOG_HASH_KEY) == catalog_hash(definitions):
+            return None
+
+        changeset = self.sync(definitions)
+        logger.info(
+            f"Achievement catalog synced: {len(changeset['created'])} created, "
+            f"{len(changeset['updated'])} updated, {changeset['unchanged_count']} unchanged"
+        )
+        return changeset
+
+
+def sync_catalog_on_startup():
+    """Apply definition changes made since the last deploy"""
+    db = SessionLocal()
+    try:
+        AchievementCatalogService(db).sync_if_changed()
+    except Exception:
+        db.rollback()
+        logger.exception("Achievement catalog sync failed")
+    finally:
+        db.close()
@@ -0,0 +1,222 @@
+"""Set-based achievement metrics.
+
+Every metric is a SELECT returning one ``(user_id, value)`` row per user, so
+achievements can be evaluated for many users in a single statement instead
+of one ``award_achievement`` call per user and milestone.
+"""
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import select, func, case, cast, extract, Date, Integer, Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from tasks.models import TaskCompletionModel
+from statistics.models import UserTaskStreakModel
+
+
+# Builds the user restriction for a metric query from its user_id column
+UserFilter = Callable[[ColumnElement], ColumnElement]
+
+
+# Metric each achievement is measured against; the threshold is the
+# achievement's target_value. Health achievements depend on device data that
+# is never stored server-side, so they cannot be evaluated from the database.
+ACHIEVEMENT_METRICS: Dict[str, str] = {
+    "first_task": "total_completions",
+    "task_master_10": "total_completions",
+    "productivity_pro_50": "total_completions",
+    "task_legend_100": "total_completions",
+    "task_god_500": "total_completions",
+    "week_warrior": "max_streak",
+    "month_champion": "max_streak",
+    "streak_master_100": "max_streak",
+    "unstoppable_365": "max_streak",
+    "consistent_performer": "active_days",
+    "monthly_regular": "active_days",
+    "habit_champion": "consistent_active_days",
+    "multi_tasker": "active_streaks",
+    "juggler": "active_streaks",
+    "early_bird": "early_completions",
+    "night_owl": "late_completions",
+    "weekend_warrior": "weekend_completions",
+    "perfect_week": "perfect_weeks",
+}
+
+# Achievements whose metric only the client can report
+CLIENT_REPORTED_METRICS: Dict[str, str] = {
+    "fitness_friend": "health_tasks",
+    "health_hero": "health_tasks",
+    "wellness_warrior": "health_tasks",
+}
+
+# Parameter names of the per-user check-* endpoints, accepted as metric aliases
+REPORTED_METRIC_ALIASES: Dict[str, str] = {
+    "total_tasks": "total_completions",
+    "current_streak": "max_streak",
+    "concurrent_tasks": "active_streaks",
+}
+
+# Metrics kept as per-user counters that completions advance in place.
+# "sum" counters are incremented, "max" counters only ever move up.
+COUNTER_METRICS: Dict[str, str] = {
+    "total_completions": "sum",
+    "early_completions": "sum",
+    "late_completions": "sum",
+    "weekend_completions": "sum",
+    "max_streak": "max",
+}
+
+# Minimum consistency percentage required by habit_champion
+HABIT_CONSISTENCY_PERCENTAGE = 80
+
+
+def _completion_day():
+    return cast(TaskCompletionModel.completion_date, Date)
+
+
+def _count_completions(user_filter: UserFilter, *conditions) -> Select:
+    return select(
+        TaskCompletionModel.user_id.label("user_id"),
+        func.count().label("value")
+    ).where(
+        user_filter(TaskCompletionModel.user_id), *conditions
+    ).group_by(TaskCompletionModel.user_id)
+
+
+def total_completions(user_filter: UserFilter) -> Select:
+    """Number of task completions per user"""
+    return _count_completions(user_filter)
+
+
+def early_completions(user_filter: UserFilter) -> Select:
+    """Completions logged before 6 AM"""
+    return _count_completions(user_filter, extract("hour", TaskCompletionModel.completion_date) < 6)
+
+
+def late_completions(user_filter: UserFilter) -> Select:
+    """Completions logged at or after 11 PM"""
+    return _count_completions(user_filter, extract("hour", TaskCompletionModel.completion_date) >= 23)
+
+
+def weekend_completions(user_filter: UserFilter) -> Select:
+    """Completions logged on Saturday or Sunday"""
+    return _count_completions(user_filter, extract("dow", TaskCompletionModel.completion_date).in_([0, 6]))
+
+
+def active_days(user_filter: UserFilter) -> Select:
+    """Distinct days with at least one completion"""
+    return select(
+        TaskCompletionModel.user_id.label("user_id"),
+        func.count(func.distinct(_completion_day())).label("value")
+    ).where(
+        user_filter(TaskCompletionModel.user_id)
+    ).group_by(TaskCompletionModel.user_id)
+
+
+def consistent_active_days(user_filter: UserFilter) -> Select:
+    """Active days, or 0 when the user was active on less than 80% of the days since they started"""
+    days = func.count(func.distinct(_completion_day()))
+    span = func.max(_completion_day()) - func.min(_completion_day()) + 1
+    return select(
+        TaskCompletionModel.user_id.label("user_id"),
+        case((days * 100 >= span * HABIT_CONSISTENCY_PERCENTAGE, days), else_=0).label("value")
+    ).where(
+        user_filter(TaskCompletionModel.user_id)
+    ).group_by(TaskCompletionModel.user_id)
+
+
+def max_streak(user_filter: UserFilter) -> Select:
+    """Longest streak ever reached on any task"""
+    return select(
+        UserTaskStreakModel.user_id.label("user_id"),
+        func.max(UserTaskStreakModel.longest_streak).label("value")
+    ).where(
+        user_filter(UserTaskStreakModel.user_id)
+    ).group_by(UserTaskStreakModel.user_id)
+
+
+def active_streaks(user_filter: UserFilter) -> Select:
+    """Number of tasks with a streak currently running"""
+    return select(
+        UserTaskStreakModel.user_id.label("user_id"),
+        func.count().label("value")
+    ).where(
+        user_filter(UserTaskStreakModel.user_id),
+        UserTaskStreakModel.current_streak > 0
+    ).group_by(UserTaskStreakModel.user_id)
+
+
+def perfect_weeks(user_filter: UserFilter) -> Select:
+    """1 when the user has a run of 7 consecutive active days, otherwise 0"""
+    days = select(
+        TaskCompletionModel.user_id.label("user_id"),
+        _completion_day().label("day")
+    ).where(
+        user_filter(TaskCompletionModel.user_id)
+    ).distinct().subquery()
+
+    # Consecutive days share the same (day - row_number) anchor
+    islands = select(
+        days.c.user_id,
+        (days.c.day - cast(func.row_number().over(
+            partition_by=days.c.user_id, order_by=days.c.day
+        ), Integer)).label("anchor")
+    ).subquery()
+
+    runs = select(
+        islands.c.user_id,
+        func.count().label("length")
+    ).group_by(islands.c.user_id, islands.c.anchor).subquery()
+
+    return select(
+        runs.c.user_id.label("user_id"),
+        case((func.max(runs.c.length) >= 7, 1), else_=0).label("value")
+    ).group_by(runs.c.user_id)
+
+
+METRIC_QUERIES: Dict[str, Callable[[UserFilter], Select]] = {
+    "total_completions": total_completions,
+    "max_streak": max_streak,
+    "active_days": active_days,
+    "consistent_active_days": consistent_active_days,
+    "active_streaks": active_streaks,
+    "early_completions": early_completions,
+    "late_completions": late_completions,
+    "weekend_completions": weekend_completions,
+    "perfect_weeks": perfect_weeks,
+}
+
+
+def completion_counter_updates(completion_date: datetime) -> Dict[str, int]:
+    """Counter increments caused by a single completion, mirroring the metric queries above"""
+    updates = {"total_completions": 1}
+    if completion_date.hour < 6:
+        updates["early_completions"] = 1
+    if completion_date.hour >= 23:
+        updates["late_completions"] = 1
+    if completion_date.weekday() in [5, 6]:  # Saturday=5, Sunday=6
+        updates["weekend_completions"] = 1
+    return updates
+
+
+def normalize_reported_metrics(metrics: Dict[str, float]) -> Dict[str, int]:
+    """Translate client-reported values (check-* parameter names allowed) to metric names"""
+    normalized = {REPORTED_METRIC_ALIASES.get(name, name): int(value) for name, value in metrics.items()}
+    if "consistency_percentage" in metrics and "active_days" in metrics:
+        consistent = metrics["consistency_percentage"] >= HABIT_CONSISTENCY_PERCENTAGE
+        normalized["consistent_active_days"] = int(metrics["active_days"]) if consistent else 0
+    normalized.pop("consistency_percentage", None)
+    return normalized
+
+
+def achievements_by_metric(
+    achievement_ids: List[str], include_client_reported: bool = False
+) -> Dict[str, List[str]]:
+    """Group achievement IDs by the metric they are evaluated on, dropping unsupported ones"""
+    mapping = {**ACHIEVEMENT_METRICS, **CLIENT_REPORTED_METRICS} if include_client_reported else ACHIEVEMENT_METRICS
+    grouped: Dict[str, List[str]] = {}
+    for achievement_id in achievement_ids:
+        metric = mapping.get(achievement_id)
+        if metric:
+            grouped.setdefault(metric, []).append(achievement_id)
+    return grouped
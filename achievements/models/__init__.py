@@ -1,7 +1,9 @@
 from .achievement_model import AchievementModel
 from .user_achievement_model import UserAchievementModel
+from .achievement_counter_model import AchievementCounterModel
 
 __all__ = [
     "AchievementModel",
-    "UserAchievementModel"
-]
\ No newline at end of file
+    "UserAchievementModel",
+    "AchievementCounterModel"
+]
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+
+from core.models import BaseModel
+
+
+class AchievementCounterModel(BaseModel):
+    __tablename__ = "achievement_counters"
+    __table_args__ = (
+        UniqueConstraint("user_id", "metric", name="uq_achievement_counters_user_metric"),
+    )
+    
+    user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False, index=True)
+    metric = Column(String(50), nullable=False)  # Metric name from achievements.metrics
+    value = Column(Integer, nullable=False, default=0)
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 
 
-class UserAchievementModel(BaseModel):
+class UserAchievementModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "user_achievements"
+    __table_args__ = (
+        # One row per (user, achievement) so bulk awards can use ON CONFLICT DO NOTHING
+        UniqueConstraint("user_id", "achievement_id", name="uq_user_achievements_user_achievement"),
+    )
     
     user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False, index=True)
     achievement_id = Column(String(100), ForeignKey("achievements.achievement_id"), nullable=False, index=True)
@@ -0,0 +1,184 @@
+"""
+Server-push delivery of newly earned achievements.
+
+Awards are fanned out in-process to every open stream of the user. With
+``achievement_notify_bridge`` enabled, awards are sent through Postgres
+NOTIFY instead and every worker LISTENs and fans them out locally, so a
+stream opened on any worker sees awards made by all of them.
+
+Clients acknowledge what they displayed; acknowledgements are buffered and
+flipped to ``is_notified`` with one UPDATE per flush.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+from typing import Dict, List, Set, Tuple, Any, Union
+
+from sqlalchemy import update, values, column, String, func, Row
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal, engine
+from .models import UserAchievementModel
+from .pydantics import UserAchievementPdtModel
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "achievement_earned"
+
+
+class AchievementBroker:
+    """In-process pub/sub of achievement payloads keyed by user_id"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a queue receiving the user's awards; call from the event loop"""
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        """Remove a queue registered with subscribe"""
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, set())
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id: str, payload: Dict[str, Any]):
+        """Deliver a payload to every stream of the user; safe to call from any thread"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, payload)
+
+
+class PostgresNotifyBridge:
+    """LISTENs on the notify channel and republishes every payload to the local broker"""
+
+    def __init__(self, broker: AchievementBroker, channel: str = NOTIFY_CHANNEL):
+        self.broker = broker
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start listening in a background thread"""
+        self._thread = threading.Thread(target=self._listen, name="achievement-notify-bridge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop listening"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def _listen(self):
+        connection = engine.raw_connection()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+
+            while not self._stop.is_set():
+                if select.select([dbapi_connection], [], [], 5) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notification = dbapi_connection.notifies.pop(0)
+                    payload = json.loads(notification.payload)
+                    self.broker.publish(payload["user_id"], payload)
+        except Exception:
+            logger.exception("Achievement notify bridge stopped")
+        finally:
+            connection.close()
+
+
+class AcknowledgementBuffer:
+    """Collects delivery acknowledgements and marks them notified in batches"""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self._pending: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def add(self, user_id: str, achievement_ids: List[str]) -> bool:
+        """Queue acknowledgements; returns True once a full batch is waiting"""
+        with self._lock:
+            self._pending.update((user_id, achievement_id) for achievement_id in achievement_ids)
+            return len(self._pending) >= self.batch_size
+
+    def flush(self) -> int:
+        """Mark every pending acknowledgement as notified with a single UPDATE"""
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return 0
+
+        acks = values(
+            column("user_id", String), column("achievement_id", String), name="acks"
+        ).data(list(pending))
+
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(UserAchievementModel)
+                .where(
+                    UserAchievementModel.user_id == acks.c.user_id,
+                    UserAchievementModel.achievement_id == acks.c.achievement_id
+                )
+                .values(is_notified=True)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        finally:
+            db.close()
+
+    async def run(self, interval: float):
+        """Flush periodically until cancelled"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception:
+                    logger.exception("Failed to flush achievement acknowledgements")
+        finally:
+            await asyncio.to_thread(self.flush)
+
+
+broker = AchievementBroker()
+ack_buffer = AcknowledgementBuffer(batch_size=settings.achievement_ack_batch_size)
+
+
+def to_payload(user_achievement: Union[UserAchievementModel, Row]) -> Dict[str, Any]:
+    """Serialize a user achievement the way the REST endpoints do"""
+    return UserAchievementPdtModel.model_validate(user_achievement).model_dump(mode="json")
+
+
+def publish_awarded(db: Session, user_achievements: List[Union[UserAchievementModel, Row]]):
+    """Push freshly committed awards to connected clients"""
+    if not user_achievements:
+        return
+
+    payloads = [to_payload(ua) for ua in user_achievements]
+    if settings.achievement_notify_bridge:
+        for payload in payloads:
+            db.execute(func.pg_notify(NOTIFY_CHANNEL, json.dumps(payload)).select())
+        db.commit()
+    else:
+        for payload in payloads:
+            broker.publish(payload["user_id"], payload)
@@ -4,6 +4,9 @@ from .achievement_pydantic import (
 from .user_achievement_pydantic import (
     UserAchievementPdtModel, UserAchievementPdtCreate, UserAchievementPdtUpdate
 )
+from .achievement_check_pydantic import (
+    UserMetricsItem, AchievementBatchCheckRequest, AchievementBatchCheckResponse
+)
 
 __all__ = [
     "AchievementPdtModel",
@@ -11,5 +14,8 @@ __all__ = [
     "AchievementPdtUpdate",
     "UserAchievementPdtModel",
     "UserAchievementPdtCreate",
-    "UserAchievementPdtUpdate"
+    "UserAchievementPdtUpdate",
+    "UserMetricsItem",
+    "AchievementBatchCheckRequest",
+    "AchievementBatchCheckResponse"
 ]
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict
+
+
+class UserMetricsItem(BaseModel):
+    user_id: str = Field(..., min_length=1, max_length=50)
+    # Metric name (or check-* parameter name such as total_tasks) to value
+    metrics: Dict[str, float]
+
+
+class AchievementBatchCheckRequest(BaseModel):
+    users: Optional[List[UserMetricsItem]] = Field(None, max_length=10000)  # Client-reported metrics
+    user_ids: Optional[List[str]] = Field(None, max_length=10000)  # Metrics computed server-side
+    achievement_ids: Optional[List[str]] = None  # Defaults to every supported achievement
+
+    @model_validator(mode="after")
+    def check_exactly_one_source(self):
+        if (self.users is None) == (self.user_ids is None):
+            raise ValueError("Provide either users with metrics or user_ids")
+        return self
+
+
+class AchievementBatchCheckResponse(BaseModel):
+    users_evaluated: int
+    awarded_count: int
+    awarded: Dict[str, List[str]]  # user_id to newly earned achievement IDs
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from core.database import get_db
+from core.config import settings
+from core.database import get_db, SessionLocal
 from .models import AchievementModel, UserAchievementModel
 from .pydantics import (
     AchievementPdtModel, AchievementPdtCreate, AchievementPdtUpdate,
-    UserAchievementPdtModel, UserAchievementPdtCreate, UserAchievementPdtUpdate
+    UserAchievementPdtModel, UserAchievementPdtCreate, UserAchievementPdtUpdate,
+    AchievementBatchCheckRequest, AchievementBatchCheckResponse
 )
 from .service import AchievementService
+from .catalog import AchievementCatalogService
 from .default_achievements import DEFAULT_ACHIEVEMENTS
+from .notifications import broker, ack_buffer, to_payload
 
 router = APIRouter(prefix="/achievements", tags=["achievements"])
 
@@ -90,33 +98,40 @@ def delete_achievement(achievement_id: str, db: Session = Depends(get_db)):
 
 @router.post("/initialize-defaults")
 def initialize_default_achievements(db: Session = Depends(get_db)):
-    """Initialize default achievements from the predefined list"""
-    created_count = 0
-    updated_count = 0
-    
-    for achievement_data in DEFAULT_ACHIEVEMENTS:
-        existing = db.query(AchievementModel).filter(
-            AchievementModel.achievement_id == achievement_data["achievement_id"]
-        ).first()
-        
-        if existing:
-            # Update existing achievement with new data
-            for field, value in achievement_data.items():
-                setattr(existing, field, value)
-            updated_count += 1
-        else:
-            # Create new achievement
-            achievement = AchievementModel(**achievement_data)
-            db.add(achievement)
-            created_count += 1
-    
-    db.commit()
+    """Sync the achievement catalog with the predefined list"""
+    changeset = AchievementCatalogService(db).sync(DEFAULT_ACHIEVEMENTS)
     return {
-        "message": f"Initialized achievements: {created_count} created, {updated_count} updated",
-        "total_achievements": len(DEFAULT_ACHIEVEMENTS)
+        "message": f"Initialized achievements: {len(changeset['created'])} created, {len(changeset['updated'])} updated",
+        "total_achievements": len(DEFAULT_ACHIEVEMENTS),
+        **changeset
     }
 
 
+@router.post("/check-batch", response_model=AchievementBatchCheckResponse)
+def check_achievements_batch(
+    check_request: AchievementBatchCheckRequest,
+    service: AchievementService = Depends(get_achievement_service)
+):
+    """Evaluate achievements for many users in one call"""
+    if check_request.users is not None:
+        user_metrics = {item.user_id: item.metrics for item in check_request.users}
+        awarded = service.check_achievements_batch(
+            user_metrics=user_metrics, achievement_ids=check_request.achievement_ids
+        )
+        users_evaluated = len(user_metrics)
+    else:
+        awarded = service.check_achievements_batch(
+            user_ids=check_request.user_ids, achievement_ids=check_request.achievement_ids
+        )
+        users_evaluated = len(set(check_request.user_ids))
+    
+    return AchievementBatchCheckResponse(
+        users_evaluated=users_evaluated,
+        awarded_count=sum(len(ids) for ids in awarded.values()),
+        awarded=awarded
+    )
+
+
 # User Achievement endpoints
 @router.post("/user", response_model=UserAchievementPdtModel)
 def create_user_achievement(user_achievement: UserAchievementPdtCreate, db: Session = Depends(get_db)):
@@ -165,6 +180,71 @@ def get_user_achievements_by_type(user_id: str, achievement_type: str, db: Sessi
     return user_achievements
 
 
+def _load_unnotified_payloads(user_id: str) -> List[Dict[str, Any]]:
+    """Earned but undelivered achievements, serialized for the stream"""
+    db = SessionLocal()
+    try:
+        return [to_payload(ua) for ua in AchievementService(db).get_unnotified_achievements(user_id)]
+    finally:
+        db.close()
+
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    return f"id: {payload['achievement_id']}\nevent: achievement\ndata: {json.dumps(payload)}\n\n"
+
+
+@router.get("/user/{user_id}/stream")
+async def stream_user_achievements(user_id: str, request: Request):
+    """Push newly earned achievements to the client as Server-Sent Events"""
+    queue = broker.subscribe(user_id)
+
+    async def events():
+        delivered = set()
+        try:
+            # Catch up on anything earned while the client was offline, then go live
+            for payload in await run_in_threadpool(_load_unnotified_payloads, user_id):
+                delivered.add(payload["achievement_id"])
+                yield _sse_event(payload)
+
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), timeout=settings.achievement_stream_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if payload["achievement_id"] in delivered:
+                    continue
+                delivered.add(payload["achievement_id"])
+                yield _sse_event(payload)
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/user/{user_id}/ack", status_code=202)
+async def acknowledge_achievements(user_id: str, achievement_ids: List[str]):
+    """Acknowledge streamed achievements; they are marked notified in the next batch"""
+    if ack_buffer.add(user_id, achievement_ids):
+        await run_in_threadpool(ack_buffer.flush)
+    return {"message": f"Queued {len(achievement_ids)} acknowledgements"}
+
+
+@router.get("/user/{user_id}/counters", response_model=Dict[str, int])
+def get_achievement_counters(
+    user_id: str,
+    service: AchievementService = Depends(get_achievement_service)
+):
+    """Get the server-maintained progress counters for a user"""
+    return service.get_counters(user_id)
+
+
 @router.get("/user/{user_id}/{achievement_id}", response_model=UserAchievementPdtModel)
 def get_user_achievement(user_id: str, achievement_id: str, db: Session = Depends(get_db)):
     """Get a specific user achievement"""
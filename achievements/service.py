@@ -1,9 +1,18 @@
+from sqlalchemy import select, update, func, case, literal, false, values, column, union_all, String, Integer, Row
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from .models import AchievementModel, UserAchievementModel
+from users.models import UserModel
+from .models import AchievementModel, UserAchievementModel, AchievementCounterModel
 from .pydantics import UserAchievementPdtCreate
+from .notifications import publish_awarded
+from .metrics import (
+    COUNTER_METRICS, ACHIEVEMENT_METRICS, CLIENT_REPORTED_METRICS, METRIC_QUERIES,
+    achievements_by_metric, completion_counter_updates, normalize_reported_metrics
+)
+from .awards import award_from_metric_rows
 
 
 class AchievementService:
@@ -43,6 +52,7 @@ class AchievementService:
         self.db.add(user_achievement)
         self.db.commit()
         self.db.refresh(user_achievement)
+        publish_awarded(self.db, [user_achievement])
         
         return user_achievement
     
@@ -72,14 +82,200 @@ class AchievementService:
             AchievementModel.achievement_id == achievement_id
         ).first()
         
+        newly_earned = False
         if achievement and progress >= achievement.target_value and not user_achievement.earned_at:
             user_achievement.earned_at = datetime.utcnow()
+            newly_earned = True
         
         self.db.commit()
         self.db.refresh(user_achievement)
+        if newly_earned:
+            publish_awarded(self.db, [user_achievement])
         
         return user_achievement
     
+    def record_completion(
+        self, user_id: str, completion_date: datetime, longest_streak: Optional[int] = None
+    ) -> List[Row]:
+        """Advance the user's counters for one task completion and award what they unlock"""
+        updates = completion_counter_updates(completion_date)
+        if longest_streak:
+            updates["max_streak"] = longest_streak
+        return self.apply_counter_updates(user_id, updates)
+    
+    def remove_completion(self, user_id: str, completion_date: datetime):
+        """
+        Take back the counter increments of a deleted task completion. Progress
+        on unearned achievements goes down with them; earned achievements and
+        max_streak, the longest streak ever reached, are kept.
+        """
+        counters = self._subtract_counters(user_id, completion_counter_updates(completion_date))
+        self._project_counters(user_id, counters)
+        self.db.commit()
+    
+    def apply_counter_updates(self, user_id: str, updates: Dict[str, int]) -> List[Row]:
+        """
+        Apply counter updates and project the new values onto every achievement
+        sharing each metric, in two statements. Returns the user_achievements
+        rows newly earned.
+        """
+        counters = self._upsert_counters(user_id, updates)
+        earned = self._project_counters(user_id, counters)
+        self.db.commit()
+        publish_awarded(self.db, earned)
+        return earned
+    
+    def get_counters(self, user_id: str) -> Dict[str, int]:
+        """Get the user's achievement counters by metric"""
+        rows = self.db.query(AchievementCounterModel.metric, AchievementCounterModel.value).filter(
+            AchievementCounterModel.user_id == user_id
+        ).all()
+        return {metric: value for metric, value in rows}
+    
+    def _upsert_counters(self, user_id: str, updates: Dict[str, int]) -> Dict[str, int]:
+        """Atomically add to (or raise) each counter and return the resulting values"""
+        data = [(metric, value) for metric, value in updates.items() if metric in COUNTER_METRICS]
+        if not data:
+            return {}
+        
+        rows = values(column("metric", String), column("value", Integer), name="updates").data(data)
+        max_metrics = [metric for metric, kind in COUNTER_METRICS.items() if kind == "max"]
+        
+        # Selecting through users skips unknown user IDs instead of violating the foreign key
+        stmt = insert(AchievementCounterModel).from_select(
+            ["user_id", "metric", "value"],
+            select(UserModel.user_id, rows.c.metric, rows.c.value).join_from(
+                rows, UserModel, UserModel.user_id == user_id
+            )
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "metric"],
+            set_={
+                "value": case(
+                    (AchievementCounterModel.metric.in_(max_metrics),
+                     func.greatest(AchievementCounterModel.value, stmt.excluded.value)),
+                    else_=AchievementCounterModel.value + stmt.excluded.value
+                ),
+                "updated_at": func.now(),
+            }
+        ).returning(AchievementCounterModel.metric, AchievementCounterModel.value)
+        
+        return {metric: value for metric, value in self.db.execute(stmt).all()}
+    
+    def _subtract_counters(self, user_id: str, amounts: Dict[str, int]) -> Dict[str, int]:
+        """Atomically lower existing "sum" counters, never below zero, and return the resulting values"""
+        data = [(metric, amount) for metric, amount in amounts.items() if COUNTER_METRICS.get(metric) == "sum"]
+        if not data:
+            return {}
+        
+        rows = values(column("metric", String), column("amount", Integer), name="amounts").data(data)
+        stmt = update(AchievementCounterModel).where(
+            AchievementCounterModel.user_id == user_id,
+            AchievementCounterModel.metric == rows.c.metric
+        ).values(
+            value=func.greatest(AchievementCounterModel.value - rows.c.amount, 0),
+            updated_at=func.now()
+        ).returning(AchievementCounterModel.metric, AchievementCounterModel.value)
+        
+        return {metric: value for metric, value in self.db.execute(stmt).all()}
+    
+    def _project_counters(self, user_id: str, counters: Dict[str, int]) -> List[Row]:
+        """Write counter values as progress on all achievements of each metric, earning those reached"""
+        grouped = achievements_by_metric(list(ACHIEVEMENT_METRICS.keys()))
+        progress = [
+            (achievement_id, value)
+            for metric, value in counters.items()
+            for achievement_id in grouped.get(metric, [])
+        ]
+        if not progress:
+            return []
+        
+        rows = values(
+            column("achievement_id", String), column("value", Integer), name="progress"
+        ).data(progress)
+        reached = rows.c.value >= AchievementModel.target_value
+        source = select(
+            literal(user_id, String),
+            AchievementModel.achievement_id,
+            case((reached, func.now())),
+            func.least(rows.c.value, AchievementModel.target_value),
+            false()
+        ).join_from(rows, AchievementModel, AchievementModel.achievement_id == rows.c.achievement_id)
+        
+        stmt = insert(UserAchievementModel).from_select(
+            ["user_id", "achievement_id", "earned_at", "current_progress", "is_notified"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "achievement_id"],
+            set_={
+                "earned_at": stmt.excluded.earned_at,
+                "current_progress": stmt.excluded.current_progress,
+                "updated_at": func.now(),
+            },
+            # Earned rows are final; unchanged progress is not rewritten
+            where=UserAchievementModel.earned_at.is_(None)
+            & UserAchievementModel.current_progress.is_distinct_from(stmt.excluded.current_progress)
+        ).returning(*UserAchievementModel.__table__.c)
+        
+        return [row for row in self.db.execute(stmt).all() if row.earned_at is not None]
+    
+    def check_achievements_batch(
+        self,
+        user_metrics: Optional[Dict[str, Dict[str, float]]] = None,
+        user_ids: Optional[List[str]] = None,
+        achievement_ids: Optional[List[str]] = None,
+        chunk_size: int = 1000
+    ) -> Dict[str, List[str]]:
+        """
+        Evaluate achievements for many users at once, either from metrics the
+        caller reports (user_metrics) or from metrics computed in the database
+        (user_ids). Each chunk of users is awarded with a single statement.
+        Returns the newly earned achievement IDs per user.
+        """
+        reported = user_metrics is not None
+        requested = achievement_ids or list({**ACHIEVEMENT_METRICS, **CLIENT_REPORTED_METRICS}.keys())
+        grouped = achievements_by_metric(requested, include_client_reported=reported)
+        awarded: Dict[str, List[str]] = {}
+        if not grouped:
+            return awarded
+        
+        if reported:
+            items = list(user_metrics.items())
+            for start in range(0, len(items), chunk_size):
+                data = [
+                    (user_id, metric, value)
+                    for user_id, metrics in items[start:start + chunk_size]
+                    for metric, value in normalize_reported_metrics(metrics).items()
+                    if metric in grouped
+                ]
+                if data:
+                    rows = values(
+                        column("user_id", String), column("metric", String), column("value", Integer),
+                        name="reported"
+                    ).data(data)
+                    self._apply_batch_awards(award_from_metric_rows(rows, grouped), awarded)
+        else:
+            unique_ids = list(dict.fromkeys(user_ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                chunk = unique_ids[start:start + chunk_size]
+                rows = union_all(*[
+                    METRIC_QUERIES[metric](lambda user_column: user_column.in_(chunk)).add_columns(
+                        literal(metric, String).label("metric")
+                    )
+                    for metric in grouped
+                ]).subquery()
+                self._apply_batch_awards(award_from_metric_rows(rows, grouped), awarded)
+        
+        return awarded
+    
+    def _apply_batch_awards(self, stmt, awarded: Dict[str, List[str]]):
+        """Run one award statement, commit it and notify the affected users"""
+        earned = self.db.execute(stmt.returning(*UserAchievementModel.__table__.c)).all()
+        self.db.commit()
+        publish_awarded(self.db, earned)
+        for row in earned:
+            awarded.setdefault(row.user_id, []).append(row.achievement_id)
+    
     def check_task_completion_achievements(self, user_id: str, total_tasks: int, tasks_today: int) -> List[UserAchievementModel]:
         """Check and award task completion achievements"""
         newly_awarded = []
@@ -0,0 +1,112 @@
+"""
+Background-refreshed dashboard statistics.
+
+The dashboard is served from an in-memory snapshot, so opening it costs
+no database work on the request path. The snapshot is recomputed every
+admin_dashboard_refresh_seconds by a background task. The counts come
+from a single statement:
+
+- users and tasks are counted exactly until pg_class.reltuples estimates
+  them at admin_dashboard_estimate_threshold rows or more, and estimated
+  from then on;
+- completions and active streaks are the sums of the denormalized
+  counters on tasks (see tasks.counters), which are exact and only read
+  the task catalog.
+
+The five most recent completions come from the completion_date index.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, func, case, cast, literal, table, column, BigInteger, desc
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from users.models import UserModel
+from tasks.models import TaskModel, TaskCompletionModel
+from admin.shared.models import AdminDashboardStats, AdminTaskCompletionResponse
+
+logger = logging.getLogger(__name__)
+
+pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+def _row_count(db: Session, model, estimate_threshold: int):
+    """Count of a table's rows, estimated from pg_class on Postgres once it is large"""
+    exact = select(func.count()).select_from(model).scalar_subquery()
+    if db.get_bind().dialect.name != "postgresql":
+        return exact
+    # reltuples is -1 until the table is first analyzed, which falls back to the exact count
+    estimate = (
+        select(cast(pg_class.c.reltuples, BigInteger))
+        .where(pg_class.c.oid == cast(literal(model.__tablename__), REGCLASS))
+        .scalar_subquery()
+    )
+    return case((estimate >= estimate_threshold, estimate), else_=exact)
+
+
+def compute_dashboard_stats(db: Session, estimate_threshold: int) -> AdminDashboardStats:
+    """Read the dashboard statistics: all counts in one statement, then the recent completions"""
+    counters = select(
+        func.coalesce(func.sum(TaskModel.completion_count), 0).label("total_completions"),
+        func.coalesce(func.sum(TaskModel.active_streak_count), 0).label("active_streaks"),
+    ).subquery()
+    counts = db.execute(
+        select(
+            _row_count(db, UserModel, estimate_threshold).label("total_users"),
+            _row_count(db, TaskModel, estimate_threshold).label("total_tasks"),
+            *counters.c,
+        )
+    ).one()
+
+    recent_completions = db.scalars(
+        select(TaskCompletionModel).order_by(desc(TaskCompletionModel.completion_date)).limit(5)
+    ).all()
+
+    return AdminDashboardStats(
+        total_users=counts.total_users,
+        total_tasks=counts.total_tasks,
+        total_completions=counts.total_completions,
+        active_streaks=counts.active_streaks,
+        recent_completions=[AdminTaskCompletionResponse.model_validate(comp) for comp in recent_completions],
+        refreshed_at=datetime.now(timezone.utc),
+    )
+
+
+class DashboardSnapshot:
+    """The latest dashboard statistics of this worker"""
+
+    def __init__(self):
+        self.stats: Optional[AdminDashboardStats] = None
+
+    def refresh(self) -> AdminDashboardStats:
+        """Recompute the statistics in a session of their own"""
+        db = SessionLocal()
+        try:
+            self.stats = compute_dashboard_stats(db, settings.admin_dashboard_estimate_threshold)
+            return self.stats
+        finally:
+            db.close()
+
+    async def get(self) -> AdminDashboardStats:
+        """The current statistics, computed off the event loop if there are none yet"""
+        if self.stats is None:
+            return await asyncio.to_thread(self.refresh)
+        return self.stats
+
+
+dashboard_snapshot = DashboardSnapshot()
+
+
+async def refresh_dashboard_periodically(interval_seconds: float):
+    """Refresh the dashboard snapshot every interval_seconds until cancelled"""
+    while True:
+        try:
+            await asyncio.to_thread(dashboard_snapshot.refresh)
+        except Exception:
+            logger.exception("Admin dashboard refresh failed")
+        await asyncio.sleep(interval_seconds)
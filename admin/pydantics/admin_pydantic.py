@@ -21,6 +21,9 @@ class AdminTaskResponse(BaseModel):
     id: int
     title: str
     type: TaskTypeEnum
+    completion_count: int = 0
+    scheduled_count: int = 0
+    active_streak_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime]
 
@@ -90,3 +93,4 @@ class AdminDashboardStats(BaseModel):
     total_completions: int
     active_streaks: int
     recent_completions: List[AdminTaskCompletionResponse]
+    refreshed_at: Optional[datetime] = None
@@ -23,7 +23,7 @@ async def admin_tasks(
 ):
     """List all tasks"""
     offset = (page - 1) * limit
-    tasks = db.query(TaskModel).offset(offset).limit(limit).all()
+    tasks = db.query(TaskModel).order_by(TaskModel.id).offset(offset).limit(limit).all()
     total_tasks = db.query(TaskModel).count()
     total_pages = (total_tasks + limit - 1) // limit
     
@@ -31,7 +31,7 @@ async def admin_tasks(
         "tasks.html",
         {
             "request": request,
-            "tasks": [AdminTaskResponse.from_attributes(task) for task in tasks],
+            "tasks": [AdminTaskResponse.model_validate(task) for task in tasks],
             "current_page": page,
             "total_pages": total_pages,
             "config": ADMIN_CONFIG
@@ -48,5 +48,5 @@ async def get_tasks_api(
 ):
     """API endpoint to get tasks data"""
     offset = (page - 1) * limit
-    tasks = db.query(TaskModel).offset(offset).limit(limit).all()
-    return [AdminTaskResponse.from_attributes(task) for task in tasks]
+    tasks = db.query(TaskModel).order_by(TaskModel.id).offset(offset).limit(limit).all()
+    return [AdminTaskResponse.model_validate(task) for task in tasks]
@@ -12,16 +12,18 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 # Import your database configuration and models
 from core.config import settings
 from core.database.base import Base
-from core.models import BaseModel
+from core.models import BaseModel, SystemStateModel, SyncTombstoneModel
 # Import all models so they're registered with Base
 from tasks.models.task_model import TaskModel
 from tasks.models.scheduled_task_model import ScheduledTaskModel
 from tasks.models.task_completion_model import TaskCompletionModel
 from users.models import UserModel
 from schedules.models.schedule_model import ScheduleModel
+from schedules.models.recurrence_rule_model import RecurrenceRuleModel
 from statistics.models.user_task_streak_model import UserTaskStreakModel
 from achievements.models.achievement_model import AchievementModel
 from achievements.models.user_achievement_model import UserAchievementModel
+from achievements.models.achievement_counter_model import AchievementCounterModel
 from history.models.history_model import HistoryModel
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,44 @@
+"""unique_user_achievement
+
+Revision ID: a3c1e7f2b9d4
+Revises: 0d22e1b5e404
+Create Date: 2025-06-02 09:15:42.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e7f2b9d4'
+down_revision: Union[str, None] = '0d22e1b5e404'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep a single row per (user_id, achievement_id), preferring the earned one
+    op.execute("""
+        DELETE FROM user_achievements ua
+        USING (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY user_id, achievement_id
+                ORDER BY earned_at IS NULL, earned_at, id
+            ) AS rn
+            FROM user_achievements
+        ) ranked
+        WHERE ua.id = ranked.id AND ranked.rn > 1
+    """)
+    op.create_unique_constraint(
+        'uq_user_achievements_user_achievement',
+        'user_achievements',
+        ['user_id', 'achievement_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_user_achievements_user_achievement', 'user_achievements', type_='unique')
@@ -0,0 +1,43 @@
+"""add_achievement_counters
+
+Revision ID: 5b8e2d91c7fa
+Revises: a3c1e7f2b9d4
+Create Date: 2025-06-03 10:40:08.527716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d91c7fa'
+down_revision: Union[str, None] = 'a3c1e7f2b9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('achievement_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=False),
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'metric', name='uq_achievement_counters_user_metric')
+    )
+    op.create_index(op.f('ix_achievement_counters_id'), 'achievement_counters', ['id'], unique=False)
+    op.create_index(op.f('ix_achievement_counters_user_id'), 'achievement_counters', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_achievement_counters_user_id'), table_name='achievement_counters')
+    op.drop_index(op.f('ix_achievement_counters_id'), table_name='achievement_counters')
+    op.drop_table('achievement_counters')
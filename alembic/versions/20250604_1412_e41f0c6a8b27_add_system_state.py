@@ -0,0 +1,40 @@
+"""add_system_state
+
+Revision ID: e41f0c6a8b27
+Revises: 5b8e2d91c7fa
+Create Date: 2025-06-04 14:12:51.904372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41f0c6a8b27'
+down_revision: Union[str, None] = '5b8e2d91c7fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('system_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.Text(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_system_state_id'), 'system_state', ['id'], unique=False)
+    op.create_index(op.f('ix_system_state_key'), 'system_state', ['key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_system_state_key'), table_name='system_state')
+    op.drop_index(op.f('ix_system_state_id'), table_name='system_state')
+    op.drop_table('system_state')
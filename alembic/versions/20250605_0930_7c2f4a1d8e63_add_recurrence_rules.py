@@ -0,0 +1,51 @@
+"""add_recurrence_rules
+
+Revision ID: 7c2f4a1d8e63
+Revises: e41f0c6a8b27
+Create Date: 2025-06-05 09:30:41.208153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f4a1d8e63'
+down_revision: Union[str, None] = 'e41f0c6a8b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recurrence_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('frequency', sa.Enum('DAILY', 'WEEKDAYS', 'INTERVAL', 'WEEKLY', name='recurrencefrequencyenum'), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('weekdays', sa.JSON(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('materialized_until', sa.Date(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurrence_rules_id'), 'recurrence_rules', ['id'], unique=False)
+    op.create_index(op.f('ix_recurrence_rules_user_id'), 'recurrence_rules', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_recurrence_rules_user_id'), table_name='recurrence_rules')
+    op.drop_index(op.f('ix_recurrence_rules_id'), table_name='recurrence_rules')
+    op.drop_table('recurrence_rules')
+    sa.Enum(name='recurrencefrequencyenum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,107 @@
+"""add_sync_change_tracking
+
+Revision ID: 9d4e6b3a2f15
+Revises: 7c2f4a1d8e63
+Create Date: 2025-06-06 11:20:17.664021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e6b3a2f15'
+down_revision: Union[str, None] = '7c2f4a1d8e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Change-tracked tables and whether they have a user_id column
+TRACKED_TABLES = {
+    'schedules': True,
+    'scheduled_tasks': False,
+    'task_completions': True,
+    'user_task_streaks': True,
+    'history': True,
+    'user_achievements': True,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE sync_change_seq")
+    
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=True),
+    sa.Column('change_seq', sa.BigInteger(), server_default=sa.text("nextval('sync_change_seq')"), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_tombstones_id'), 'sync_tombstones', ['id'], unique=False)
+    op.create_index('ix_sync_tombstones_user_id_change_seq', 'sync_tombstones', ['user_id', 'change_seq'], unique=False)
+    
+    op.execute("""
+    CREATE OR REPLACE FUNCTION sync_touch_change_seq() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_seq := nextval('sync_change_seq');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+    DECLARE
+        owner varchar(50) := to_jsonb(OLD) ->> 'user_id';
+    BEGIN
+        IF owner IS NULL AND TG_TABLE_NAME = 'scheduled_tasks' THEN
+            SELECT user_id INTO owner FROM schedules WHERE id = OLD.schedule_id;
+        END IF;
+        INSERT INTO sync_tombstones (table_name, row_id, user_id, change_seq)
+        VALUES (TG_TABLE_NAME, OLD.id, owner, nextval('sync_change_seq'));
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    
+    for table, has_user_id in TRACKED_TABLES.items():
+        # Existing rows are numbered by the default while the column is added
+        op.add_column(table, sa.Column(
+            'change_seq', sa.BigInteger(), server_default=sa.text("nextval('sync_change_seq')"), nullable=False
+        ))
+        if has_user_id:
+            op.create_index(f'ix_{table}_user_id_change_seq', table, ['user_id', 'change_seq'], unique=False)
+        else:
+            op.create_index(f'ix_{table}_change_seq', table, ['change_seq'], unique=False)
+        op.execute(
+            f"CREATE TRIGGER {table}_touch_change_seq BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_touch_change_seq()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, has_user_id in TRACKED_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_touch_change_seq ON {table}")
+        if has_user_id:
+            op.drop_index(f'ix_{table}_user_id_change_seq', table_name=table)
+        else:
+            op.drop_index(f'ix_{table}_change_seq', table_name=table)
+        op.drop_column(table, 'change_seq')
+    
+    op.execute("DROP FUNCTION IF EXISTS sync_record_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS sync_touch_change_seq()")
+    op.drop_index('ix_sync_tombstones_user_id_change_seq', table_name='sync_tombstones')
+    op.drop_index(op.f('ix_sync_tombstones_id'), table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.execute("DROP SEQUENCE sync_change_seq")
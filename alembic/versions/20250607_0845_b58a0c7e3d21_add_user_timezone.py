@@ -0,0 +1,28 @@
+"""add_user_timezone
+
+Revision ID: b58a0c7e3d21
+Revises: 9d4e6b3a2f15
+Create Date: 2025-06-07 08:45:52.310487
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58a0c7e3d21'
+down_revision: Union[str, None] = '9d4e6b3a2f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('timezone', sa.String(length=50), server_default='UTC', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'timezone')
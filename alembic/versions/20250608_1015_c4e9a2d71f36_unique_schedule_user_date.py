@@ -0,0 +1,47 @@
+"""unique_schedule_user_date
+
+Revision ID: c4e9a2d71f36
+Revises: b58a0c7e3d21
+Create Date: 2025-06-08 10:15:27.604918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a2d71f36'
+down_revision: Union[str, None] = 'b58a0c7e3d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merge duplicate (user_id, date) schedules into the oldest one: move their
+    # scheduled tasks over first, then delete the emptied duplicates
+    op.execute("""
+        CREATE TEMPORARY TABLE schedule_duplicates ON COMMIT DROP AS
+        SELECT id, MIN(id) OVER (PARTITION BY user_id, date) AS keep_id
+        FROM schedules
+    """)
+    op.execute("DELETE FROM schedule_duplicates WHERE id = keep_id")
+    op.execute("""
+        UPDATE scheduled_tasks st
+        SET schedule_id = d.keep_id
+        FROM schedule_duplicates d
+        WHERE st.schedule_id = d.id
+    """)
+    op.execute("""
+        DELETE FROM schedules s
+        USING schedule_duplicates d
+        WHERE s.id = d.id
+    """)
+    op.create_unique_constraint('uq_schedules_user_date', 'schedules', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_schedules_user_date', 'schedules', type_='unique')
@@ -0,0 +1,39 @@
+"""add_task_title_search_indexes
+
+Revision ID: e71b5c9f0a48
+Revises: c4e9a2d71f36
+Create Date: 2025-06-09 09:10:44.182736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71b5c9f0a48'
+down_revision: Union[str, None] = 'c4e9a2d71f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_title'), 'tasks', ['title'], unique=False)
+    # Substring and similarity search on titles (GET /tasks/search)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_tasks_title_trgm',
+        'tasks',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
+    op.drop_index(op.f('ix_tasks_title'), table_name='tasks')
@@ -0,0 +1,41 @@
+"""add_task_counters
+
+Revision ID: f83d2a6c1b57
+Revises: e71b5c9f0a48
+Create Date: 2025-06-10 13:40:18.529314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f83d2a6c1b57'
+down_revision: Union[str, None] = 'e71b5c9f0a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('completion_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('scheduled_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('active_streak_count', sa.Integer(), server_default='0', nullable=False))
+    # Seed the counters from the existing rows
+    op.execute("""
+        UPDATE tasks t
+        SET completion_count = (SELECT COUNT(*) FROM task_completions c WHERE c.task_id = t.id),
+            scheduled_count = (SELECT COUNT(*) FROM scheduled_tasks s WHERE s.task_id = t.id),
+            active_streak_count = (
+                SELECT COUNT(*) FROM user_task_streaks us WHERE us.task_id = t.id AND us.current_streak > 0
+            )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'active_streak_count')
+    op.drop_column('tasks', 'scheduled_count')
+    op.drop_column('tasks', 'completion_count')
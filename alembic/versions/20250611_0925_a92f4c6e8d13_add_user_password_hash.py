@@ -0,0 +1,29 @@
+"""add_user_password_hash
+
+Revision ID: a92f4c6e8d13
+Revises: f83d2a6c1b57
+Create Date: 2025-06-11 09:25:47.118604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92f4c6e8d13'
+down_revision: Union[str, None] = 'f83d2a6c1b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_admin_user.py used to add this column by hand
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'password_hash')
@@ -0,0 +1,28 @@
+"""add_user_token_version
+
+Revision ID: d36b8e1f4a70
+Revises: a92f4c6e8d13
+Create Date: 2025-06-12 11:05:32.640271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd36b8e1f4a70'
+down_revision: Union[str, None] = 'a92f4c6e8d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,28 @@
+"""index_task_completion_date
+
+Revision ID: b4c81d9e2f06
+Revises: d36b8e1f4a70
+Create Date: 2025-06-13 14:20:09.357812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c81d9e2f06'
+down_revision: Union[str, None] = 'd36b8e1f4a70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_task_completions_completion_date'), 'task_completions', ['completion_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_completions_completion_date'), table_name='task_completions')
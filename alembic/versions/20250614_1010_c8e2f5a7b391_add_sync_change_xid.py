@@ -0,0 +1,74 @@
+"""add_sync_change_xid
+
+Revision ID: c8e2f5a7b391
+Revises: b4c81d9e2f06
+Create Date: 2025-06-14 10:10:44.902137
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f5a7b391'
+down_revision: Union[str, None] = 'b4c81d9e2f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Change-tracked tables and whether they have a user_id column
+TRACKED_TABLES = {
+    'schedules': True,
+    'scheduled_tasks': False,
+    'task_completions': True,
+    'user_task_streaks': True,
+    'history': True,
+    'user_achievements': True,
+    'sync_tombstones': True,
+}
+
+CURRENT_XID = "(pg_current_xact_id()::text::bigint)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION sync_touch_change_seq() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_seq := nextval('sync_change_seq');
+        NEW.change_xid := {CURRENT_XID};
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    for table, has_user_id in TRACKED_TABLES.items():
+        # Existing rows are all committed; 0 sorts them before any new change
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False))
+        op.alter_column(table, 'change_xid', server_default=sa.text(CURRENT_XID))
+        if has_user_id:
+            op.drop_index(f'ix_{table}_user_id_change_seq', table_name=table)
+            op.create_index(f'ix_{table}_user_id_change', table, ['user_id', 'change_xid', 'change_seq'], unique=False)
+        else:
+            op.drop_index(f'ix_{table}_change_seq', table_name=table)
+            op.create_index(f'ix_{table}_change', table, ['change_xid', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, has_user_id in TRACKED_TABLES.items():
+        if has_user_id:
+            op.drop_index(f'ix_{table}_user_id_change', table_name=table)
+            op.create_index(f'ix_{table}_user_id_change_seq', table, ['user_id', 'change_seq'], unique=False)
+        else:
+            op.drop_index(f'ix_{table}_change', table_name=table)
+            op.create_index(f'ix_{table}_change_seq', table, ['change_seq'], unique=False)
+        op.drop_column(table, 'change_xid')
+    op.execute("""
+    CREATE OR REPLACE FUNCTION sync_touch_change_seq() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_seq := nextval('sync_change_seq');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
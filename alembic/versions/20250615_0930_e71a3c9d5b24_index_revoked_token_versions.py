@@ -0,0 +1,31 @@
+"""index_revoked_token_versions
+
+Revision ID: e71a3c9d5b24
+Revises: c8e2f5a7b391
+Create Date: 2025-06-15 09:30:27.614093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71a3c9d5b24'
+down_revision: Union[str, None] = 'c8e2f5a7b391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_users_revoked_token_version', 'users', ['id', 'token_version'], unique=False,
+        postgresql_where=sa.text('token_version > 0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_revoked_token_version', table_name='users')
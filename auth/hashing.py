@@ -0,0 +1,81 @@
+"""
+Password hashing off the request threads.
+
+bcrypt is slow on purpose, so hashing and verification run on a dedicated
+executor with password_hash_workers threads instead of the threadpool that
+serves every sync endpoint; bcrypt releases the GIL while it works, so the
+workers use one core each. At most password_hash_max_pending operations may
+be queued or running at once. Beyond that PasswordHasherBusy is raised
+immediately, and the router answers 503, rather than letting a login burst
+pile up behind the executor.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from core.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many hashing operations are already pending"""
+
+
+def verify_and_upgrade(
+    password: str, password_hash: str, context: CryptContext = pwd_context
+) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its hash. When it matches and the hash uses an
+    outdated scheme or cost factor, also return a fresh hash to store.
+    """
+    if not context.verify(password, password_hash):
+        return False, None
+    if context.needs_update(password_hash):
+        return True, context.hash(password)
+    return True, None
+
+
+class PasswordHasher:
+    """Runs CryptContext operations (pwd_context by default) on a bounded executor of its own"""
+
+    def __init__(self, workers: int, max_pending: int, context: CryptContext = pwd_context):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.context = context
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy(f"{self._pending} password hashing operations already pending")
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """verify_and_upgrade on the executor"""
+        return await self._run(verify_and_upgrade, password, password_hash, self.context)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers or os.cpu_count() or 1,
+    max_pending=settings.password_hash_max_pending
+)
@@ -0,0 +1,112 @@
+"""
+Cache of resolved principals.
+
+Every authenticated request turns the token subject (the user's email)
+into a user. The result is kept per worker as a frozen AuthenticatedUser,
+never as an ORM instance, so entries cannot lazy-load, go stale with a
+session or leak between threads. Unknown subjects are cached as well, for
+a shorter time, so a stream of tokens for a deleted user does not reach
+the database on every request.
+
+Entries of a user are dropped once a session commits a change to them
+(update, delete, or creation for a cached unknown subject). Other workers
+notice within principal_cache_ttl_seconds.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from users.models import UserModel
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Snapshot of the user behind a token"""
+    id: int
+    user_id: str
+    name: str
+    email: str
+    timezone: str
+
+    @classmethod
+    def from_model(cls, user: UserModel) -> "AuthenticatedUser":
+        return cls(id=user.id, user_id=user.user_id, name=user.name, email=user.email, timezone=user.timezone)
+
+
+# Cached value of a subject that matched no user
+_UNKNOWN = object()
+
+
+class PrincipalCache(TTLCache):
+    """TTLCache of AuthenticatedUser by token subject, with negative entries"""
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        super().__init__(maxsize, ttl)
+        self.negative_ttl = negative_ttl
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+
+    def resolve(self, db: Session, subject: str) -> Optional[AuthenticatedUser]:
+        """Return the user behind a token subject, reading through to the database on a miss"""
+        principal = self.get(subject)
+        if principal is not None:
+            return None if principal is _UNKNOWN else principal
+
+        generation = self._generation
+        user = db.scalars(select(UserModel).where(UserModel.email == subject)).first()
+        principal = AuthenticatedUser.from_model(user) if user is not None else None
+        with self._generation_lock:
+            # Skip the store when the user changed while we were reading it
+            if generation == self._generation:
+                if principal is None:
+                    self.set(subject, _UNKNOWN, ttl=self.negative_ttl)
+                else:
+                    self.set(subject, principal)
+        return principal
+
+    def invalidate_subjects(self, subjects: Iterable[str]):
+        """Drop the entries of the given subjects"""
+        with self._generation_lock:
+            self._generation += 1
+            for subject in subjects:
+                self.invalidate(subject)
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds,
+    negative_ttl=settings.principal_cache_negative_ttl_seconds
+)
+
+
+def invalidate_principals(session: Session, subjects: Iterable[str]):
+    """Drop cached principals once the session commits; for writes made with Core statements"""
+    session.info.setdefault("principal_changes", set()).update(subjects)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, flush_context):
+    subjects = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, UserModel):
+            history = inspect(obj).attrs["email"].history
+            subjects.update(value for value in (*history.unchanged, *history.added, *history.deleted) if value)
+    if subjects:
+        invalidate_principals(session, subjects)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_changes(session: Session):
+    subjects = session.info.pop("principal_changes", None)
+    if subjects:
+        principal_cache.invalidate_subjects(subjects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session):
+    session.info.pop("principal_changes", None)
@@ -2,6 +2,7 @@
 
 from .auth_pydantic import (
     TokenPdt,
+    RefreshTokenPdt,
     TokenDataPdt,
     UserLoginPdt,
     UserRegisterPdt,
@@ -11,6 +12,7 @@ from .auth_pydantic import (
 
 __all__ = [
     "TokenPdt",
+    "RefreshTokenPdt",
     "TokenDataPdt",
     "UserLoginPdt",
     "UserRegisterPdt",
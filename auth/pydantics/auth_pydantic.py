@@ -5,6 +5,12 @@ from typing import Optional
 class TokenPdt(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Seconds until the access token expires
+
+
+class RefreshTokenPdt(BaseModel):
+    refresh_token: str
 
 
 class TokenDataPdt(BaseModel):
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import timedelta
 
 from core.database import get_db
-from core.config import settings
-from .pydantics import TokenPdt, UserRegisterPdt
+from .hashing import PasswordHasherBusy
+from .principals import AuthenticatedUser, principal_cache
+from .pydantics import TokenPdt, RefreshTokenPdt, UserRegisterPdt
 from .service import AuthService
-from users.models import UserModel
+from .tokens import ACCESS_TOKEN, decode_token, principal_from_claims
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -21,30 +21,53 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
 def get_current_authenticated_user(
     token: str = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service)
-) -> UserModel:
-    """Dependency to get the current authenticated user"""
-    email = auth_service.verify_token(token)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+) -> AuthenticatedUser:
+    """
+    Dependency to get the current authenticated user. Access tokens carry
+    the user's claims, so this normally runs without a database query.
+    """
+    credentials_error = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    claims = decode_token(token)
+    if claims is None or claims.get("sub") is None:
+        raise credentials_error
     
-    user = auth_service.get_user_by_email(email)
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    if "type" not in claims:
+        # Tokens issued before claims were embedded only carry the email
+        user = principal_cache.resolve(auth_service.db, claims["sub"])
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        return user
     
+    if claims["type"] != ACCESS_TOKEN:
+        raise credentials_error
+    user = principal_from_claims(claims)
+    if user is None:
+        raise credentials_error
     return user
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=dict)
-def register(user_data: UserRegisterPdt, auth_service: AuthService = Depends(get_auth_service)):
+async def register(user_data: UserRegisterPdt, auth_service: AuthService = Depends(get_auth_service)):
     """Register a new user"""
-    user = auth_service.register_user(user_data)
+    try:
+        user = await auth_service.register_user(user_data)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,12 +77,15 @@ def register(user_data: UserRegisterPdt, auth_service: AuthService = Depends(get
 
 
 @router.post("/token", response_model=TokenPdt)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    """Authenticate user and return access token"""
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
+    """Authenticate user and return an access and refresh token"""
+    try:
+        user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,17 +93,36 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return auth_service.issue_tokens(user)
+
+
+@router.post("/refresh", response_model=TokenPdt)
+def refresh(body: RefreshTokenPdt, auth_service: AuthService = Depends(get_auth_service)):
+    """Exchange a refresh token for a new token pair with up-to-date claims"""
+    user = auth_service.redeem_refresh_token(body.refresh_token)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or revoked refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return auth_service.issue_tokens(user)
+
+
+@router.post("/revoke")
+def revoke_tokens(
+    current_user: AuthenticatedUser = Depends(get_current_authenticated_user),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    """Sign out everywhere: invalidate every token issued to the current user"""
+    if not auth_service.revoke_tokens(current_user.user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return {"message": "All tokens revoked"}
 
 
 @router.get("/me")
 def get_current_user(
-    current_user: UserModel = Depends(get_current_authenticated_user)
+    current_user: AuthenticatedUser = Depends(get_current_authenticated_user)
 ):
     """Get current authenticated user"""
     return {"id": current_user.id, "name": current_user.name, "email": current_user.email}
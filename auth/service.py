@@ -1,15 +1,15 @@
 from sqlalchemy.orm import Session
 from typing import Optional
-from datetime import datetime, timedelta, timezone
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from datetime import timedelta
+from starlette.concurrency import run_in_threadpool
 
 from core.config import settings
 from users.models import UserModel
+from .hashing import pwd_context, password_hasher
 from .pydantics import UserLoginPdt, UserRegisterPdt
-
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .tokens import (
+    ACCESS_TOKEN, REFRESH_TOKEN, encode_token, decode_token, access_claims, refresh_claims, token_versions
+)
 
 
 class AuthService:
@@ -24,35 +24,79 @@ class AuthService:
         """Hash a password"""
         return pwd_context.hash(password)
 
-    def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
-        """Authenticate a user by email and password"""
-        user = self.db.query(UserModel).filter(UserModel.email == email).first()
-        if not user:
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        """
+        Authenticate a user by email and password, hashing on the password
+        executor. A hash with an outdated cost factor is replaced on success.
+        """
+        user = await run_in_threadpool(self.get_user_by_email, email)
+        if not user or not user.password_hash:
             return None
-        if not self.verify_password(password, user.password_hash):
+        verified, new_hash = await password_hasher.verify(password, user.password_hash)
+        if not verified:
             return None
+        if new_hash:
+            await run_in_threadpool(self._store_password_hash, user, new_hash)
         return user
 
-    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None):
-        """Create a JWT access token"""
-        to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
-        return encoded_jwt
-
-    def register_user(self, user_data: UserRegisterPdt) -> Optional[UserModel]:
-        """Register a new user"""
+    def _store_password_hash(self, user: UserModel, password_hash: str):
+        user.password_hash = password_hash
+        self.db.commit()
+        self.db.refresh(user)
+
+    def create_access_token(self, user: UserModel) -> str:
+        """Create a short-lived JWT access token carrying the user's claims"""
+        return encode_token(
+            access_claims(user), ACCESS_TOKEN, timedelta(minutes=settings.access_token_expire_minutes)
+        )
+
+    def create_refresh_token(self, user: UserModel) -> str:
+        """Create a long-lived JWT refresh token"""
+        return encode_token(
+            refresh_claims(user), REFRESH_TOKEN, timedelta(days=settings.refresh_token_expire_days)
+        )
+
+    def issue_tokens(self, user: UserModel) -> dict:
+        """Access and refresh token pair for a user just read from the database"""
+        token_versions.observe([(user.id, user.token_version)])
+        return {
+            "access_token": self.create_access_token(user),
+            "refresh_token": self.create_refresh_token(user),
+            "token_type": "bearer",
+            "expires_in": settings.access_token_expire_minutes * 60,
+        }
+
+    def redeem_refresh_token(self, token: str) -> Optional[UserModel]:
+        """Return the user of a valid, unrevoked refresh token"""
+        claims = decode_token(token)
+        if claims is None or claims.get("type") != REFRESH_TOKEN:
+            return None
+        user = self.get_user_by_user_id(claims.get("sub"))
+        # uid tells a re-created user apart from the deleted one that held the user_id
+        if user is None or claims.get("uid") != user.id or claims.get("ver") != user.token_version:
+            return None
+        return user
+
+    def revoke_tokens(self, user_id: str) -> bool:
+        """Invalidate every token issued to a user so far"""
+        user = self.get_user_by_user_id(user_id)
+        if user is None:
+            return False
+        user.token_version += 1
+        self.db.commit()
+        return True
+
+    async def register_user(self, user_data: UserRegisterPdt) -> Optional[UserModel]:
+        """Register a new user, hashing the password on the password executor"""
         # Check if user already exists
-        existing_user = self.db.query(UserModel).filter(UserModel.email == user_data.email).first()
+        existing_user = await run_in_threadpool(self.get_user_by_email, user_data.email)
         if existing_user:
             return None
         
-        # Create new user
-        hashed_password = self.get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
+        return await run_in_threadpool(self._create_user, user_data, hashed_password)
+
+    def _create_user(self, user_data: UserRegisterPdt, hashed_password: str) -> UserModel:
         db_user = UserModel(
             name=user_data.name,
             email=user_data.email,
@@ -68,13 +112,6 @@ class AuthService:
         """Get user by email"""
         return self.db.query(UserModel).filter(UserModel.email == email).first()
 
-    def verify_token(self, token: str) -> Optional[str]:
-        """Verify JWT token and return email"""
-        try:
-            payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-            email: str = payload.get("sub")
-            if email is None:
-                return None
-            return email
-        except JWTError:
-            return None
+    def get_user_by_user_id(self, user_id: str) -> Optional[UserModel]:
+        """Get user by user_id"""
+        return self.db.query(UserModel).filter(UserModel.user_id == user_id).first()
@@ -0,0 +1,217 @@
+"""
+Self-contained access tokens and their revocation.
+
+Access tokens carry everything a request needs to know about the caller:
+the user's user_id (sub), database id, token version and a minimal profile
+(name, email, timezone). They are short-lived (access_token_expire_minutes)
+and are accepted without touching the database. Refresh tokens live
+longer (refresh_token_expire_days), and redeeming one is the only
+authentication step that reads the users table.
+
+Revocation works through users.token_version. Bumping it invalidates
+every token issued before, and each worker keeps an in-memory map of the
+latest version per users.id (the uid claim). The map is fed by local
+commits (a version bump, or a user deletion, which revokes everything)
+and by a periodic re-read of the users whose version has ever moved (a
+partial index keeps that to the revoked users only). Keying on the row
+id rather than the client-chosen user_id means a user re-created under
+the same user_id starts from a clean slate.
+
+Deleted users have no row left to read, so the deleting transaction also
+writes a tombstone to system_state. The sync reads the tombstones along
+with the versions, and prunes them once they are older than an access
+token lifetime, since every token they revoke has expired by then.
+
+A revocation or deletion made on another worker therefore takes effect
+here within token_version_sync_seconds; the refresh endpoint always
+checks the database. Profile claims may lag an edit by at most one access
+token lifetime.
+"""
+import asyncio
+import logging
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy import event, select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from core.models import SystemStateModel
+from users.models import UserModel
+from .principals import AuthenticatedUser
+
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+# Version recorded for deleted users: no token of theirs is current any more.
+# Row ids are never reused, so the entry never needs to be lifted.
+REVOKED = sys.maxsize
+
+# system_state key prefix of the tombstones of deleted users, followed by their users.id
+DELETED_USER_KEY_PREFIX = "auth.deleted_user:"
+
+
+class TokenVersionMap:
+    """Latest known token version per users.id"""
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, versions: Iterable[Tuple[int, int]]):
+        """Record (users.id, version) pairs; versions never move backwards"""
+        with self._lock:
+            for uid, version in versions:
+                if version > self._versions.get(uid, 0):
+                    self._versions[uid] = version
+
+    def is_current(self, uid: int, version: int) -> bool:
+        """Whether a token issued at version is still valid for the user with id uid"""
+        return version >= self._versions.get(uid, 0)
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+token_versions = TokenVersionMap()
+
+
+def encode_token(claims: dict, token_type: str, expires_delta: timedelta) -> str:
+    """Sign claims as a JWT of the given type expiring after expires_delta"""
+    now = datetime.now(timezone.utc)
+    to_encode = {**claims, "type": token_type, "iat": now, "exp": now + expires_delta}
+    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """Claims of a validly signed, unexpired token, or None"""
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+
+
+def access_claims(user: UserModel) -> dict:
+    """Claims of an access token for user"""
+    return {
+        "sub": user.user_id,
+        "uid": user.id,
+        "ver": user.token_version,
+        "name": user.name,
+        "email": user.email,
+        "tz": user.timezone,
+    }
+
+
+def refresh_claims(user: UserModel) -> dict:
+    """Claims of a refresh token for user"""
+    return {"sub": user.user_id, "uid": user.id, "ver": user.token_version}
+
+
+def principal_from_claims(claims: dict) -> Optional[AuthenticatedUser]:
+    """The caller described by access token claims, or None when they are incomplete or revoked"""
+    try:
+        principal = AuthenticatedUser(
+            id=claims["uid"],
+            user_id=claims["sub"],
+            name=claims["name"],
+            email=claims["email"],
+            timezone=claims["tz"],
+        )
+        version = int(claims["ver"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not token_versions.is_current(principal.id, version):
+        return None
+    return principal
+
+
+def subject_of_authorization(authorization: str) -> Optional[str]:
+    """user_id behind a "Bearer <token>" header, for per-user rate limits; None when invalid"""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = decode_token(token.strip())
+    return claims.get("sub") if claims else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_token_versions(session: Session, flush_context):
+    versions = session.info.setdefault("token_versions", {})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, UserModel) and obj.token_version:
+            versions[obj.id] = max(versions.get(obj.id, 0), obj.token_version)
+    for obj in session.deleted:
+        if isinstance(obj, UserModel):
+            versions[obj.id] = REVOKED
+
+
+@event.listens_for(Session, "before_commit")
+def _record_deleted_users(session: Session):
+    # Deletes may still be pending here, or already flushed and collected above
+    deleted = {uid for uid, version in session.info.get("token_versions", {}).items() if version == REVOKED}
+    deleted.update(obj.id for obj in session.deleted if isinstance(obj, UserModel))
+    if not deleted:
+        return
+    stmt = insert(SystemStateModel).values([
+        {"key": f"{DELETED_USER_KEY_PREFIX}{uid}", "value": str(REVOKED)} for uid in sorted(deleted)
+    ])
+    session.execute(stmt.on_conflict_do_update(index_elements=["key"], set_={"updated_at": func.now()}))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_token_versions(session: Session):
+    versions = session.info.pop("token_versions", None)
+    if versions:
+        token_versions.observe(versions.items())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_token_versions(session: Session):
+    session.info.pop("token_versions", None)
+
+
+def sync_token_versions(db: Session) -> int:
+    """Load the versions of every user who ever revoked their tokens, and of recently deleted users"""
+    expired_before = datetime.now(timezone.utc) - timedelta(minutes=settings.access_token_expire_minutes)
+    tombstones = SystemStateModel.key.startswith(DELETED_USER_KEY_PREFIX, autoescape=True)
+    db.execute(delete(SystemStateModel).where(
+        tombstones, func.coalesce(SystemStateModel.updated_at, SystemStateModel.created_at) < expired_before
+    ))
+    db.commit()
+
+    rows = db.execute(
+        select(UserModel.id, UserModel.token_version).where(UserModel.token_version > 0)
+    ).tuples().all()
+    deleted = [
+        (int(key[len(DELETED_USER_KEY_PREFIX):]), REVOKED)
+        for key in db.scalars(select(SystemStateModel.key).where(tombstones))
+    ]
+    token_versions.observe([*rows, *deleted])
+    return len(rows) + len(deleted)
+
+
+def run_token_version_sync():
+    """Run one token version sync in a session of its own"""
+    db = SessionLocal()
+    try:
+        return sync_token_versions(db)
+    finally:
+        db.close()
+
+
+async def run_token_version_sync_periodically(interval_seconds: float):
+    """Re-read the token versions every interval_seconds until cancelled"""
+    while True:
+        try:
+            await asyncio.to_thread(run_token_version_sync)
+        except Exception:
+            logger.exception("Token version sync failed")
+        await asyncio.sleep(interval_seconds)
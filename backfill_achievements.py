@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Grant achievements to existing users who already qualify for them.
+
+Run this after adding a new achievement to default_achievements.py (and
+initializing it with POST /api/v1/achievements/initialize-defaults).
+Progress is written to a checkpoint file after every chunk, so an
+interrupted run picks up where it stopped when started again.
+"""
+import argparse
+import os
+import sys
+
+# Add the current directory to Python path to import modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.database import SessionLocal
+from achievements.backfill import AchievementBackfillService
+
+
+def read_checkpoint(path: str):
+    """Return the last processed user_id stored in the checkpoint file"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read().strip() or None
+
+
+def write_checkpoint(path: str, user_id: str):
+    """Persist the last processed user_id"""
+    if not path:
+        return
+    with open(path, "w") as f:
+        f.write(user_id)
+
+
+def main():
+    """Main backfill function"""
+    parser = argparse.ArgumentParser(description="Backfill achievements for existing users")
+    parser.add_argument(
+        "-a", "--achievement", action="append", dest="achievement_ids",
+        help="Achievement ID to backfill (repeatable, defaults to all)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Users per chunk")
+    parser.add_argument("--start-after", help="Resume after this user_id (overrides the checkpoint)")
+    parser.add_argument(
+        "--checkpoint", default=".achievement_backfill_checkpoint",
+        help="File storing the last processed user_id ('' to disable)"
+    )
+    parser.add_argument(
+        "--skip-counters", action="store_true",
+        help="Do not seed the per-user achievement counters"
+    )
+    args = parser.parse_args()
+
+    start_after = args.start_after or read_checkpoint(args.checkpoint)
+    print("=== Dailee Achievement Backfill ===\n")
+    if start_after:
+        print(f"Resuming after user_id {start_after}")
+
+    def report(state):
+        write_checkpoint(args.checkpoint, state["last_user_id"])
+        print(
+            f"  {state['users_processed']}/{state['total_users']} users, "
+            f"{state['awarded']} awarded (last user_id: {state['last_user_id']})"
+        )
+
+    db = SessionLocal()
+    try:
+        service = AchievementBackfillService(db, chunk_size=args.chunk_size)
+        result = service.backfill(
+            args.achievement_ids,
+            start_after=start_after,
+            progress=report,
+            seed_counters=not args.skip_counters
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"\n✗ Backfill failed: {e}")
+        print("Run the script again to resume from the last completed chunk")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    print(f"\n✓ Backfill complete: {result['awarded']} achievements awarded")
+    if result["skipped_achievements"]:
+        print(f"  Skipped (no server-side metric): {', '.join(result['skipped_achievements'])}")
+
+
+if __name__ == "__main__":
+    main()
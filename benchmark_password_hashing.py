@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Measure how many logins per second the password executor sustains.
+
+Each login is one bcrypt verification, the cost of POST /auth/token once
+the user row is loaded. For every cost factor given with --rounds, the
+benchmark fires --logins verifications at a PasswordHasher configured for
+that cost factor (password_hash_workers threads, defaulting to the CPU
+count), so no login pays for re-hashing at bcrypt_rounds, and reports the
+throughput overall and per core. Use it to pick bcrypt_rounds for the hardware
+the API runs on: at a cost factor of 12 expect a few logins per second
+per core.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the current directory to Python path to import modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from passlib.context import CryptContext
+
+from auth.hashing import PasswordHasher, password_hasher
+
+
+async def run_logins(hasher: PasswordHasher, password_hash: str, logins: int) -> float:
+    """Verify logins passwords concurrently; returns the elapsed seconds"""
+    started = time.perf_counter()
+    results = await asyncio.gather(*(hasher.verify("benchmark", password_hash) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(verified and new_hash is None for verified, new_hash in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12], help="bcrypt cost factors to measure")
+    parser.add_argument("--logins", type=int, default=50, help="Logins per cost factor")
+    args = parser.parse_args()
+
+    workers = password_hasher.workers
+    cores = min(workers, os.cpu_count() or 1)
+    print(f"Password executor: {workers} workers on {os.cpu_count()} CPUs")
+    for rounds in args.rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hasher = PasswordHasher(workers, max_pending=args.logins, context=context)
+        elapsed = asyncio.run(run_logins(hasher, context.hash("benchmark"), args.logins))
+        rate = args.logins / elapsed
+        print(f"  rounds={rounds}: {rate:8.1f} logins/s, {rate / cores:7.1f} logins/s/core "
+              f"({elapsed / args.logins * cores * 1000:.0f} ms of CPU per login)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare GET /schedules/tasks/with-relationships before and after the
+column projection.
+
+The old endpoint loaded ScheduledTaskModel rows with their task and
+schedule through joinedload, copied the objects into dicts and let
+FastAPI encode them. The current one selects only the returned columns
+and serializes the result mappings straight to JSON bytes. Both versions
+are run --requests times against the database in DATABASE_URL, one page
+of --limit rows each, and the time per request is reported. The database
+should hold at least --limit scheduled tasks.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add the current directory to Python path to import modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session, joinedload
+
+from core.database import SessionLocal
+from schedules.service import ScheduleService
+from tasks.models import ScheduledTaskModel
+
+
+def old_with_relationships(db: Session, skip: int, limit: int) -> bytes:
+    """The endpoint before the projection, with the task category line fixed"""
+    scheduled_tasks = db.query(ScheduledTaskModel).options(
+        joinedload(ScheduledTaskModel.task),
+        joinedload(ScheduledTaskModel.schedule)
+    ).offset(skip).limit(limit).all()
+
+    result = []
+    for st in scheduled_tasks:
+        result.append({
+            "id": st.id,
+            "task_id": st.task_id,
+            "schedule_id": st.schedule_id,
+            "status": st.status,
+            "priority": st.priority,
+            "note": st.note,
+            "task": {
+                "id": st.task.id,
+                "title": st.task.title,
+                "description": st.task.description,
+                "type": st.task.type
+            } if st.task else None,
+            "schedule": {
+                "id": st.schedule.id,
+                "date": st.schedule.date.isoformat() if st.schedule.date else None,
+                "user_id": st.schedule.user_id
+            } if st.schedule else None
+        })
+    return json.dumps(jsonable_encoder(result)).encode()
+
+
+def new_with_relationships(db: Session, skip: int, limit: int) -> bytes:
+    """The current column projection"""
+    return ScheduleService(db).get_scheduled_tasks_with_relationships(skip=skip, limit=limit)
+
+
+def measure(fetch, requests: int, limit: int) -> float:
+    """Run fetch requests times, each in a fresh session; returns ms per request"""
+    started = time.perf_counter()
+    for _ in range(requests):
+        db = SessionLocal()
+        try:
+            fetch(db, 0, limit)
+        finally:
+            db.close()
+    return (time.perf_counter() - started) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per version")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = len(json.loads(new_with_relationships(db, 0, args.limit)))
+    finally:
+        db.close()
+    print(f"Scheduled tasks with relationships: {rows} rows per page, {args.requests} requests per version")
+    for name, fetch in (("old (joinedload)", old_with_relationships), ("new (projection)", new_with_relationships)):
+        measure(fetch, 10, args.limit)  # Warm up connections and caches
+        print(f"  {name}: {measure(fetch, args.requests, args.limit):6.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,56 @@ class Settings(BaseSettings):
     # Security settings
     secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 30
+    access_token_expire_minutes: int = 15  # Access tokens are not checked against the database; keep them short
+    refresh_token_expire_days: int = 30
+    token_version_sync_seconds: float = 30.0  # How often each worker re-reads revoked token versions
+    bcrypt_rounds: int = 12  # Cost factor of new hashes; older hashes are upgraded on login
+    password_hash_workers: Optional[int] = None  # Dedicated hashing threads; defaults to the CPU count
+    password_hash_max_pending: int = 64  # Logins/registrations queued beyond this get a 503
+    principal_cache_ttl_seconds: float = 60.0  # Resolved token subjects; also bounds staleness across workers
+    principal_cache_negative_ttl_seconds: float = 10.0  # Subjects that matched no user
+    principal_cache_size: int = 10000
+    
+    # Achievement push settings
+    achievement_notify_bridge: bool = False  # Fan out awards across workers via Postgres LISTEN/NOTIFY
+    achievement_ack_flush_seconds: float = 2.0  # How often delivery acknowledgements are written
+    achievement_ack_batch_size: int = 500  # Flush early once this many acknowledgements are pending
+    achievement_stream_keepalive_seconds: int = 15
+    
+    # Schedule settings
+    recurrence_window_days: int = 14  # Days ahead materialized by the recurrence job
+    rollover_enabled: bool = True  # Run the end-of-day rollover in the background
+    rollover_status: str = "FAIL"  # FAIL or SKIPPED for tasks left PENDING after their day
+    rollover_interval_minutes: float = 15.0
+    rollover_chunk_size: int = 1000
+    schedule_cache_ttl_seconds: float = 30.0  # Day view/calendar caches; also bounds staleness across workers
+    schedule_cache_size: int = 10000
+    task_cache_ttl_seconds: float = 300.0  # Task catalog cache; entries also drop when the catalog version moves
+    task_cache_size: int = 10000
+    task_cache_version_check_seconds: float = 1.0  # How often each worker re-reads the catalog version
+    task_counter_repair_enabled: bool = True  # Periodically reconcile the denormalized task counters
+    task_counter_repair_interval_minutes: float = 60.0
+    
+    # Admin settings
+    admin_dashboard_refresh_seconds: float = 60.0  # How often the dashboard statistics are recomputed
+    admin_dashboard_estimate_threshold: int = 100000  # Tables estimated larger are counted from pg_class.reltuples
+    
+    # Rate limit settings (per worker with the in-memory store)
+    rate_limit_enabled: bool = True
+    rate_limit_store_size: int = 100000  # Buckets kept; the least recently used are dropped beyond this
+    rate_limit_ip_per_minute: float = 600.0
+    rate_limit_ip_burst: int = 100
+    rate_limit_user_per_minute: float = 300.0
+    rate_limit_user_burst: int = 60
+    rate_limit_login_per_minute: float = 10.0  # POST /auth/token and /auth/register, per caller
+    rate_limit_login_burst: int = 5
+    rate_limit_login_concurrency: int = 16
+    rate_limit_bulk_per_minute: float = 6.0  # Bulk and import routes, per caller
+    rate_limit_bulk_burst: int = 3
+    rate_limit_bulk_concurrency: int = 2
+    rate_limit_export_per_minute: float = 12.0  # Export routes, per caller
+    rate_limit_export_burst: int = 4
+    rate_limit_export_concurrency: int = 4
     
     # CORS settings
     cors_origins: list = ["*"]  # Configure properly for production
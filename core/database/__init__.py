@@ -1,13 +1,13 @@
 from .database import get_db, create_tables, engine, SessionLocal
 from .base import Base
-from core.models import BaseModel
+from core.models import BaseModel, SystemStateModel, SyncTombstoneModel
 
 # Import models from their respective feature modules
 from tasks.models import TaskModel, ScheduledTaskModel, TaskCompletionModel
 from users.models import UserModel
-from schedules.models import ScheduleModel
+from schedules.models import ScheduleModel, RecurrenceRuleModel
 from statistics.models import UserTaskStreakModel
-from achievements.models import AchievementModel, UserAchievementModel
+from achievements.models import AchievementModel, UserAchievementModel, AchievementCounterModel
 from history.models import HistoryModel
 
 __all__ = [
@@ -17,13 +17,17 @@ __all__ = [
     "SessionLocal",
     "Base",
     "BaseModel",
+    "SystemStateModel",
+    "SyncTombstoneModel",
     "TaskModel",
     "ScheduleModel", 
+    "RecurrenceRuleModel",
     "ScheduledTaskModel",
     "TaskCompletionModel",
     "UserModel",
     "UserTaskStreakModel",
     "AchievementModel",
     "UserAchievementModel",
+    "AchievementCounterModel",
     "HistoryModel"
 ]
@@ -1,5 +1,11 @@
 from .base_model import BaseModel
+from .change_tracking import ChangeTrackedMixin
+from .system_state_model import SystemStateModel
+from .sync_tombstone_model import SyncTombstoneModel
 
 __all__ = [
-    "BaseModel"
+    "BaseModel",
+    "ChangeTrackedMixin",
+    "SystemStateModel",
+    "SyncTombstoneModel"
 ]
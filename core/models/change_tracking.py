@@ -0,0 +1,93 @@
+"""
+Change tracking for the delta sync API (GET /sync).
+
+Tables using ChangeTrackedMixin get a change_seq column taken from one
+global sequence on every insert and update (a BEFORE UPDATE trigger bumps
+it, so Core bulk statements are covered too), and an AFTER DELETE trigger
+writes a row to sync_tombstones so deletes propagate to clients.
+
+Alongside change_seq, change_xid records the ID of the transaction that
+made the change. Sequence values are handed out when a row is written, not
+when its transaction commits, so the sync API orders changes by
+(change_xid, change_seq) and only serves transactions older than every one
+still in flight (see sync.service).
+
+The defaults, NOT NULL constraints and triggers are Postgres-only DDL
+attached after the table is created. On other dialects, such as SQLite
+test runs, both columns are plain nullable integers.
+"""
+from sqlalchemy import BigInteger, Column, DDL, FetchedValue, Index, Sequence, Table, event
+
+from core.database.base import Base
+
+SYNC_CHANGE_SEQ = Sequence("sync_change_seq", metadata=Base.metadata)
+
+# pg_current_xact_id() is an xid8: 64 bits including the epoch, so it never wraps
+CURRENT_XID = "(pg_current_xact_id()::text::bigint)"
+
+TOUCH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION sync_touch_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := nextval('sync_change_seq');
+    NEW.change_xid := {CURRENT_XID};
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_record_tombstone() RETURNS trigger AS $$
+DECLARE
+    owner varchar(50) := to_jsonb(OLD) ->> 'user_id';
+BEGIN
+    IF owner IS NULL AND TG_TABLE_NAME = 'scheduled_tasks' THEN
+        SELECT user_id INTO owner FROM schedules WHERE id = OLD.schedule_id;
+    END IF;
+    INSERT INTO sync_tombstones (table_name, row_id, user_id, change_seq)
+    VALUES (TG_TABLE_NAME, OLD.id, owner, nextval('sync_change_seq'));
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def change_columns():
+    """change_seq and change_xid columns filled by the server; see change_defaults_on_postgres"""
+    return Column(BigInteger, FetchedValue(), nullable=True), Column(BigInteger, FetchedValue(), nullable=True)
+
+
+def change_defaults_on_postgres(table: Table):
+    """Default change_seq and change_xid and make them NOT NULL, on Postgres only"""
+    event.listen(table, "after_create", DDL(
+        f"ALTER TABLE {table.name} "
+        f"ALTER COLUMN change_seq SET DEFAULT nextval('{SYNC_CHANGE_SEQ.name}'), "
+        f"ALTER COLUMN change_seq SET NOT NULL, "
+        f"ALTER COLUMN change_xid SET DEFAULT {CURRENT_XID}, "
+        f"ALTER COLUMN change_xid SET NOT NULL"
+    ).execute_if(dialect="postgresql"))
+
+
+class ChangeTrackedMixin:
+    """Adds the change_seq and change_xid columns read by the delta sync API"""
+    change_seq, change_xid = change_columns()
+
+
+@event.listens_for(ChangeTrackedMixin, "instrument_class", propagate=True)
+def _track_changes(mapper, cls):
+    table = mapper.local_table
+    # Sync reads are per user, so index on (user_id, change_xid, change_seq) where possible
+    if "user_id" in table.c:
+        Index(f"ix_{table.name}_user_id_change", table.c.user_id, table.c.change_xid, table.c.change_seq)
+    else:
+        Index(f"ix_{table.name}_change", table.c.change_xid, table.c.change_seq)
+
+    change_defaults_on_postgres(table)
+    for statement in (
+        TOUCH_FUNCTION,
+        f"CREATE TRIGGER {table.name}_touch_change_seq BEFORE UPDATE ON {table.name} "
+        f"FOR EACH ROW EXECUTE FUNCTION sync_touch_change_seq()",
+        TOMBSTONE_FUNCTION,
+        f"CREATE TRIGGER {table.name}_sync_tombstone AFTER DELETE ON {table.name} "
+        f"FOR EACH ROW EXECUTE FUNCTION sync_record_tombstone()",
+    ):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
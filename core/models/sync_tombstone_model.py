@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Index, Integer, String
+
+from .base_model import BaseModel
+from .change_tracking import change_columns, change_defaults_on_postgres
+
+
+class SyncTombstoneModel(BaseModel):
+    """
+    Record of a deleted change-tracked row, written by the sync_record_tombstone
+    trigger so the delta sync API can report deletes.
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change", "user_id", "change_xid", "change_seq"),
+    )
+    
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    user_id = Column(String(50), nullable=True)
+    change_seq, change_xid = change_columns()
+
+
+change_defaults_on_postgres(SyncTombstoneModel.__table__)
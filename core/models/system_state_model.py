@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Text
+
+from .base_model import BaseModel
+
+
+class SystemStateModel(BaseModel):
+    """
+    Small key/value store for application-wide state that must be shared
+    between workers, such as content hashes and cache version stamps.
+    """
+    __tablename__ = "system_state"
+    
+    key = Column(String(100), unique=True, nullable=False, index=True)
+    value = Column(Text, nullable=True)
@@ -0,0 +1,206 @@
+"""
+Rate limiting and admission control, applied as ASGI middleware.
+
+Every request takes a token from the bucket of its client IP and, when it
+carries a valid bearer token, from the bucket of its user. Requests that
+match a RouteClass also take a token from that class's bucket for the
+caller, and must fit under the class's concurrency cap for the whole time
+the response is produced. That includes streamed bodies, so a slow export
+keeps holding its slot until the last byte is sent.
+
+Rejections carry Retry-After:
+- 429 when a bucket is empty.
+- 503 when a route class is at capacity.
+
+Bucket and slot state lives in a RateLimitBackend. MemoryRateLimitBackend
+keeps it per worker, in O(1) per operation. A backend shared between
+workers, such as Redis, can be plugged in without touching the
+middleware.
+
+The client IP is the connection's peer address. Behind a proxy, run
+uvicorn with --proxy-headers so it is the real client's.
+"""
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import settings
+
+
+class RateLimitBackend(ABC):
+    """Interface of a rate limit store"""
+
+    @abstractmethod
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        """
+        Take one token from the bucket at key, refilled at rate tokens per
+        second up to capacity. Returns 0 when a token was taken, otherwise
+        the seconds until one is available.
+        """
+
+    @abstractmethod
+    def acquire(self, key: str, limit: int) -> bool:
+        """Take one of limit concurrent slots at key, if one is free"""
+
+    @abstractmethod
+    def release(self, key: str):
+        """Give back a slot taken with acquire"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    In-process store. Buckets are kept in LRU order and the least recently
+    used ones are dropped beyond max_keys; a dropped bucket comes back
+    full. Only the event loop touches it, so it needs no locking.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._slots: Dict[str, int] = {}
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def acquire(self, key: str, limit: int) -> bool:
+        in_use = self._slots.get(key, 0)
+        if in_use >= limit:
+            return False
+        self._slots[key] = in_use + 1
+        return True
+
+    def release(self, key: str):
+        in_use = self._slots.get(key, 0) - 1
+        if in_use > 0:
+            self._slots[key] = in_use
+        else:
+            self._slots.pop(key, None)
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    """Expensive routes limited together: per caller by rate, per worker by concurrency"""
+    name: str
+    methods: Tuple[str, ...]
+    path: Pattern[str]
+    per_minute: float
+    burst: int
+    max_concurrent: int
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and self.path.search(path) is not None
+
+
+def default_route_classes() -> List[RouteClass]:
+    """The route classes configured in settings"""
+    return [
+        RouteClass(
+            name="login",
+            methods=("POST",),
+            path=re.compile(r"/auth/(token|register)$"),
+            per_minute=settings.rate_limit_login_per_minute,
+            burst=settings.rate_limit_login_burst,
+            max_concurrent=settings.rate_limit_login_concurrency,
+        ),
+        RouteClass(
+            name="bulk",
+            methods=("POST",),
+            path=re.compile(r"/(tasks/bulk|tasks/import|schedules/import)$"),
+            per_minute=settings.rate_limit_bulk_per_minute,
+            burst=settings.rate_limit_bulk_burst,
+            max_concurrent=settings.rate_limit_bulk_concurrency,
+        ),
+        RouteClass(
+            name="export",
+            methods=("GET",),
+            path=re.compile(r"/(tasks|schedules)/export$"),
+            per_minute=settings.rate_limit_export_per_minute,
+            burst=settings.rate_limit_export_burst,
+            max_concurrent=settings.rate_limit_export_concurrency,
+        ),
+    ]
+
+
+def _rejection(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing the limits described in the module docstring.
+    identify_user maps an Authorization header to a user key, or None for
+    anonymous and invalid credentials.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: RateLimitBackend,
+        identify_user: Callable[[str], Optional[str]],
+        route_classes: Optional[List[RouteClass]] = None,
+    ):
+        self.app = app
+        self.backend = backend
+        self.identify_user = identify_user
+        self.route_classes = default_route_classes() if route_classes is None else route_classes
+
+    def _limits(self, ip: str, user: Optional[str], route_class: Optional[RouteClass]):
+        """(bucket key, tokens per second, capacity) of every bucket the request draws from"""
+        limits = [(f"ip:{ip}", settings.rate_limit_ip_per_minute / 60, settings.rate_limit_ip_burst)]
+        if user is not None:
+            limits.append((f"user:{user}", settings.rate_limit_user_per_minute / 60, settings.rate_limit_user_burst))
+        if route_class is not None:
+            caller = f"user:{user}" if user is not None else f"ip:{ip}"
+            limits.append((f"{route_class.name}:{caller}", route_class.per_minute / 60, route_class.burst))
+        return limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        ip = scope["client"][0] if scope.get("client") else "unknown"
+        authorization = next((value for name, value in scope["headers"] if name == b"authorization"), None)
+        user = self.identify_user(authorization.decode("latin-1")) if authorization else None
+        route_class = next((rc for rc in self.route_classes if rc.matches(scope["method"], scope["path"])), None)
+
+        for key, rate, capacity in self._limits(ip, user, route_class):
+            wait = self.backend.take(key, rate, capacity)
+            if wait:
+                await _rejection(429, "Too many requests", wait)(scope, receive, send)
+                return
+
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        slot = f"slots:{route_class.name}"
+        if not self.backend.acquire(slot, route_class.max_concurrent):
+            await _rejection(503, f"Too many {route_class.name} requests in progress", 1)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.backend.release(slot)
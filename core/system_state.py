@@ -0,0 +1,21 @@
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.models import SystemStateModel
+
+
+def get_state(db: Session, key: str) -> Optional[str]:
+    """Read a shared state value"""
+    return db.query(SystemStateModel.value).filter(SystemStateModel.key == key).scalar()
+
+
+def set_state(db: Session, key: str, value: Optional[str]):
+    """Write a shared state value in the current transaction"""
+    stmt = insert(SystemStateModel).values(key=key, value=value)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": stmt.excluded.value, "updated_at": func.now()}
+    ))
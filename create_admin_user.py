@@ -9,7 +9,6 @@ import os
 import getpass
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from passlib.context import CryptContext
 
 # Add the current directory to Python path to import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -17,9 +16,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.config import settings
 from core.database import SessionLocal
 from users.models import UserModel
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from auth.hashing import pwd_context  # Same scheme and cost factor as the API
 
 
 def hash_password(password: str) -> str:
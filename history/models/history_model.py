@@ -1,10 +1,10 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 
 
-class HistoryModel(BaseModel):
+class HistoryModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "history"
     
     user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False)
@@ -0,0 +1,79 @@
+"""Set-based recomputation of daily history rows from scheduled tasks"""
+import logging
+from datetime import date, datetime, time
+from typing import Iterable, Tuple
+
+from sqlalchemy import select, update, insert, func, cast, tuple_, Date
+from sqlalchemy.orm import Session
+
+from schedules.models import ScheduleModel
+from tasks.models import ScheduledTaskModel, TaskStatusEnum
+from users.models import UserModel
+from .models import HistoryModel
+
+logger = logging.getLogger(__name__)
+
+
+def rollup_history_days(db: Session, days: Iterable[Tuple[str, date]], chunk_size: int = 1000) -> int:
+    """
+    Recompute tasks_scheduled, tasks_completed and completion_rate of the
+    history rows of the given (user_id, day) pairs, creating missing rows.
+    Each chunk takes one aggregate query, one lookup, one batched UPDATE and
+    one multi-row INSERT. The caller commits. Returns the number of days written.
+    """
+    keys = list(set(days))
+    written = 0
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        
+        schedule_day = cast(ScheduleModel.date, Date)
+        totals = db.execute(
+            select(
+                ScheduleModel.user_id,
+                schedule_day.label("day"),
+                func.count(ScheduledTaskModel.id).label("scheduled"),
+                func.count(ScheduledTaskModel.id).filter(
+                    ScheduledTaskModel.status == TaskStatusEnum.COMPLETE
+                ).label("completed")
+            ).join(
+                ScheduledTaskModel, ScheduledTaskModel.schedule_id == ScheduleModel.id
+            ).join(
+                UserModel, UserModel.user_id == ScheduleModel.user_id  # History requires a known user
+            ).where(
+                tuple_(ScheduleModel.user_id, schedule_day).in_(chunk)
+            ).group_by(ScheduleModel.user_id, schedule_day)
+        ).all()
+        if not totals:
+            continue
+        
+        history_day = cast(HistoryModel.date, Date)
+        existing = {
+            (row.user_id, row.day): row.id
+            for row in db.execute(
+                select(HistoryModel.id, HistoryModel.user_id, history_day.label("day"))
+                .where(tuple_(HistoryModel.user_id, history_day).in_([(t.user_id, t.day) for t in totals]))
+                .order_by(HistoryModel.id)
+            )
+        }
+        
+        updates, inserts = [], []
+        for total in totals:
+            values = {
+                "tasks_scheduled": total.scheduled,
+                "tasks_completed": total.completed,
+                "completion_rate": round(total.completed * 100 / total.scheduled) if total.scheduled else 0,
+            }
+            history_id = existing.get((total.user_id, total.day))
+            if history_id:
+                updates.append({"id": history_id, **values})
+            else:
+                inserts.append({"user_id": total.user_id, "date": datetime.combine(total.day, time.min), **values})
+        
+        if updates:
+            db.execute(update(HistoryModel), updates)
+        if inserts:
+            db.execute(insert(HistoryModel).values(inserts))
+        written += len(totals)
+    
+    logger.info(f"History rolled up for {written} user days")
+    return written
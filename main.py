@@ -1,17 +1,26 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from core.config import settings
+from core.rate_limit import RateLimitMiddleware, MemoryRateLimitBackend
 from core.database import create_tables
 from tasks.router import router as tasks_router
 from users.router import router as users_router
 from statistics.router import router as statistics_router
 from schedules.router import router as schedules_router
 from auth.router import router as auth_router
+from auth.tokens import run_token_version_sync_periodically, subject_of_authorization
 from achievements.router import router as achievements_router
+from achievements.notifications import broker, ack_buffer, PostgresNotifyBridge
+from achievements.catalog import sync_catalog_on_startup
 from history.router import router as history_router
+from schedules.rollover import run_rollover_periodically
+from tasks.counters import run_counter_repair_periodically
+from sync.router import router as sync_router
 from admin.setup import setup_admin, init_admin_db
+from admin.dashboard.snapshot import refresh_dashboard_periodically
 from beautiful_logging import setup_logging
 
 
@@ -20,9 +29,28 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()  # Setup SQL logging
     create_tables()
+    await asyncio.to_thread(sync_catalog_on_startup)
     await init_admin_db()
+    ack_flusher = asyncio.create_task(ack_buffer.run(settings.achievement_ack_flush_seconds))
+    notify_bridge = PostgresNotifyBridge(broker) if settings.achievement_notify_bridge else None
+    if notify_bridge:
+        notify_bridge.start()
+    token_version_sync = asyncio.create_task(run_token_version_sync_periodically(settings.token_version_sync_seconds))
+    dashboard_refresh = asyncio.create_task(refresh_dashboard_periodically(settings.admin_dashboard_refresh_seconds))
+    background_tasks = [ack_flusher, token_version_sync, dashboard_refresh]
+    if settings.rollover_enabled:
+        background_tasks.append(asyncio.create_task(run_rollover_periodically(settings.rollover_interval_minutes)))
+    if settings.task_counter_repair_enabled:
+        background_tasks.append(asyncio.create_task(
+            run_counter_repair_periodically(settings.task_counter_repair_interval_minutes)
+        ))
     yield
     # Shutdown
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if notify_bridge:
+        notify_bridge.stop()
 
 
 app = FastAPI(
@@ -32,6 +60,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limits; added before CORS so rejections still carry CORS headers
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=MemoryRateLimitBackend(max_keys=settings.rate_limit_store_size),
+        identify_user=subject_of_authorization,
+    )
+
 # CORS middleware for Flutter app
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +85,7 @@ app.include_router(statistics_router, prefix="/api/v1")
 app.include_router(schedules_router, prefix="/api/v1")
 app.include_router(achievements_router, prefix="/api/v1")
 app.include_router(history_router, prefix="/api/v1")
+app.include_router(sync_router, prefix="/api/v1")
 
 # Setup admin interface
 admin_app = setup_admin(app, settings.database_url_complete)
@@ -1,5 +1,9 @@
+from .enums import RecurrenceFrequencyEnum
 from .schedule_model import ScheduleModel
+from .recurrence_rule_model import RecurrenceRuleModel
 
 __all__ = [
-    "ScheduleModel"
+    "RecurrenceFrequencyEnum",
+    "ScheduleModel",
+    "RecurrenceRuleModel"
 ]
@@ -0,0 +1,8 @@
+import enum
+
+
+class RecurrenceFrequencyEnum(enum.Enum):
+    DAILY = "daily"
+    WEEKDAYS = "weekdays"  # Monday to Friday
+    INTERVAL = "interval"  # Every N days
+    WEEKLY = "weekly"  # Selected weekdays, every N weeks
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Date, Boolean, Enum, ForeignKey, JSON
+from sqlalchemy.orm import relationship
+
+from core.models import BaseModel
+from .enums import RecurrenceFrequencyEnum
+
+
+class RecurrenceRuleModel(BaseModel):
+    __tablename__ = "recurrence_rules"
+    
+    user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    frequency = Column(Enum(RecurrenceFrequencyEnum), nullable=False, default=RecurrenceFrequencyEnum.DAILY)
+    interval = Column(Integer, nullable=False, default=1)
+    weekdays = Column(JSON, nullable=True)  # Weekday numbers for WEEKLY rules, 0 = Monday
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    priority = Column(Integer, nullable=False, default=0)
+    is_active = Column(Boolean, nullable=False, default=True)
+    # Last day already expanded into scheduled tasks
+    materialized_until = Column(Date, nullable=True)
+    
+    # Relationships
+    task = relationship("TaskModel")
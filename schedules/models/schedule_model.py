@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 
 
-class ScheduleModel(BaseModel):
+class ScheduleModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # One schedule per user and day so creation can be an idempotent get-or-create
+        UniqueConstraint("user_id", "date", name="uq_schedules_user_date"),
+    )
     
     date = Column(DateTime, nullable=False)
     user_id = Column(String(50), nullable=False)
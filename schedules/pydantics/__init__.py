@@ -7,9 +7,42 @@ from .schedule_pydantic import (
     SchedulePdtModel,
 )
 
+from .recurrence_rule_pydantic import (
+    RecurrenceRulePdtBase,
+    RecurrenceRulePdtCreate,
+    RecurrenceRulePdtUpdate,
+    RecurrenceRulePdtModel,
+)
+
+from .day_view_pydantic import (
+    DayViewSchedulePdtModel,
+    DayViewTaskPdtModel,
+    DayViewPdtModel,
+)
+
+from .calendar_pydantic import (
+    CalendarDayPdtModel,
+    CalendarPdtModel,
+)
+
 __all__ = [
     "ScheduleBasePdtModel",
     "SchedulePdtCreate",
     "SchedulePdtUpdate",
     "SchedulePdtModel",
+    
+    # Recurrence rule models
+    "RecurrenceRulePdtBase",
+    "RecurrenceRulePdtCreate",
+    "RecurrenceRulePdtUpdate",
+    "RecurrenceRulePdtModel",
+    
+    # Day view models
+    "DayViewSchedulePdtModel",
+    "DayViewTaskPdtModel",
+    "DayViewPdtModel",
+    
+    # Calendar models
+    "CalendarDayPdtModel",
+    "CalendarPdtModel",
 ]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import date
+
+
+class CalendarDayPdtModel(BaseModel):
+    date: date
+    scheduled_count: int = 0
+    completed_count: int = 0
+    skipped_count: int = 0
+    failed_count: int = 0
+    completion_rate: int = Field(default=0, ge=0, le=100)  # Percentage 0-100
+
+
+class CalendarPdtModel(BaseModel):
+    user_id: str
+    month: str  # YYYY-MM
+    days: List[CalendarDayPdtModel] = []
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date, datetime
+
+from tasks.models.enums import TaskStatusEnum, TaskTypeEnum
+
+
+class DayViewSchedulePdtModel(BaseModel):
+    id: int
+    date: datetime
+
+
+class DayViewTaskPdtModel(BaseModel):
+    id: int  # Scheduled task ID
+    task_id: int
+    title: str
+    type: Optional[TaskTypeEnum] = None
+    status: Optional[TaskStatusEnum] = None
+    priority: Optional[int] = None
+    note: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    is_completed: bool  # Marked complete or logged as a completion that day
+
+
+class DayViewPdtModel(BaseModel):
+    user_id: str
+    date: date
+    schedule: Optional[DayViewSchedulePdtModel] = None
+    tasks: List[DayViewTaskPdtModel] = []
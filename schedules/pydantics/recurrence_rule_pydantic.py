@@ -0,0 +1,64 @@
+from pydantic import BaseModel, Field, model_validator, AfterValidator
+from typing import Optional, List, Annotated
+from datetime import date, datetime
+
+from schedules.models.enums import RecurrenceFrequencyEnum
+from schedules.recurrence import parse_rrule
+
+
+def _check_weekdays(value: List[int]) -> List[int]:
+    if any(day < 0 or day > 6 for day in value):
+        raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+    # Sorted and unique, like the weekdays parsed from an RRULE
+    return sorted(set(value))
+
+
+Weekdays = Annotated[List[int], AfterValidator(_check_weekdays)]  # 0 = Monday ... 6 = Sunday, used by WEEKLY
+
+
+class RecurrenceRulePdtBase(BaseModel):
+    user_id: str = Field(..., description="User ID for multi-user support")
+    task_id: int
+    frequency: RecurrenceFrequencyEnum = RecurrenceFrequencyEnum.DAILY
+    interval: int = Field(1, ge=1, le=365)  # Days for INTERVAL, weeks for WEEKLY
+    weekdays: Optional[Weekdays] = None
+    start_date: date
+    end_date: Optional[date] = None
+    priority: int = 0
+    is_active: bool = True
+    
+    @model_validator(mode="after")
+    def check_rule(self):
+        if self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class RecurrenceRulePdtCreate(RecurrenceRulePdtBase):
+    rrule: Optional[str] = Field(None, description="RRULE subset, e.g. FREQ=WEEKLY;BYDAY=MO,WE,FR")
+    
+    @model_validator(mode="before")
+    @classmethod
+    def apply_rrule(cls, data):
+        if isinstance(data, dict) and data.get("rrule"):
+            data = {**data, **parse_rrule(data["rrule"])}
+        return data
+
+
+class RecurrenceRulePdtUpdate(BaseModel):
+    frequency: Optional[RecurrenceFrequencyEnum] = None
+    interval: Optional[int] = Field(None, ge=1, le=365)
+    weekdays: Optional[Weekdays] = None
+    end_date: Optional[date] = None
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+class RecurrenceRulePdtModel(RecurrenceRulePdtBase):
+    id: Optional[int] = None
+    materialized_until: Optional[date] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
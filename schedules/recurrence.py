@@ -0,0 +1,98 @@
+"""Recurrence rules for habit tasks.
+
+A rule says on which days a task is due. Supported frequencies are daily,
+weekdays, every N days and weekly on selected weekdays every N weeks, and
+rules can also be given as the matching RRULE subset
+(FREQ=DAILY|WEEKLY with INTERVAL, BYDAY and UNTIL).
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from .models import RecurrenceFrequencyEnum
+
+
+RRULE_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+# Rules are never expanded further into the future than this
+MAX_MATERIALIZE_DAYS_AHEAD = 366
+
+
+def parse_rrule(rrule: str) -> Dict[str, Any]:
+    """
+    Translate an RRULE string (with or without the "RRULE:" prefix) into
+    frequency, interval, weekdays and end_date values.
+    """
+    parts = {}
+    for part in rrule.strip().removeprefix("RRULE:").split(";"):
+        if not part:
+            continue
+        name, _, value = part.partition("=")
+        parts[name.strip().upper()] = value.strip().upper()
+    
+    unsupported = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "UNTIL", "WKST"}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(unsupported))}")
+    
+    interval = int(parts.get("INTERVAL", 1))
+    if interval < 1:
+        raise ValueError("INTERVAL must be at least 1")
+    
+    weekdays = None
+    if "BYDAY" in parts:
+        try:
+            weekdays = sorted({RRULE_WEEKDAYS.index(day) for day in parts["BYDAY"].split(",")})
+        except ValueError:
+            raise ValueError(f"Invalid BYDAY {parts['BYDAY']}")
+    
+    freq = parts.get("FREQ")
+    if freq == "DAILY":
+        if weekdays is not None:
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        frequency = RecurrenceFrequencyEnum.DAILY if interval == 1 else RecurrenceFrequencyEnum.INTERVAL
+    elif freq == "WEEKLY":
+        if weekdays == [0, 1, 2, 3, 4] and interval == 1:
+            frequency, weekdays = RecurrenceFrequencyEnum.WEEKDAYS, None
+        else:
+            frequency = RecurrenceFrequencyEnum.WEEKLY
+    else:
+        raise ValueError(f"Unsupported FREQ {freq}")
+    
+    result = {"frequency": frequency, "interval": interval, "weekdays": weekdays}
+    if "UNTIL" in parts:
+        result["end_date"] = datetime.strptime(parts["UNTIL"][:8], "%Y%m%d").date()
+    return result
+
+
+def occurs_on(
+    frequency: RecurrenceFrequencyEnum,
+    interval: int,
+    weekdays: Optional[List[int]],
+    start_date: date,
+    day: date
+) -> bool:
+    """Whether a rule starting on start_date is due on day"""
+    if day < start_date:
+        return False
+    if frequency == RecurrenceFrequencyEnum.DAILY:
+        return True
+    if frequency == RecurrenceFrequencyEnum.WEEKDAYS:
+        return day.weekday() < 5
+    if frequency == RecurrenceFrequencyEnum.INTERVAL:
+        return (day - start_date).days % interval == 0
+    
+    # WEEKLY: count whole weeks from the Monday of the start week
+    if day.weekday() not in (weekdays or [start_date.weekday()]):
+        return False
+    first_monday = start_date - timedelta(days=start_date.weekday())
+    return ((day - first_monday).days // 7) % interval == 0
+
+
+def expand_rule(rule, start: date, end: date) -> Iterator[date]:
+    """Yield the days between start and end (inclusive) on which a rule is due"""
+    first = max(start, rule.start_date)
+    last = min(end, rule.end_date) if rule.end_date else end
+    day = first
+    while day <= last:
+        if occurs_on(rule.frequency, rule.interval, rule.weekdays, rule.start_date, day):
+            yield day
+        day += timedelta(days=1)
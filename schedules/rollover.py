@@ -0,0 +1,115 @@
+"""
+End-of-day rollover of scheduled tasks.
+
+Tasks still PENDING after their day has ended in the user's timezone are
+moved to FAIL (or SKIPPED, per settings.rollover_status), so missed days
+show up in history and consistency metrics. Users are handled per
+timezone bucket with chunked UPDATEs that lock only the rows they touch
+(FOR UPDATE SKIP LOCKED), and only PENDING rows are ever changed, so the
+job can run on every worker and be re-run safely.
+"""
+import asyncio
+import logging
+from datetime import datetime, time
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocal
+from history.rollup import rollup_history_days
+from tasks.models import ScheduledTaskModel, TaskStatusEnum
+from users.models import UserModel
+from .models import ScheduleModel
+from .view_cache import invalidate_after_commit
+
+logger = logging.getLogger(__name__)
+
+
+class RolloverService:
+    """Close out past days whose scheduled tasks were never acted on"""
+
+    def __init__(self, db: Session, status: Optional[TaskStatusEnum] = None, chunk_size: int = 1000):
+        self.db = db
+        self.status = status or TaskStatusEnum[settings.rollover_status.upper()]
+        if self.status not in (TaskStatusEnum.FAIL, TaskStatusEnum.SKIPPED):
+            raise ValueError("Rollover status must be FAIL or SKIPPED")
+        self.chunk_size = chunk_size
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Roll over every timezone bucket; returns the number of tasks changed per timezone"""
+        now = now or datetime.now(ZoneInfo("UTC"))
+        user_timezone = func.coalesce(UserModel.timezone, "UTC")
+        timezones = set(self.db.scalars(select(UserModel.timezone).distinct())) | {"UTC"}
+        
+        result = {}
+        for timezone_name in sorted(timezones):
+            try:
+                local_today = now.astimezone(ZoneInfo(timezone_name)).date()
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"Unknown timezone {timezone_name}; skipping its users")
+                continue
+            result[timezone_name] = self._roll_over_bucket(user_timezone == timezone_name, local_today)
+        return result
+
+    def _roll_over_bucket(self, in_bucket, local_today) -> int:
+        """Move PENDING tasks scheduled before local_today, one chunk per transaction"""
+        cutoff = datetime.combine(local_today, time.min)
+        total = 0
+        while True:
+            chunk = select(ScheduledTaskModel.id).join(
+                ScheduleModel, ScheduleModel.id == ScheduledTaskModel.schedule_id
+            ).outerjoin(
+                UserModel, UserModel.user_id == ScheduleModel.user_id  # Schedules of unknown users count as UTC
+            ).where(
+                in_bucket,
+                ScheduleModel.date < cutoff,
+                ScheduledTaskModel.status == TaskStatusEnum.PENDING
+            ).order_by(ScheduledTaskModel.id).limit(self.chunk_size).with_for_update(
+                of=ScheduledTaskModel, skip_locked=True
+            )
+            
+            rows = self.db.execute(
+                update(ScheduledTaskModel)
+                .where(
+                    ScheduledTaskModel.id.in_(chunk),
+                    ScheduledTaskModel.status == TaskStatusEnum.PENDING,
+                    ScheduleModel.id == ScheduledTaskModel.schedule_id
+                )
+                .values(status=self.status, updated_at=func.now())
+                .returning(ScheduledTaskModel.schedule_id, ScheduleModel.user_id, ScheduleModel.date)
+                .execution_options(synchronize_session=False)
+            ).all()
+            if not rows:
+                self.db.commit()
+                return total
+            
+            invalidate_after_commit(self.db, schedule_ids={row.schedule_id for row in rows})
+            rollup_history_days(self.db, {(row.user_id, row.date.date()) for row in rows})
+            self.db.commit()
+            total += len(rows)
+            logger.info(f"Rolled over {total} scheduled tasks to {self.status.name} before {local_today}")
+
+
+def run_rollover() -> Dict[str, Any]:
+    """Run one rollover pass in a session of its own"""
+    db = SessionLocal()
+    try:
+        return RolloverService(db, chunk_size=settings.rollover_chunk_size).run()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_rollover_periodically(interval_minutes: float):
+    """Run the rollover every interval_minutes until cancelled"""
+    while True:
+        try:
+            await asyncio.to_thread(run_rollover)
+        except Exception:
+            logger.exception("Scheduled task rollover failed")
+        await asyncio.sleep(interval_minutes * 60)
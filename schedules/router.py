@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from core.database import get_db
+from core.database import get_db, SessionLocal
 from schedules.models import ScheduleModel
-from tasks.models import ScheduledTaskModel, TaskModel
-from schedules.pydantics import SchedulePdtModel, SchedulePdtCreate, SchedulePdtUpdate 
-from tasks.pydantics import ScheduledTaskPdtModel, ScheduledTaskPdtCreate, ScheduledTaskPdtUpdate
+from tasks.models import ScheduledTaskModel
+from core.config import settings
+from schedules.pydantics import (
+    SchedulePdtModel, SchedulePdtCreate, SchedulePdtUpdate,
+    RecurrenceRulePdtCreate, RecurrenceRulePdtUpdate, RecurrenceRulePdtModel, DayViewPdtModel,
+    CalendarPdtModel
+)
+from schedules.service import ScheduleService
+from tasks.cache import task_exists
+from tasks.pydantics import (
+    ScheduledTaskPdtModel, ScheduledTaskPdtCreate, ScheduledTaskPdtUpdate,
+    ScheduledTaskBulkStatusRequest, ScheduledTaskBulkStatusResponse
+)
+from auth.principals import AuthenticatedUser
 from auth.router import get_current_authenticated_user
-from users.models import UserModel
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
@@ -16,12 +29,9 @@ router = APIRouter(prefix="/schedules", tags=["schedules"])
 # Schedule endpoints
 @router.post("/", response_model=SchedulePdtModel)
 def create_schedule(schedule: SchedulePdtCreate, db: Session = Depends(get_db)):
-    """Create a new schedule"""
-    db_schedule = ScheduleModel(**schedule.model_dump())
-    db.add(db_schedule)
-    db.commit()
-    db.refresh(db_schedule)
-    return db_schedule
+    """Create a new schedule; retries return the user's existing schedule for that date"""
+    service = ScheduleService(db)
+    return service.create_schedule(schedule)
 
 
 @router.get("/", response_model=List[SchedulePdtModel])
@@ -61,91 +71,143 @@ def get_schedules_by_user(user_id: str, skip: int = 0, limit: int = 100, db: Ses
     return schedules
 
 
+@router.get("/day/{user_id}/{day}", response_model=DayViewPdtModel)
+def get_day_view(user_id: str, day: date, db: Session = Depends(get_db)):
+    """Get a user's schedule for a day with task details and completion status in one call"""
+    content = ScheduleService(db).get_day_view(user_id, day)
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/calendar/{user_id}", response_model=CalendarPdtModel)
+def get_calendar(
+    user_id: str,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM, defaults to the current month"),
+    db: Session = Depends(get_db)
+):
+    """Get per-day task counts and completion rate for a month"""
+    if month:
+        year, month_number = (int(part) for part in month.split("-"))
+    else:
+        today = date.today()
+        year, month_number = today.year, today.month
+    content = ScheduleService(db).get_calendar(user_id, year, month_number)
+    return Response(content=content, media_type="application/json")
+
+
 @router.get("/export")
 def export_schedules_to_json(
-    current_user: UserModel = Depends(get_current_authenticated_user),
-    db: Session = Depends(get_db)
+    since: Optional[date] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    current_user: AuthenticatedUser = Depends(get_current_authenticated_user)
 ):
-    """Export schedules to JSON format for the current authenticated user"""
-    query = db.query(ScheduleModel).filter(ScheduleModel.user_id == current_user.id)
+    """
+    Export schedules to JSON format for the current authenticated user.
     
-    schedules = query.all()
+    The export is streamed as it is read: format=json returns the usual
+    {"schedules": [...]} document, format=ndjson returns one schedule per line.
+    Use since (YYYY-MM-DD) to only export schedules from that date on.
+    """
+    user_id = current_user.user_id
     
-    export_data = []
-    for schedule in schedules:
-        # Get scheduled tasks for this schedule
-        scheduled_tasks = db.query(ScheduledTaskModel).filter(
-            ScheduledTaskModel.schedule_id == schedule.id
-        ).all()
-        
-        schedule_data = {
-            "date": schedule.date.isoformat() if schedule.date else None,
-            "user_id": schedule.user_id,
-            "tasks": [
-                {
-                    "task_id": st.task_id,
-                    "status": st.status,
-                    "priority": st.priority,
-                    "note": st.note
-                }
-                for st in scheduled_tasks
-            ]
-        }
-        export_data.append(schedule_data)
+    def generate():
+        # The request session is closed once the endpoint returns, so the
+        # stream reads through a session of its own
+        db = SessionLocal()
+        try:
+            schedules = ScheduleService(db).iter_schedule_export(user_id, since)
+            if format == "ndjson":
+                for schedule in schedules:
+                    yield json.dumps(schedule) + "\n"
+                return
+            
+            yield '{"schedules": ['
+            for index, schedule in enumerate(schedules):
+                yield ("," if index else "") + json.dumps(schedule)
+            yield "]}"
+        finally:
+            db.close()
     
-    return {"schedules": export_data}
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(generate(), media_type=media_type)
 
 
 @router.post("/import")
 def import_schedules_from_json(import_data: dict, db: Session = Depends(get_db)):
     """Import schedules from JSON format"""
     try:
-        schedules_data = import_data.get("schedules", [])
-        imported_count = 0
-        
-        for schedule_data in schedules_data:
-            # Create or update schedule
-            existing_schedule = db.query(ScheduleModel).filter(
-                ScheduleModel.date == schedule_data["date"],
-                ScheduleModel.user_id == schedule_data["user_id"]
-            ).first()
-            
-            if not existing_schedule:
-                new_schedule = ScheduleModel(
-                    date=schedule_data["date"],
-                    user_id=schedule_data["user_id"]
-                )
-                db.add(new_schedule)
-                db.flush()
-                schedule_id = new_schedule.id
-            else:
-                schedule_id = existing_schedule.id
-            
-            # Import scheduled tasks
-            for task_data in schedule_data.get("tasks", []):
-                existing_task = db.query(ScheduledTaskModel).filter(
-                    ScheduledTaskModel.schedule_id == schedule_id,
-                    ScheduledTaskModel.task_id == task_data["task_id"]
-                ).first()
-                
-                if not existing_task:
-                    new_scheduled_task = ScheduledTaskModel(
-                        schedule_id=schedule_id,
-                        task_id=task_data["task_id"],
-                        status=task_data.get("status", "pending"),
-                        priority=task_data.get("priority", 0),
-                        note=task_data.get("note")
-                    )
-                    db.add(new_scheduled_task)
-            
-            imported_count += 1
-        
+        results = ScheduleService(db).import_schedules(import_data.get("schedules", []))
         db.commit()
-        return {"message": f"Successfully imported {imported_count} schedules"}
-    
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
+    
+    imported_count = sum(1 for result in results if result["status"] != "error")
+    return {
+        "message": f"Successfully imported {imported_count} schedules",
+        "imported_count": imported_count,
+        "failed_count": len(results) - imported_count,
+        "results": results
+    }
+
+
+# Recurrence rule endpoints
+@router.post("/recurrence-rules", response_model=RecurrenceRulePdtModel)
+def create_recurrence_rule(rule: RecurrenceRulePdtCreate, db: Session = Depends(get_db)):
+    """Create a recurrence rule (daily, weekdays, every N days, weekly or RRULE subset)"""
+    db_rule = ScheduleService(db).create_recurrence_rule(rule)
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_rule
+
+
+@router.get("/recurrence-rules", response_model=List[RecurrenceRulePdtModel])
+def get_recurrence_rules(
+    user_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Get recurrence rules, optionally for one user"""
+    return ScheduleService(db).get_recurrence_rules(user_id, skip, limit)
+
+
+@router.post("/recurrence-rules/materialize")
+def materialize_recurrence_rules(
+    days: int = Query(settings.recurrence_window_days, ge=0, le=366),
+    user_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Expand recurrence rules into scheduled tasks for the next days (all users by default)"""
+    until = date.today() + timedelta(days=days)
+    created = ScheduleService(db).materialize_recurrences(until, user_id)
+    return {"message": f"Created {created} scheduled tasks", "created": created, "until": until}
+
+
+@router.put("/recurrence-rules/{rule_id}", response_model=RecurrenceRulePdtModel)
+def update_recurrence_rule(rule_id: int, rule_update: RecurrenceRulePdtUpdate, db: Session = Depends(get_db)):
+    """Update a recurrence rule"""
+    rule = ScheduleService(db).update_recurrence_rule(rule_id, rule_update)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Recurrence rule not found")
+    return rule
+
+
+@router.delete("/recurrence-rules/{rule_id}")
+def delete_recurrence_rule(rule_id: int, db: Session = Depends(get_db)):
+    """Delete a recurrence rule"""
+    if not ScheduleService(db).delete_recurrence_rule(rule_id):
+        raise HTTPException(status_code=404, detail="Recurrence rule not found")
+    return {"message": "Recurrence rule deleted successfully"}
+
+
+@router.get("/range/{user_id}", response_model=List[ScheduledTaskPdtModel])
+def get_scheduled_tasks_in_range(user_id: str, start: date, end: date, db: Session = Depends(get_db)):
+    """Get a user's scheduled tasks between two dates, expanding recurring tasks on the way"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days > 366:
+        raise HTTPException(status_code=400, detail="Date range cannot exceed 366 days")
+    return ScheduleService(db).get_scheduled_tasks_in_range(user_id, start, end)
 
 
 @router.get("/{schedule_id}", response_model=SchedulePdtModel)
@@ -169,6 +231,14 @@ def update_schedule(
         raise HTTPException(status_code=404, detail="Schedule not found")
     
     update_data = schedule_update.model_dump(exclude_unset=True)
+    if update_data.get("date") is not None:
+        conflict = db.query(ScheduleModel.id).filter(
+            ScheduleModel.user_id == schedule.user_id,
+            ScheduleModel.date == update_data["date"],
+            ScheduleModel.id != schedule_id
+        ).first()
+        if conflict:
+            raise HTTPException(status_code=409, detail="User already has a schedule for this date")
     for field, value in update_data.items():
         setattr(schedule, field, value)
     
@@ -194,8 +264,7 @@ def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
 def create_scheduled_task(scheduled_task: ScheduledTaskPdtCreate, db: Session = Depends(get_db)):
     """Create a new scheduled task"""
     # Check if task exists
-    task = db.query(TaskModel).filter(TaskModel.id == scheduled_task.task_id).first()
-    if not task:
+    if not task_exists(db, scheduled_task.task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check if schedule exists
@@ -210,6 +279,15 @@ def create_scheduled_task(scheduled_task: ScheduledTaskPdtCreate, db: Session =
     return db_scheduled_task
 
 
+@router.post("/tasks/bulk-status", response_model=ScheduledTaskBulkStatusResponse)
+def bulk_update_scheduled_task_status(
+    bulk_request: ScheduledTaskBulkStatusRequest,
+    db: Session = Depends(get_db)
+):
+    """Change the status (and optionally the note) of many scheduled tasks at once"""
+    return ScheduleService(db).bulk_update_status(bulk_request.items)
+
+
 @router.get("/tasks", response_model=List[ScheduledTaskPdtModel])
 def get_scheduled_tasks(
     task_id: Optional[int] = None,
@@ -259,48 +337,8 @@ def get_scheduled_tasks_with_relationships(
     db: Session = Depends(get_db)
 ):
     """Get scheduled tasks with task and schedule details populated"""
-    from sqlalchemy.orm import joinedload
-    
-    query = db.query(ScheduledTaskModel).options(
-        joinedload(ScheduledTaskModel.task),
-        joinedload(ScheduledTaskModel.schedule)
-    )
-    
-    if date or user_id:
-        # Join with schedule table to filter by date/user
-        query = query.join(ScheduleModel)
-        if date:
-            query = query.filter(ScheduleModel.date == date)
-        if user_id:
-            query = query.filter(ScheduleModel.user_id == user_id)
-    
-    scheduled_tasks = query.offset(skip).limit(limit).all()
-    
-    # Format response with relationships
-    result = []
-    for st in scheduled_tasks:
-        task_data = {
-            "id": st.id,
-            "task_id": st.task_id,
-            "schedule_id": st.schedule_id,
-            "status": st.status,
-            "priority": st.priority,
-            "note": st.note,
-            "task": {
-                "id": st.task.id,
-                "title": st.task.title,
-                "description": st.task.description,
-                "category": st.task.category
-            } if st.task else None,
-            "schedule": {
-                "id": st.schedule.id,
-                "date": st.schedule.date.isoformat() if st.schedule.date else None,
-                "user_id": st.schedule.user_id
-            } if st.schedule else None
-        }
-        result.append(task_data)
-    
-    return result
+    content = ScheduleService(db).get_scheduled_tasks_with_relationships(date, user_id, skip, limit)
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/tasks/{scheduled_task_id}", response_model=ScheduledTaskPdtModel)
@@ -1,10 +1,30 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import calendar
+import json
+from itertools import groupby
+from sqlalchemy import (
+    select, update, or_, and_, exists, tuple_, func, cast, case, values, column, Date, Integer, String, Text
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from schedules.models import ScheduleModel
-from tasks.models import ScheduledTaskModel, TaskModel 
-from .pydantics import SchedulePdtCreate, SchedulePdtUpdate
-from tasks.pydantics import ScheduledTaskPdtCreate, ScheduledTaskPdtUpdate
+from schedules.models import ScheduleModel, RecurrenceRuleModel
+from tasks.models import ScheduledTaskModel, TaskModel, TaskCompletionModel, TaskStatusEnum
+from .pydantics import (
+    SchedulePdtCreate, SchedulePdtUpdate, RecurrenceRulePdtCreate, RecurrenceRulePdtUpdate,
+    DayViewPdtModel, DayViewSchedulePdtModel, DayViewTaskPdtModel, CalendarPdtModel, CalendarDayPdtModel
+)
+from .recurrence import expand_rule, MAX_MATERIALIZE_DAYS_AHEAD
+from .view_cache import day_view_cache, calendar_cache, invalidate_after_commit
+from tasks.pydantics import ScheduledTaskPdtCreate, ScheduledTaskPdtUpdate, ScheduledTaskStatusItem
+from tasks.counters import apply_counter_deltas, count_by_task
+from statistics.models import UserTaskStreakModel
+from statistics.streaks import new_streak, advance_streak
+from achievements.metrics import completion_counter_updates
+from achievements.service import AchievementService
+from users.models import UserModel
 
 
 class ScheduleService:
@@ -12,13 +32,36 @@ class ScheduleService:
         self.db = db
 
     def create_schedule(self, schedule: SchedulePdtCreate) -> ScheduleModel:
-        """Create a new schedule"""
-        db_schedule = ScheduleModel(**schedule.model_dump())
-        self.db.add(db_schedule)
-        self.db.commit()
-        self.db.refresh(db_schedule)
+        """Create a schedule, returning the existing one for the same user and date"""
+        db_schedule, _ = self.get_or_create_schedule(schedule)
         return db_schedule
 
+    def get_or_create_schedule(self, schedule: SchedulePdtCreate) -> Tuple[ScheduleModel, bool]:
+        """
+        Return (schedule, created) for the schedule's user and date.
+        The INSERT ... ON CONFLICT DO NOTHING makes retries and concurrent
+        requests resolve to the same row instead of creating duplicates.
+        """
+        schedule_id = self.db.scalar(
+            insert(ScheduleModel)
+            .values(**schedule.model_dump())
+            .on_conflict_do_nothing(index_elements=["user_id", "date"])
+            .returning(ScheduleModel.id)
+        )
+        created = schedule_id is not None
+        if created:
+            # The Core INSERT skips the session's flush hooks, so invalidate the cached views explicitly
+            invalidate_after_commit(self.db, days=[(schedule.user_id, schedule.date.date())])
+        else:
+            schedule_id = self.db.scalar(
+                select(ScheduleModel.id).where(
+                    ScheduleModel.user_id == schedule.user_id,
+                    ScheduleModel.date == schedule.date
+                )
+            )
+        self.db.commit()
+        return self.db.get(ScheduleModel, schedule_id), created
+
     def get_schedules(self, skip: int = 0, limit: int = 100) -> List[ScheduleModel]:
         """Get all schedules with pagination"""
         return self.db.query(ScheduleModel).offset(skip).limit(limit).all()
@@ -51,6 +94,631 @@ class ScheduleService:
         self.db.commit()
         return True
 
+    def iter_schedule_export(
+        self,
+        user_id: str,
+        since: Optional[date] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a user's schedules with their tasks, one export dict per schedule.
+
+        Schedules and scheduled tasks come from a single outer-joined query
+        read in batches of batch_size rows, so memory stays flat no matter
+        how many days the user has.
+        """
+        query = select(
+            ScheduleModel.id.label("schedule_id"),
+            ScheduleModel.date,
+            ScheduleModel.user_id,
+            ScheduledTaskModel.task_id,
+            ScheduledTaskModel.status,
+            ScheduledTaskModel.priority,
+            ScheduledTaskModel.note
+        ).outerjoin(
+            ScheduledTaskModel, ScheduledTaskModel.schedule_id == ScheduleModel.id
+        ).where(
+            ScheduleModel.user_id == user_id
+        ).order_by(
+            ScheduleModel.date, ScheduleModel.id, ScheduledTaskModel.id
+        ).execution_options(yield_per=batch_size)
+        
+        if since:
+            query = query.where(ScheduleModel.date >= since)
+        
+        rows = self.db.execute(query)
+        for _, schedule_rows in groupby(rows, key=lambda row: row.schedule_id):
+            schedule_rows = list(schedule_rows)
+            first = schedule_rows[0]
+            yield {
+                "date": first.date.isoformat() if first.date else None,
+                "user_id": first.user_id,
+                "tasks": [
+                    {
+                        "task_id": row.task_id,
+                        "status": row.status.value if row.status else None,
+                        "priority": row.priority,
+                        "note": row.note
+                    }
+                    for row in schedule_rows if row.task_id is not None
+                ]
+            }
+
+    def import_schedules(self, schedules_data: List[Dict[str, Any]], chunk_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Import schedules and their tasks in a handful of set-based statements.
+
+        Existing (user_id, date) schedules and (schedule_id, task_id) pairs are
+        prefetched, new rows are written with multi-row INSERTs, and one result
+        is returned per entry in schedules_data. The caller commits.
+        """
+        results: List[Dict[str, Any]] = []
+        entries = []
+        for index, schedule_data in enumerate(schedules_data):
+            try:
+                key = (str(schedule_data["user_id"]), _parse_datetime(schedule_data["date"]))
+                tasks = schedule_data.get("tasks") or []
+                if not isinstance(tasks, list):
+                    raise TypeError("tasks must be a list")
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                results.append({"index": index, "status": "error", "error": f"Invalid schedule entry: {e}"})
+                continue
+            
+            result = {
+                "index": index,
+                "user_id": key[0],
+                "date": key[1].isoformat(),
+                "status": "existing",
+                "schedule_id": None,
+                "tasks_created": 0,
+                "tasks_skipped": 0,
+                "task_errors": []
+            }
+            results.append(result)
+            entries.append((result, key, tasks))
+        
+        schedule_ids, created_keys = self._get_or_create_schedules([key for _, key, _ in entries], chunk_size)
+        
+        task_ids = {
+            task.get("task_id") for _, _, tasks in entries for task in tasks
+            if isinstance(task, dict) and isinstance(task.get("task_id"), int)
+        }
+        known_task_ids = self._existing_task_ids(task_ids, chunk_size)
+        existing_pairs = self._existing_scheduled_pairs(set(schedule_ids.values()), chunk_size)
+        
+        new_rows = []
+        for result, key, tasks in entries:
+            schedule_id = schedule_ids[key]
+            result["schedule_id"] = schedule_id
+            if key in created_keys:
+                result["status"] = "created"
+                created_keys.discard(key)  # Later duplicates of the entry reuse the schedule
+            
+            for task_index, task_data in enumerate(tasks):
+                try:
+                    task_id = task_data["task_id"]
+                    if task_id not in known_task_ids:
+                        raise ValueError(f"Task {task_id} not found")
+                    row = {
+                        "schedule_id": schedule_id,
+                        "task_id": task_id,
+                        "date": key[1],
+                        "status": _parse_status(task_data.get("status")),
+                        "priority": task_data.get("priority", 0),
+                        "note": task_data.get("note")
+                    }
+                except (KeyError, TypeError, ValueError) as e:
+                    result["task_errors"].append({"task_index": task_index, "error": str(e)})
+                    continue
+                
+                if (schedule_id, task_id) in existing_pairs:
+                    result["tasks_skipped"] += 1
+                    continue
+                existing_pairs.add((schedule_id, task_id))
+                new_rows.append(row)
+                result["tasks_created"] += 1
+        
+        self._insert_scheduled_tasks(new_rows, chunk_size)
+        invalidate_after_commit(self.db, days=[(key[0], key[1].date()) for _, key, _ in entries])
+        return results
+    
+    def _insert_scheduled_tasks(self, rows: List[Dict[str, Any]], chunk_size: int):
+        """Write scheduled task rows with one multi-row INSERT per chunk"""
+        for start in range(0, len(rows), chunk_size):
+            task_ids = self.db.scalars(
+                insert(ScheduledTaskModel).values(rows[start:start + chunk_size]).on_conflict_do_nothing()
+                .returning(ScheduledTaskModel.task_id)
+            ).all()
+            apply_counter_deltas(self.db, count_by_task(task_ids, "scheduled_count"))
+    
+    def _get_or_create_schedules(
+        self, keys: List[Tuple[str, datetime]], chunk_size: int
+    ) -> Tuple[Dict[Tuple[str, datetime], int], set]:
+        """Map (user_id, date) keys to schedule IDs, inserting the missing schedules"""
+        unique_keys = list(dict.fromkeys(keys))
+        schedule_ids = self._existing_schedule_ids(unique_keys, chunk_size)
+        
+        missing = [key for key in unique_keys if key not in schedule_ids]
+        created_keys = set()
+        for start in range(0, len(missing), chunk_size):
+            rows = self.db.execute(
+                insert(ScheduleModel)
+                .values([{"user_id": user_id, "date": day} for user_id, day in missing[start:start + chunk_size]])
+                .on_conflict_do_nothing(index_elements=["user_id", "date"])
+                .returning(ScheduleModel.id, ScheduleModel.user_id, ScheduleModel.date)
+            ).all()
+            for row in rows:
+                schedule_ids[(row.user_id, row.date)] = row.id
+                created_keys.add((row.user_id, row.date))
+        
+        # Rows skipped by ON CONFLICT were created concurrently; read them back
+        still_missing = [key for key in missing if key not in schedule_ids]
+        if still_missing:
+            schedule_ids.update(self._existing_schedule_ids(still_missing, chunk_size))
+        
+        return schedule_ids, created_keys
+    
+    def _existing_schedule_ids(self, keys: List[Tuple[str, datetime]], chunk_size: int) -> Dict[Tuple[str, datetime], int]:
+        """Look up schedule IDs by (user_id, date)"""
+        schedule_ids = {}
+        for start in range(0, len(keys), chunk_size):
+            rows = self.db.execute(
+                select(ScheduleModel.id, ScheduleModel.user_id, ScheduleModel.date)
+                .where(tuple_(ScheduleModel.user_id, ScheduleModel.date).in_(keys[start:start + chunk_size]))
+                .order_by(ScheduleModel.id)
+            ).all()
+            for row in rows:
+                schedule_ids.setdefault((row.user_id, row.date), row.id)
+        return schedule_ids
+    
+    def _existing_task_ids(self, task_ids: set, chunk_size: int) -> set:
+        """Return the subset of task_ids that exist"""
+        candidates = list(task_ids)
+        existing = set()
+        for start in range(0, len(candidates), chunk_size):
+            existing.update(self.db.scalars(
+                select(TaskModel.id).where(TaskModel.id.in_(candidates[start:start + chunk_size]))
+            ))
+        return existing
+    
+    def _existing_scheduled_pairs(self, schedule_ids: set, chunk_size: int) -> set:
+        """Return the (schedule_id, task_id) pairs already scheduled on schedule_ids"""
+        ids = list(schedule_ids)
+        pairs = set()
+        for start in range(0, len(ids), chunk_size):
+            pairs.update(self.db.execute(
+                select(ScheduledTaskModel.schedule_id, ScheduledTaskModel.task_id)
+                .where(ScheduledTaskModel.schedule_id.in_(ids[start:start + chunk_size]))
+            ).tuples())
+        return pairs
+
+    def create_recurrence_rule(self, rule: RecurrenceRulePdtCreate) -> Optional[RecurrenceRuleModel]:
+        """Create a recurrence rule; returns None when the task does not exist"""
+        task = self.db.query(TaskModel).filter(TaskModel.id == rule.task_id).first()
+        if not task:
+            return None
+        
+        db_rule = RecurrenceRuleModel(**rule.model_dump(exclude={"rrule"}))
+        self.db.add(db_rule)
+        self.db.commit()
+        self.db.refresh(db_rule)
+        return db_rule
+
+    def get_recurrence_rules(
+        self, user_id: Optional[str] = None, skip: int = 0, limit: int = 100
+    ) -> List[RecurrenceRuleModel]:
+        """Get recurrence rules, optionally for one user"""
+        query = self.db.query(RecurrenceRuleModel)
+        if user_id:
+            query = query.filter(RecurrenceRuleModel.user_id == user_id)
+        return query.order_by(RecurrenceRuleModel.id).offset(skip).limit(limit).all()
+
+    def get_recurrence_rule_by_id(self, rule_id: int) -> Optional[RecurrenceRuleModel]:
+        """Get a specific recurrence rule by ID"""
+        return self.db.query(RecurrenceRuleModel).filter(RecurrenceRuleModel.id == rule_id).first()
+
+    def update_recurrence_rule(
+        self, rule_id: int, rule_update: RecurrenceRulePdtUpdate
+    ) -> Optional[RecurrenceRuleModel]:
+        """Update a recurrence rule; days already materialized are left as they are"""
+        rule = self.get_recurrence_rule_by_id(rule_id)
+        if not rule:
+            return None
+        
+        update_data = rule_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(rule, field, value)
+        
+        self.db.commit()
+        self.db.refresh(rule)
+        return rule
+
+    def delete_recurrence_rule(self, rule_id: int) -> bool:
+        """Delete a recurrence rule, keeping the scheduled tasks it created"""
+        rule = self.get_recurrence_rule_by_id(rule_id)
+        if not rule:
+            return False
+        
+        self.db.delete(rule)
+        self.db.commit()
+        return True
+
+    def materialize_recurrences(self, end: date, user_id: Optional[str] = None, chunk_size: int = 1000) -> int:
+        """
+        Expand active recurrence rules into schedules and pending scheduled
+        tasks up to end (inclusive), optionally for one user only.
+
+        Every rule continues from the day after its materialized_until, so
+        days are expanded once and tasks deleted by the user do not come
+        back. A rule expanded for the first time starts no earlier than
+        today in its user's timezone, so a rule created with a past
+        start_date does not backfill days that are already over. Rows are
+        written with the bulk helpers used by the import.
+        Returns the number of scheduled tasks created.
+        """
+        end = min(end, date.today() + timedelta(days=MAX_MATERIALIZE_DAYS_AHEAD))
+        query = select(RecurrenceRuleModel).where(
+            RecurrenceRuleModel.is_active.is_(True),
+            RecurrenceRuleModel.start_date <= end,
+            or_(
+                RecurrenceRuleModel.materialized_until.is_(None),
+                RecurrenceRuleModel.materialized_until < end
+            )
+        ).order_by(RecurrenceRuleModel.id).with_for_update()  # Concurrent readers wait instead of expanding twice
+        if user_id:
+            query = query.where(RecurrenceRuleModel.user_id == user_id)
+        
+        rules = self.db.scalars(query).all()
+        if not rules:
+            return 0
+        
+        new_rule_users = {rule.user_id for rule in rules if rule.materialized_until is None}
+        local_todays = _local_todays(self.db, new_rule_users)
+        
+        occurrences = []
+        expanded_rule_ids = []
+        for rule in rules:
+            if rule.materialized_until:
+                start = rule.materialized_until + timedelta(days=1)
+            else:
+                start = max(rule.start_date, local_todays[rule.user_id])
+                if start > end:
+                    continue  # Only past days requested; leave the rule for its first future expansion
+            expanded_rule_ids.append(rule.id)
+            for day in expand_rule(rule, start, end):
+                occurrences.append(((rule.user_id, datetime.combine(day, time.min)), rule.task_id, rule.priority))
+        
+        schedule_ids, _ = self._get_or_create_schedules([key for key, _, _ in occurrences], chunk_size)
+        existing_pairs = self._existing_scheduled_pairs(set(schedule_ids.values()), chunk_size)
+        
+        new_rows = []
+        for key, task_id, priority in occurrences:
+            schedule_id = schedule_ids[key]
+            if (schedule_id, task_id) in existing_pairs:
+                continue
+            existing_pairs.add((schedule_id, task_id))
+            new_rows.append({
+                "schedule_id": schedule_id,
+                "task_id": task_id,
+                "date": key[1],
+                "status": TaskStatusEnum.PENDING,
+                "priority": priority
+            })
+        
+        self._insert_scheduled_tasks(new_rows, chunk_size)
+        invalidate_after_commit(self.db, days=[(key[0], key[1].date()) for key, _, _ in occurrences])
+        self.db.execute(
+            update(RecurrenceRuleModel)
+            .where(RecurrenceRuleModel.id.in_(expanded_rule_ids))
+            .values(materialized_until=end)
+        )
+        self.db.commit()
+        return len(new_rows)
+
+    def get_scheduled_tasks_in_range(self, user_id: str, start: date, end: date) -> List[ScheduledTaskModel]:
+        """Get a user's scheduled tasks between two days, expanding recurrence rules first"""
+        self.materialize_recurrences(end, user_id)
+        return self.db.query(ScheduledTaskModel).join(
+            ScheduleModel, ScheduledTaskModel.schedule_id == ScheduleModel.id
+        ).filter(
+            ScheduleModel.user_id == user_id,
+            ScheduleModel.date >= datetime.combine(start, time.min),
+            ScheduleModel.date <= datetime.combine(end, time.max)
+        ).order_by(ScheduleModel.date, ScheduledTaskModel.priority, ScheduledTaskModel.id).all()
+
+    def get_day_view(self, user_id: str, day: date) -> bytes:
+        """
+        Get a user's schedule for one day with its tasks, task titles/types and
+        completion state, serialized as JSON. Built from one joined column
+        query and cached per (user_id, day) until a write touches that day.
+        """
+        key = (user_id, day)
+        cached = day_view_cache.get_view(key)
+        if cached is not None:
+            return cached
+        
+        day_start = datetime.combine(day, time.min)
+        day_end = datetime.combine(day, time.max)
+        completed_that_day = exists().where(
+            TaskCompletionModel.task_id == ScheduledTaskModel.task_id,
+            TaskCompletionModel.user_id == ScheduleModel.user_id,
+            TaskCompletionModel.completion_date >= day_start,
+            TaskCompletionModel.completion_date <= day_end
+        )
+        rows = self.db.execute(
+            select(
+                ScheduleModel.id.label("schedule_id"),
+                ScheduleModel.date.label("schedule_date"),
+                ScheduledTaskModel.id,
+                ScheduledTaskModel.task_id,
+                TaskModel.title,
+                TaskModel.type,
+                ScheduledTaskModel.status,
+                ScheduledTaskModel.priority,
+                ScheduledTaskModel.note,
+                ScheduledTaskModel.completed_at,
+                completed_that_day.label("has_completion")
+            ).outerjoin(
+                ScheduledTaskModel, ScheduledTaskModel.schedule_id == ScheduleModel.id
+            ).outerjoin(
+                TaskModel, TaskModel.id == ScheduledTaskModel.task_id
+            ).where(
+                ScheduleModel.user_id == user_id,
+                ScheduleModel.date >= day_start,
+                ScheduleModel.date <= day_end
+            ).order_by(ScheduleModel.id, ScheduledTaskModel.priority, ScheduledTaskModel.id)
+        ).all()
+        
+        view = DayViewPdtModel(
+            user_id=user_id,
+            date=day,
+            schedule=DayViewSchedulePdtModel(id=rows[0].schedule_id, date=rows[0].schedule_date) if rows else None,
+            tasks=[
+                DayViewTaskPdtModel(
+                    id=row.id,
+                    task_id=row.task_id,
+                    title=row.title,
+                    type=row.type,
+                    status=row.status,
+                    priority=row.priority,
+                    note=row.note,
+                    completed_at=row.completed_at,
+                    is_completed=row.status == TaskStatusEnum.COMPLETE or row.has_completion
+                )
+                for row in rows if row.id is not None
+            ]
+        )
+        content = view.model_dump_json().encode()
+        day_view_cache.set_view(key, {row.schedule_id for row in rows}, content)
+        return content
+
+    def get_calendar(self, user_id: str, year: int, month: int) -> bytes:
+        """
+        Get per-day scheduled/completed/skipped/failed counts and completion
+        rate for every day of a month as JSON. Computed with one GROUP BY and
+        cached per (user_id, month) until a write touches one of its days.
+        """
+        key = (user_id, year, month)
+        cached = calendar_cache.get_view(key)
+        if cached is not None:
+            return cached
+        
+        days_in_month = calendar.monthrange(year, month)[1]
+        month_start = datetime(year, month, 1)
+        month_end = datetime.combine(date(year, month, days_in_month), time.max)
+        day = cast(ScheduleModel.date, Date)
+        
+        def count_status(*statuses):
+            return func.count(ScheduledTaskModel.id).filter(ScheduledTaskModel.status.in_(statuses))
+        
+        rows = self.db.execute(
+            select(
+                day.label("day"),
+                func.array_agg(func.distinct(ScheduleModel.id)).label("schedule_ids"),
+                func.count(ScheduledTaskModel.id).label("scheduled_count"),
+                count_status(TaskStatusEnum.COMPLETE).label("completed_count"),
+                count_status(TaskStatusEnum.SKIPPED).label("skipped_count"),
+                count_status(TaskStatusEnum.FAIL).label("failed_count")
+            ).outerjoin(
+                ScheduledTaskModel, ScheduledTaskModel.schedule_id == ScheduleModel.id
+            ).where(
+                ScheduleModel.user_id == user_id,
+                ScheduleModel.date >= month_start,
+                ScheduleModel.date <= month_end
+            ).group_by(day)
+        ).all()
+        by_day = {row.day: row for row in rows}
+        
+        days = []
+        for day_number in range(1, days_in_month + 1):
+            current = date(year, month, day_number)
+            row = by_day.get(current)
+            if row is None:
+                days.append(CalendarDayPdtModel(date=current))
+                continue
+            days.append(CalendarDayPdtModel(
+                date=current,
+                scheduled_count=row.scheduled_count,
+                completed_count=row.completed_count,
+                skipped_count=row.skipped_count,
+                failed_count=row.failed_count,
+                completion_rate=round(row.completed_count * 100 / row.scheduled_count) if row.scheduled_count else 0
+            ))
+        
+        content = CalendarPdtModel(user_id=user_id, month=f"{year:04d}-{month:02d}", days=days).model_dump_json().encode()
+        calendar_cache.set_view(key, {schedule_id for row in rows for schedule_id in row.schedule_ids}, content)
+        return content
+
+    def get_scheduled_tasks_with_relationships(
+        self,
+        date: Optional[str] = None,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> bytes:
+        """
+        Get scheduled tasks with their task and schedule details as JSON.
+        Only the returned columns are selected and rows are serialized straight
+        from the result mappings, without building ORM objects.
+        """
+        query = select(
+            ScheduledTaskModel.id,
+            ScheduledTaskModel.task_id,
+            ScheduledTaskModel.schedule_id,
+            ScheduledTaskModel.status,
+            ScheduledTaskModel.priority,
+            ScheduledTaskModel.note,
+            TaskModel.title.label("task_title"),
+            TaskModel.description.label("task_description"),
+            TaskModel.type.label("task_type"),
+            ScheduleModel.date.label("schedule_date"),
+            ScheduleModel.user_id.label("schedule_user_id")
+        ).join(
+            TaskModel, TaskModel.id == ScheduledTaskModel.task_id
+        ).join(
+            ScheduleModel, ScheduleModel.id == ScheduledTaskModel.schedule_id
+        ).order_by(ScheduledTaskModel.id).offset(skip).limit(limit)
+        
+        if date:
+            query = query.where(ScheduleModel.date == date)
+        if user_id:
+            query = query.where(ScheduleModel.user_id == user_id)
+        
+        result = [
+            {
+                "id": row["id"],
+                "task_id": row["task_id"],
+                "schedule_id": row["schedule_id"],
+                "status": row["status"].value if row["status"] else None,
+                "priority": row["priority"],
+                "note": row["note"],
+                "task": {
+                    "id": row["task_id"],
+                    "title": row["task_title"],
+                    "description": row["task_description"],
+                    "type": row["task_type"].value if row["task_type"] else None
+                },
+                "schedule": {
+                    "id": row["schedule_id"],
+                    "date": row["schedule_date"].isoformat() if row["schedule_date"] else None,
+                    "user_id": row["schedule_user_id"]
+                }
+            }
+            for row in self.db.execute(query).mappings()
+        ]
+        return json.dumps(result).encode()
+
+    def bulk_update_status(self, items: List[ScheduledTaskStatusItem]) -> Dict[str, Any]:
+        """
+        Apply many status changes with one UPDATE ... FROM (VALUES ...) RETURNING.
+        Tasks that become complete get a task completion and their streak
+        advanced in the same transaction; achievement counters follow per user.
+        """
+        latest = {item.scheduled_task_id: item for item in items}  # Last entry per task wins
+        changes = values(
+            column("id", Integer), column("status", String), column("note", Text), name="changes"
+        ).data([(item.scheduled_task_id, item.status.name, item.note) for item in latest.values()])
+        
+        new_status = cast(changes.c.status, ScheduledTaskModel.status.type)
+        previous = aliased(ScheduledTaskModel)  # Joined row still shows the pre-update values
+        rows = self.db.execute(
+            update(ScheduledTaskModel)
+            .where(
+                ScheduledTaskModel.id == changes.c.id,
+                previous.id == ScheduledTaskModel.id,
+                ScheduleModel.id == ScheduledTaskModel.schedule_id
+            )
+            .values(
+                status=new_status,
+                note=func.coalesce(changes.c.note, ScheduledTaskModel.note),
+                completed_at=case(
+                    (new_status == TaskStatusEnum.COMPLETE, func.coalesce(ScheduledTaskModel.completed_at, func.now())),
+                    else_=None
+                ),
+                updated_at=func.now()
+            )
+            .returning(
+                ScheduledTaskModel.id,
+                ScheduledTaskModel.task_id,
+                ScheduledTaskModel.schedule_id,
+                ScheduledTaskModel.date,
+                ScheduledTaskModel.status,
+                ScheduledTaskModel.note,
+                ScheduledTaskModel.completed_at,
+                previous.status.label("previous_status"),
+                ScheduleModel.user_id
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        invalidate_after_commit(self.db, schedule_ids={row.schedule_id for row in rows})
+        
+        newly_completed = [
+            row for row in rows
+            if row.status == TaskStatusEnum.COMPLETE and row.previous_status != TaskStatusEnum.COMPLETE
+        ]
+        completions = self._record_completions(newly_completed)
+        self.db.commit()
+        
+        # Counters live in their own transaction, one per user
+        achievements = AchievementService(self.db)
+        for user_id, updates in self._counter_updates(completions).items():
+            achievements.apply_counter_updates(user_id, updates)
+        
+        updated_ids = {row.id for row in rows}
+        return {
+            "updated": rows,
+            "not_found": [task_id for task_id in latest if task_id not in updated_ids],
+            "completions_created": len(completions)
+        }
+    
+    def _record_completions(self, completed_rows) -> List[Tuple[TaskCompletionModel, UserTaskStreakModel]]:
+        """Add a completion per newly completed scheduled task and advance the matching streaks"""
+        if not completed_rows:
+            return []
+        
+        now = datetime.now()
+        pairs = list({(row.user_id, row.task_id) for row in completed_rows})
+        streaks: Dict[Tuple[str, int], UserTaskStreakModel] = {}
+        for streak in self.db.query(UserTaskStreakModel).filter(
+            tuple_(UserTaskStreakModel.user_id, UserTaskStreakModel.task_id).in_(pairs)
+        ).order_by(UserTaskStreakModel.id):
+            streaks.setdefault((streak.user_id, streak.task_id), streak)
+        
+        recorded = []
+        # Streaks only move forward in time, so apply each task's completions in date order
+        for row in sorted(completed_rows, key=lambda row: row.date):
+            # Counted on the scheduled day, at the time the user acted
+            completion_date = datetime.combine(row.date.date(), now.time())
+            completion = TaskCompletionModel(
+                task_id=row.task_id,
+                user_id=row.user_id,
+                completion_date=completion_date,
+                note=row.note
+            )
+            self.db.add(completion)
+            
+            streak = streaks.get((row.user_id, row.task_id))
+            if streak is None:
+                streak = streaks[(row.user_id, row.task_id)] = new_streak(row.task_id, row.user_id, completion_date)
+                self.db.add(streak)
+            else:
+                advance_streak(streak, completion_date)
+            recorded.append((completion, streak))
+        
+        self.db.flush()  # One batched INSERT/UPDATE per table
+        return recorded
+    
+    @staticmethod
+    def _counter_updates(completions) -> Dict[str, Dict[str, int]]:
+        """Sum the achievement counter updates of the recorded completions per user"""
+        updates: Dict[str, Dict[str, int]] = {}
+        for completion, streak in completions:
+            user_updates = updates.setdefault(completion.user_id, {})
+            for metric, value in completion_counter_updates(completion.completion_date).items():
+                user_updates[metric] = user_updates.get(metric, 0) + value
+            user_updates["max_streak"] = max(user_updates.get("max_streak", 0), streak.longest_streak)
+        return updates
+
     def create_scheduled_task(self, scheduled_task: ScheduledTaskPdtCreate) -> Optional[ScheduledTaskModel]:
         """Create a new scheduled task"""
         # Check if task exists
@@ -119,3 +787,44 @@ class ScheduleService:
         self.db.delete(scheduled_task)
         self.db.commit()
         return True
+
+
+def _local_todays(db: Session, user_ids) -> Dict[str, date]:
+    """Today's date in each user's timezone; UTC for unknown users and timezones"""
+    timezones = dict(db.execute(
+        select(UserModel.user_id, UserModel.timezone).where(UserModel.user_id.in_(user_ids))
+    ).tuples().all()) if user_ids else {}
+    now = datetime.now(ZoneInfo("UTC"))
+    todays = {}
+    for user_id in user_ids:
+        try:
+            todays[user_id] = now.astimezone(ZoneInfo(timezones.get(user_id) or "UTC")).date()
+        except (ZoneInfoNotFoundError, ValueError):
+            todays[user_id] = now.date()
+    return todays
+
+
+def _parse_datetime(value) -> datetime:
+    """
+    Parse an exported schedule date (YYYY-MM-DD or ISO datetime) into the
+    naive UTC form the schedules.date column stores, so it matches the keys
+    read back from the database.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+    return value
+
+
+def _parse_status(value) -> TaskStatusEnum:
+    """Accept a status by value ("pending") or by name ("PENDING")"""
+    if value is None:
+        return TaskStatusEnum.PENDING
+    try:
+        return TaskStatusEnum(value)
+    except ValueError:
+        try:
+            return TaskStatusEnum[str(value).upper()]
+        except KeyError:
+            raise ValueError(f"Invalid status {value}")
@@ -0,0 +1,136 @@
+"""
+Caches of per-user schedule views: the day view
+(GET /schedules/day/{user_id}/{day}) and the month calendar
+(GET /schedules/calendar/{user_id}).
+
+Entries hold the serialized response and the schedules it was built from.
+They are invalidated after commit whenever a session flushes a change to
+a schedule, scheduled task or task completion of that user and day, and
+cleared entirely when a task definition changes. Core bulk statements do
+not go through the session, so their callers invalidate explicitly.
+"""
+from datetime import date, datetime
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from schedules.models import ScheduleModel
+from tasks.models import ScheduledTaskModel, TaskCompletionModel, TaskModel
+
+DayKey = Tuple[str, date]
+
+
+class ScheduleViewCache(TTLCache):
+    """
+    TTLCache of serialized views covering one or more (user_id, day) pairs.
+    key_for_day maps a (user_id, day) pair to the key of the view showing it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, key_for_day: Callable[[str, date], Hashable]):
+        super().__init__(maxsize, ttl)
+        self.key_for_day = key_for_day
+
+    def set_view(self, key: Hashable, schedule_ids: Iterable[int], content: bytes):
+        """Store a serialized view together with the schedules it shows"""
+        self.set(key, (frozenset(schedule_ids), content))
+
+    def get_view(self, key: Hashable) -> Optional[bytes]:
+        """Return the serialized view, if cached"""
+        entry = self.get(key)
+        return entry[1] if entry else None
+
+    def invalidate_days(self, days: Iterable[DayKey]):
+        """Drop the views showing the given (user_id, day) pairs"""
+        for key in {self.key_for_day(user_id, day) for user_id, day in days}:
+            self.invalidate(key)
+
+    def invalidate_schedules(self, schedule_ids: Iterable[int]):
+        """Drop every view showing one of the given schedules"""
+        schedule_ids = set(schedule_ids)
+        if schedule_ids:
+            self.invalidate_where(lambda key: self._shows_any(key, schedule_ids))
+
+    def _shows_any(self, key: Hashable, schedule_ids: set) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not entry[1][0].isdisjoint(schedule_ids)
+
+
+day_view_cache = ScheduleViewCache(
+    maxsize=settings.schedule_cache_size,
+    ttl=settings.schedule_cache_ttl_seconds,
+    key_for_day=lambda user_id, day: (user_id, day)
+)
+
+calendar_cache = ScheduleViewCache(
+    maxsize=settings.schedule_cache_size,
+    ttl=settings.schedule_cache_ttl_seconds,
+    key_for_day=lambda user_id, day: (user_id, day.year, day.month)
+)
+
+VIEW_CACHES: List[ScheduleViewCache] = [day_view_cache, calendar_cache]
+
+
+def _as_day(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _values(obj, attribute: str):
+    """Current and previous values of an attribute within the flush"""
+    history = inspect(obj).attrs[attribute].history
+    return [value for value in (*history.unchanged, *history.added, *history.deleted) if value is not None]
+
+
+def _pending_changes(session: Session) -> dict:
+    return session.info.setdefault("schedule_view_changes", {"days": set(), "schedules": set(), "clear": False})
+
+
+def invalidate_after_commit(
+    session: Session, days: Iterable[DayKey] = (), schedule_ids: Iterable[int] = (), clear: bool = False
+):
+    """Invalidate cached views once the session commits; for writes made with Core statements"""
+    pending = _pending_changes(session)
+    pending["days"].update(days)
+    pending["schedules"].update(schedule_ids)
+    pending["clear"] = pending["clear"] or clear
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_view_changes(session: Session, flush_context):
+    pending = _pending_changes(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ScheduleModel):
+            pending["schedules"].add(obj.id)
+            for user_id in _values(obj, "user_id"):
+                for day in _values(obj, "date"):
+                    pending["days"].add((user_id, _as_day(day)))
+        elif isinstance(obj, ScheduledTaskModel):
+            pending["schedules"].update(_values(obj, "schedule_id"))
+        elif isinstance(obj, TaskCompletionModel):
+            for user_id in _values(obj, "user_id"):
+                for day in _values(obj, "completion_date"):
+                    pending["days"].add((user_id, _as_day(day)))
+        elif isinstance(obj, TaskModel):
+            pending["clear"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_view_changes(session: Session):
+    pending = session.info.pop("schedule_view_changes", None)
+    if not pending:
+        return
+    for cache in VIEW_CACHES:
+        if pending["clear"]:
+            cache.clear()
+            continue
+        cache.invalidate_days(pending["days"])
+        cache.invalidate_schedules(pending["schedules"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_view_changes(session: Session):
+    session.info.pop("schedule_view_changes", None)
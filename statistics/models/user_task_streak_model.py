@@ -1,10 +1,10 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 
 
-class UserTaskStreakModel(BaseModel):
+class UserTaskStreakModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "user_task_streaks"
     
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
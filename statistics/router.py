@@ -5,9 +5,12 @@ from datetime import datetime, date, timezone
 
 from core.database import get_db
 from statistics.models import UserTaskStreakModel
-from tasks.models import TaskCompletionModel, TaskModel
+from tasks.models import TaskCompletionModel
+from tasks.cache import task_exists
 from tasks.pydantics import TaskCompletionPdtModel, TaskCompletionPdtCreate, TaskCompletionPdtUpdate
 from .pydantics import UserTaskStreakPdtModel, UserTaskStreakPdtCreate, UserTaskStreakPdtUpdate
+from .streaks import new_streak, advance_streak
+from achievements.service import AchievementService
 from logging_config import monitor_endpoint_queries
 from n_plus_one_detector import analyze_queries, monitor_n_plus_one
 
@@ -19,8 +22,7 @@ router = APIRouter(prefix="/statistics", tags=["statistics"])
 def create_task_completion(completion: TaskCompletionPdtCreate, db: Session = Depends(get_db)):
     """Create a new task completion"""
     # Check if task exists
-    task = db.query(TaskModel).filter(TaskModel.id == completion.task_id).first()
-    if not task:
+    if not task_exists(db, completion.task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     
     db_completion = TaskCompletionModel(
@@ -37,7 +39,12 @@ def create_task_completion(completion: TaskCompletionPdtCreate, db: Session = De
     db.refresh(db_completion)
     
     # Update streak after completion
-    update_streak(completion.task_id, completion.user_id, completion.completion_date, db)
+    streak = update_streak(completion.task_id, completion.user_id, completion.completion_date, db)
+    
+    # Advance achievement counters server-side
+    AchievementService(db).record_completion(
+        completion.user_id, completion.completion_date, streak.longest_streak
+    )
     
     return db_completion
 
@@ -105,8 +112,12 @@ def delete_task_completion(completion_id: int, db: Session = Depends(get_db)):
     if not completion:
         raise HTTPException(status_code=404, detail="Task completion not found")
     
+    user_id, completion_date = completion.user_id, completion.completion_date
     db.delete(completion)
     db.commit()
+    
+    # Take the completion back out of the achievement counters
+    AchievementService(db).remove_completion(user_id, completion_date)
     return {"message": "Task completion deleted successfully"}
 
 
@@ -211,40 +222,10 @@ def update_streak(task_id: int, user_id: str, completion_date: datetime, db: Ses
     ).first()
     
     if not streak:
-        # Create new streak
-        streak = UserTaskStreakModel(
-            task_id=task_id,
-            user_id=user_id,
-            current_streak=1,
-            longest_streak=1,
-            last_completed_date=completion_date,
-            streak_start_date=completion_date
-        )
-        streak.created_at = datetime.now(timezone.utc)
-        streak.updated_at = datetime.now(timezone.utc)
+        streak = new_streak(task_id, user_id, completion_date)
         db.add(streak)
     else:
-        # Update existing streak
-        if streak.last_completed_date:
-            # Check if completion is consecutive
-            days_diff = (completion_date.date() - streak.last_completed_date.date()).days
-            if days_diff == 1:
-                # Consecutive day - increment streak
-                streak.current_streak += 1
-                if streak.current_streak > streak.longest_streak:
-                    streak.longest_streak = streak.current_streak
-            elif days_diff > 1:
-                # Gap in streak - reset
-                streak.current_streak = 1
-                streak.streak_start_date = completion_date
-        else:
-            # First completion
-            streak.current_streak = 1
-            streak.longest_streak = 1
-            streak.streak_start_date = completion_date
-        
-        streak.last_completed_date = completion_date
-        streak.updated_at = datetime.now(timezone.utc)
+        advance_streak(streak, completion_date)
     
     db.commit()
     return streak
@@ -0,0 +1,43 @@
+"""Streak arithmetic shared by the single and bulk completion paths"""
+from datetime import datetime, timezone
+
+from .models import UserTaskStreakModel
+
+
+def new_streak(task_id: int, user_id: str, completion_date: datetime) -> UserTaskStreakModel:
+    """Streak started by a user's first completion of a task"""
+    streak = UserTaskStreakModel(
+        task_id=task_id,
+        user_id=user_id,
+        current_streak=1,
+        longest_streak=1,
+        last_completed_date=completion_date,
+        streak_start_date=completion_date
+    )
+    streak.created_at = datetime.now(timezone.utc)
+    streak.updated_at = datetime.now(timezone.utc)
+    return streak
+
+
+def advance_streak(streak: UserTaskStreakModel, completion_date: datetime):
+    """Apply one more completion to an existing streak"""
+    if streak.last_completed_date:
+        # Check if completion is consecutive
+        days_diff = (completion_date.date() - streak.last_completed_date.date()).days
+        if days_diff == 1:
+            # Consecutive day - increment streak
+            streak.current_streak += 1
+            if streak.current_streak > streak.longest_streak:
+                streak.longest_streak = streak.current_streak
+        elif days_diff > 1:
+            # Gap in streak - reset
+            streak.current_streak = 1
+            streak.streak_start_date = completion_date
+    else:
+        # First completion
+        streak.current_streak = 1
+        streak.longest_streak = 1
+        streak.streak_start_date = completion_date
+    
+    streak.last_completed_date = completion_date
+    streak.updated_at = datetime.now(timezone.utc)
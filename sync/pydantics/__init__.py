@@ -0,0 +1,7 @@
+# Sync pydantic models package
+
+from .sync_pydantic import SyncPdtResponse
+
+__all__ = [
+    "SyncPdtResponse",
+]
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+
+class SyncPdtResponse(BaseModel):
+    next_token: str  # Pass back as since on the next call
+    has_more: bool  # More changes are waiting; call again right away
+    changes: Dict[str, List[Dict[str, Any]]]  # Created or updated rows per table
+    deleted: Dict[str, List[int]]  # Deleted row IDs per table
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from core.database import get_db
+from .pydantics import SyncPdtResponse
+from .service import SyncService, parse_sync_token
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("/", response_model=SyncPdtResponse)
+def get_changes(
+    user_id: str,
+    since: Optional[str] = Query(None, description="next_token from the previous sync; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get a user's schedules, scheduled tasks, completions, streaks, history and achievements changed since a token"""
+    try:
+        since_token = parse_sync_token(since) if since else (0, 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    
+    return SyncService(db).get_changes(user_id, since_token, limit)
@@ -0,0 +1,111 @@
+from sqlalchemy import select, func, cast, tuple_, BigInteger, String
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Tuple
+
+from core.models import SyncTombstoneModel
+from schedules.models import ScheduleModel
+from tasks.models import ScheduledTaskModel, TaskCompletionModel
+from statistics.models import UserTaskStreakModel
+from history.models import HistoryModel
+from achievements.models import UserAchievementModel
+
+# Change-tracked tables served by the sync API
+SYNC_TABLES = {
+    "schedules": ScheduleModel,
+    "scheduled_tasks": ScheduledTaskModel,
+    "task_completions": TaskCompletionModel,
+    "user_task_streaks": UserTaskStreakModel,
+    "history": HistoryModel,
+    "user_achievements": UserAchievementModel,
+}
+
+# Position in the change stream: (change_xid, change_seq) of the last change served
+SyncToken = Tuple[int, int]
+
+
+def parse_sync_token(token: str) -> SyncToken:
+    """
+    Parse a next_token. Tokens from before change_xid existed are a bare
+    change_seq; every row written back then has change_xid 0.
+    """
+    xid, separator, seq = token.partition(":")
+    return (int(xid), int(seq)) if separator else (0, int(xid))
+
+
+def format_sync_token(token: SyncToken) -> str:
+    return f"{token[0]}:{token[1]}"
+
+
+class SyncService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_changes(self, user_id: str, since: SyncToken = (0, 0), limit: int = 500) -> Dict[str, Any]:
+        """
+        Get a user's rows created, updated or deleted after the position since,
+        reading at most limit rows per table from the change indexes.
+
+        Changes are ordered by (change_xid, change_seq) and only those of
+        transactions older than the oldest one still in flight are served. A
+        transaction that took its change_seq early but commits late is
+        therefore never passed over: its changes are served once it finishes.
+
+        When a table has more than limit changes, the page stops at the lowest
+        position where any table was cut off, so next_token never skips a change.
+        """
+        # Every transaction with a lower ID has finished, so its changes are all visible
+        horizon = self.db.scalar(
+            select(cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String), BigInteger))
+        )
+
+        def changed(table):
+            position = tuple_(table.c.change_xid, table.c.change_seq)
+            return select(*table.c).where(position > tuple_(*since), table.c.change_xid < horizon)
+
+        pages: Dict[str, List[Dict[str, Any]]] = {}
+        for name, model in SYNC_TABLES.items():
+            table = model.__table__
+            query = changed(table)
+            if name == "scheduled_tasks":
+                query = query.join(ScheduleModel, ScheduleModel.id == table.c.schedule_id).where(
+                    ScheduleModel.user_id == user_id
+                )
+            else:
+                query = query.where(table.c.user_id == user_id)
+            pages[name] = [dict(row) for row in self.db.execute(
+                query.order_by(table.c.change_xid, table.c.change_seq).limit(limit)
+            ).mappings()]
+        
+        tombstone_table = SyncTombstoneModel.__table__
+        tombstones = self.db.execute(
+            changed(tombstone_table)
+            .where(tombstone_table.c.user_id == user_id)
+            .order_by(tombstone_table.c.change_xid, tombstone_table.c.change_seq)
+            .limit(limit)
+        ).mappings().all()
+        
+        def position(row) -> SyncToken:
+            return row["change_xid"], row["change_seq"]
+        
+        cut_off = [position(rows[-1]) for rows in pages.values() if len(rows) == limit]
+        if len(tombstones) == limit:
+            cut_off.append(position(tombstones[-1]))
+        until = min(cut_off) if cut_off else None
+        
+        changes = {
+            name: [row for row in rows if until is None or position(row) <= until]
+            for name, rows in pages.items()
+        }
+        deleted: Dict[str, List[int]] = {name: [] for name in SYNC_TABLES}
+        for tombstone in tombstones:
+            if tombstone["table_name"] in deleted and (until is None or position(tombstone) <= until):
+                deleted[tombstone["table_name"]].append(tombstone["row_id"])
+        
+        # A complete page has served every transaction below the horizon
+        next_token = until if until is not None else max(since, (horizon, 0))
+        return {
+            "next_token": format_sync_token(next_token),
+            "has_more": until is not None,
+            "changes": changes,
+            "deleted": deleted,
+        }
@@ -0,0 +1,176 @@
+"""
+In-process cache of the task catalog.
+
+Task definitions change rarely but are read on every task list, task GET
+and completion, so each worker keeps them in memory. Workers agree on
+freshness through a version stamp in system_state: any transaction that
+changes a task bumps the stamp when it commits, and each worker re-reads
+the stamp at most every task_cache_version_check_seconds, dropping its
+entries when the stamp moved. Local writes take effect immediately.
+
+ORM changes to TaskModel are picked up from the session; Core bulk
+statements call invalidate_task_cache so their commit bumps the stamp too.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select, func, cast, BigInteger, Text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from core.models import SystemStateModel
+from .counters import COUNTER_COLUMNS
+from .models import TaskModel
+from .pydantics import TaskPdtModel
+
+CATALOG_VERSION_KEY = "tasks.catalog_version"
+
+
+def _snapshot(task: TaskModel) -> TaskPdtModel:
+    # Usage counters move with every completion; the catalog cache leaves them out
+    return TaskPdtModel.model_validate(task).model_copy(update=dict.fromkeys(COUNTER_COLUMNS))
+
+
+class TaskCatalogCache(TTLCache):
+    """
+    TTLCache of task snapshots by ID and serialized list pages, tagged with
+    the catalog version they were read at.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, version_check_interval: float):
+        super().__init__(maxsize, ttl)
+        self.version_check_interval = version_check_interval
+        self.version: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+        self._checked_at = float("-inf")
+        self._version_lock = threading.Lock()
+
+    def sync_version(self, db: Session, force: bool = False) -> Tuple[str, Optional[datetime]]:
+        """Return the catalog (version, last_modified), re-reading the stamp when it is due"""
+        with self._version_lock:
+            due = force or time.monotonic() - self._checked_at >= self.version_check_interval
+            if not due and self.version is not None:
+                return self.version, self.last_modified
+
+        row = db.execute(
+            select(SystemStateModel.value, SystemStateModel.updated_at, SystemStateModel.created_at)
+            .where(SystemStateModel.key == CATALOG_VERSION_KEY)
+        ).first()
+        version = (row.value if row else None) or "0"
+        last_modified = (row.updated_at or row.created_at) if row else None
+        self._adopt(version, last_modified)
+        return version, last_modified
+
+    def _adopt(self, version: str, last_modified: Optional[datetime]):
+        with self._version_lock:
+            if version != self.version:
+                self.clear()
+            self.version = version
+            self.last_modified = last_modified
+            self._checked_at = time.monotonic()
+
+    def get_task(self, db: Session, task_id: int) -> Optional[TaskPdtModel]:
+        """Return a task by ID, reading through to the database on a miss"""
+        version, _ = self.sync_version(db)
+        task = self.get(("task", task_id))
+        if task is not None:
+            return task
+
+        db_task = db.get(TaskModel, task_id)
+        if db_task is None:
+            return None
+        task = _snapshot(db_task)
+        if self.version == version:
+            self.set(("task", task_id), task)
+        return task
+
+    def get_tasks(self, db: Session, task_ids: List[int]) -> Dict[int, TaskPdtModel]:
+        """Return the existing tasks among task_ids, reading all misses in one query"""
+        version, _ = self.sync_version(db)
+        tasks = {task_id: self.get(("task", task_id)) for task_id in task_ids}
+        missing = [task_id for task_id, task in tasks.items() if task is None]
+        if missing:
+            for db_task in db.scalars(select(TaskModel).where(TaskModel.id.in_(missing))):
+                tasks[db_task.id] = _snapshot(db_task)
+                if self.version == version:
+                    self.set(("task", db_task.id), tasks[db_task.id])
+        return {task_id: task for task_id, task in tasks.items() if task is not None}
+
+    def get_task_list(self, db: Session, skip: int, limit: int) -> Tuple[bytes, str, Optional[datetime]]:
+        """Return (serialized page, version, last_modified) of the task list"""
+        version, last_modified = self.sync_version(db)
+        content = self.get(("list", skip, limit))
+        if content is not None:
+            return content, version, last_modified
+
+        tasks: List[TaskModel] = db.query(TaskModel).order_by(TaskModel.id).offset(skip).limit(limit).all()
+        snapshots = [_snapshot(task) for task in tasks]
+        content = json.dumps([snapshot.model_dump(mode="json") for snapshot in snapshots]).encode()
+        if self.version == version:
+            self.set(("list", skip, limit), content)
+            for snapshot in snapshots:
+                self.set(("task", snapshot.id), snapshot)
+        return content, version, last_modified
+
+
+task_cache = TaskCatalogCache(
+    maxsize=settings.task_cache_size,
+    ttl=settings.task_cache_ttl_seconds,
+    version_check_interval=settings.task_cache_version_check_seconds
+)
+
+
+def task_exists(db: Session, task_id: int) -> bool:
+    """Existence check for callers that only need to know the task is there"""
+    return task_cache.get_task(db, task_id) is not None
+
+
+def invalidate_task_cache(session: Session):
+    """Bump the catalog version when the session commits; for writes made with Core statements"""
+    session.info["task_catalog_changed"] = True
+
+
+def _bump_catalog_version(session: Session) -> Tuple[str, datetime]:
+    stmt = insert(SystemStateModel).values(key=CATALOG_VERSION_KEY, value="1")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={
+            "value": cast(cast(func.coalesce(SystemStateModel.value, "0"), BigInteger) + 1, Text),
+            "updated_at": func.now(),
+        }
+    ).returning(SystemStateModel.value, func.now())
+    return tuple(session.execute(stmt).one())
+
+
+@event.listens_for(Session, "before_commit")
+def _stamp_task_changes(session: Session):
+    changed = session.info.get("task_catalog_changed") or any(
+        isinstance(obj, TaskModel) for obj in (*session.new, *session.dirty, *session.deleted)
+    )
+    if changed:
+        session.info["task_catalog_version"] = _bump_catalog_version(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_changes(session: Session, flush_context):
+    if any(isinstance(obj, TaskModel) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["task_catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_task_changes(session: Session):
+    session.info.pop("task_catalog_changed", None)
+    stamp = session.info.pop("task_catalog_version", None)
+    if stamp:
+        task_cache._adopt(*stamp)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_task_changes(session: Session):
+    session.info.pop("task_catalog_changed", None)
+    session.info.pop("task_catalog_version", None)
@@ -0,0 +1,196 @@
+"""
+Denormalized per-task counters.
+
+tasks.completion_count, tasks.scheduled_count and tasks.active_streak_count
+mirror COUNTs over task_completions, scheduled_tasks and the running
+(current_streak > 0) rows of user_task_streaks. They are kept up to date
+in the same transaction as the write that moves them:
+
+- ORM writes are picked up after every flush, and the net change per task
+  is applied with one UPDATE ... FROM VALUES.
+- Core bulk statements report their changes through apply_counter_deltas.
+
+Anything that bypasses both, such as ON DELETE CASCADE or manual SQL, is
+corrected by repair_task_counters, which the app runs periodically.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, inspect, select, update, func, values, column, bindparam, or_, Integer
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from statistics.models import UserTaskStreakModel
+from .models import TaskModel, TaskCompletionModel, ScheduledTaskModel
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = ["completion_count", "scheduled_count", "active_streak_count"]
+
+# task_id -> counter column -> delta
+CounterDeltas = Dict[int, Dict[str, int]]
+
+
+def _old_and_new(obj, attribute: str):
+    """(committed value, current value) of an attribute within a flush"""
+    history = inspect(obj).attrs[attribute].history
+    unchanged = history.unchanged[0] if history.unchanged else None
+    old = history.deleted[0] if history.deleted else unchanged
+    new = history.added[0] if history.added else unchanged
+    return old, new
+
+
+def _is_active(streak_length: Optional[int]) -> bool:
+    return (streak_length or 0) > 0
+
+
+def _track(deltas: CounterDeltas, obj, state: str, counter: str, counts=lambda obj, which: True):
+    """
+    Record the counter change of one flushed row. counts(obj, "old"/"new")
+    says whether the row's old or new version is counted at all.
+    """
+    old_task_id, new_task_id = _old_and_new(obj, "task_id")
+    if state != "new" and old_task_id is not None and counts(obj, "old"):
+        deltas[old_task_id][counter] -= 1
+    if state != "deleted" and new_task_id is not None and counts(obj, "new"):
+        deltas[new_task_id][counter] += 1
+
+
+def _streak_counts(streak, which: str) -> bool:
+    old, new = _old_and_new(streak, "current_streak")
+    return _is_active(old if which == "old" else new)
+
+
+def apply_counter_deltas(session: Session, deltas: CounterDeltas):
+    """Apply counter changes to the tasks table in the session's transaction"""
+    rows = sorted(
+        (task_id, *(changes.get(name, 0) for name in COUNTER_COLUMNS))
+        for task_id, changes in deltas.items()
+        if any(changes.get(name, 0) for name in COUNTER_COLUMNS)
+    )
+    if not rows:
+        return
+    tasks = TaskModel.__table__
+    # Core statements on the connection: this also runs from inside a flush
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        v = values(
+            column("task_id", Integer), *(column(name, Integer) for name in COUNTER_COLUMNS), name="counter_deltas"
+        ).data(rows)
+        connection.execute(
+            update(tasks)
+            .where(tasks.c.id == v.c.task_id)
+            .values({
+                **{name: tasks.c[name] + v.c[name] for name in COUNTER_COLUMNS},
+                "updated_at": tasks.c.updated_at,  # Counters are not an edit of the task
+            })
+        )
+        return
+    # Elsewhere (SQLite test runs) one UPDATE per task, in task_id order like the above
+    connection.execute(
+        update(tasks)
+        .where(tasks.c.id == bindparam("delta_task_id"))
+        .values({
+            **{name: tasks.c[name] + bindparam(f"delta_{name}") for name in COUNTER_COLUMNS},
+            "updated_at": tasks.c.updated_at,
+        }),
+        [
+            {"delta_task_id": task_id, **{f"delta_{name}": delta for name, delta in zip(COUNTER_COLUMNS, counts)}}
+            for task_id, *counts in rows
+        ]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_rows(session: Session, flush_context):
+    deltas: CounterDeltas = defaultdict(lambda: defaultdict(int))
+    for state, objects in (("new", session.new), ("dirty", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            if isinstance(obj, TaskCompletionModel):
+                _track(deltas, obj, state, "completion_count")
+            elif isinstance(obj, ScheduledTaskModel):
+                _track(deltas, obj, state, "scheduled_count")
+            elif isinstance(obj, UserTaskStreakModel):
+                _track(deltas, obj, state, "active_streak_count", _streak_counts)
+    if deltas:
+        apply_counter_deltas(session, deltas)
+
+
+def count_by_task(task_ids: Iterable[int], counter: str, sign: int = 1) -> CounterDeltas:
+    """Deltas for rows added (sign=1) or removed (sign=-1), one task_id per row"""
+    deltas: CounterDeltas = defaultdict(lambda: defaultdict(int))
+    for task_id in task_ids:
+        deltas[task_id][counter] += sign
+    return deltas
+
+
+def _actual_counts(first_id: int, last_id: int):
+    """Subquery of the true counters of tasks first_id..last_id"""
+    def counted(model, *conditions):
+        return select(func.count()).where(model.task_id == TaskModel.id, *conditions).scalar_subquery()
+
+    return select(
+        TaskModel.id.label("task_id"),
+        counted(TaskCompletionModel).label("completion_count"),
+        counted(ScheduledTaskModel).label("scheduled_count"),
+        counted(UserTaskStreakModel, UserTaskStreakModel.current_streak > 0).label("active_streak_count"),
+    ).where(TaskModel.id.between(first_id, last_id)).subquery()
+
+
+def repair_task_counters(db: Session, chunk_size: int = 1000) -> int:
+    """
+    Recompute the counters of every task, one ID range per transaction,
+    rewriting only the rows that drifted. Returns the number of tasks fixed.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        chunk_ids = db.scalars(
+            select(TaskModel.id).where(TaskModel.id > last_id).order_by(TaskModel.id).limit(chunk_size)
+        ).all()
+        if not chunk_ids:
+            return repaired
+
+        actual = _actual_counts(chunk_ids[0], chunk_ids[-1])
+        result = db.execute(
+            update(TaskModel)
+            .where(
+                TaskModel.id == actual.c.task_id,
+                or_(*(getattr(TaskModel, name) != getattr(actual.c, name) for name in COUNTER_COLUMNS))
+            )
+            .values({
+                **{name: getattr(actual.c, name) for name in COUNTER_COLUMNS},
+                "updated_at": TaskModel.updated_at,
+            })
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        repaired += result.rowcount
+        last_id = chunk_ids[-1]
+
+
+def run_counter_repair() -> int:
+    """Run one repair pass in a session of its own"""
+    db = SessionLocal()
+    try:
+        repaired = repair_task_counters(db)
+        if repaired:
+            logger.warning(f"Repaired drifted counters on {repaired} tasks")
+        return repaired
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_counter_repair_periodically(interval_minutes: float):
+    """Run the counter repair every interval_minutes until cancelled"""
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        try:
+            await asyncio.to_thread(run_counter_repair)
+        except Exception:
+            logger.exception("Task counter repair failed")
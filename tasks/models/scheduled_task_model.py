@@ -1,11 +1,11 @@
 from sqlalchemy import Column, DateTime, Enum, ForeignKey, Text, Integer
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 from .enums import TaskStatusEnum
 
 
-class ScheduledTaskModel(BaseModel):
+class ScheduledTaskModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "scheduled_tasks"
     
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -1,15 +1,15 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedMixin
 
 
-class TaskCompletionModel(BaseModel):
+class TaskCompletionModel(ChangeTrackedMixin, BaseModel):
     __tablename__ = "task_completions"
     
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     user_id = Column(String(50), nullable=False)
-    completion_date = Column(DateTime, nullable=False)
+    completion_date = Column(DateTime, nullable=False, index=True)
     note = Column(Text, nullable=True)
     
     # Relationships
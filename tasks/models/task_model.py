@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Enum
+from sqlalchemy import Column, String, Enum, Integer
 from sqlalchemy.orm import relationship
 
 from core.models import BaseModel
@@ -8,9 +8,16 @@ from .enums import TaskTypeEnum
 class TaskModel(BaseModel):
     __tablename__ = "tasks"
     
-    title = Column(String(200), nullable=False)
+    # Exact lookups use this index; fuzzy search uses the ix_tasks_title_trgm
+    # GIN index, which needs pg_trgm and is created by migration only
+    title = Column(String(200), nullable=False, index=True)
     type = Column(Enum(TaskTypeEnum), default=TaskTypeEnum.OTHER)
     
+    # Denormalized counters maintained by tasks.counters
+    completion_count = Column(Integer, nullable=False, default=0, server_default="0")
+    scheduled_count = Column(Integer, nullable=False, default=0, server_default="0")
+    active_streak_count = Column(Integer, nullable=False, default=0, server_default="0")  # Streaks currently running
+    
     # Relationships
     scheduled_tasks = relationship("ScheduledTaskModel", back_populates="task")
     completions = relationship("TaskCompletionModel", back_populates="task")
@@ -3,6 +3,7 @@
 from .task_pydantic import (
     TaskPdtBase,
     TaskPdtCreate,
+    TaskImportRecord,
     TaskPdtUpdate,
     TaskPdtModel,
     TaskBulkImportItem,
@@ -15,6 +16,10 @@ from .scheduled_task_pydantic import (
     ScheduledTaskPdtCreate,
     ScheduledTaskPdtUpdate,
     ScheduledTaskPdtModel,
+    ScheduledTaskStatusItem,
+    ScheduledTaskBulkStatusRequest,
+    ScheduledTaskStatusResult,
+    ScheduledTaskBulkStatusResponse,
 )
 
 from .task_completion_pydantic import (
@@ -28,6 +33,7 @@ __all__ = [
     # Task models
     "TaskPdtBase",
     "TaskPdtCreate", 
+    "TaskImportRecord",
     "TaskPdtUpdate",
     "TaskPdtModel",
     "TaskBulkImportItem",
@@ -39,6 +45,10 @@ __all__ = [
     "ScheduledTaskPdtCreate",
     "ScheduledTaskPdtUpdate", 
     "ScheduledTaskPdtModel",
+    "ScheduledTaskStatusItem",
+    "ScheduledTaskBulkStatusRequest",
+    "ScheduledTaskStatusResult",
+    "ScheduledTaskBulkStatusResponse",
     
     # Task completion models
     "TaskCompletionPdtBase",
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 from tasks.models.enums import TaskStatusEnum
 from .task_pydantic import TaskPdtModel
@@ -34,3 +34,31 @@ class ScheduledTaskPdtModel(ScheduledTaskPdtBaseModel):
     
     class Config:
         from_attributes = True
+
+
+class ScheduledTaskStatusItem(BaseModel):
+    scheduled_task_id: int
+    status: TaskStatusEnum
+    note: Optional[str] = None  # Keeps the current note when omitted
+
+
+class ScheduledTaskBulkStatusRequest(BaseModel):
+    items: List[ScheduledTaskStatusItem] = Field(..., min_length=1, max_length=1000)
+
+
+class ScheduledTaskStatusResult(BaseModel):
+    id: int
+    task_id: int
+    schedule_id: int
+    status: TaskStatusEnum
+    note: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ScheduledTaskBulkStatusResponse(BaseModel):
+    updated: List[ScheduledTaskStatusResult]
+    not_found: List[int]
+    completions_created: int
@@ -13,6 +13,10 @@ class TaskPdtCreate(TaskPdtBase):
     pass
 
 
+class TaskImportRecord(TaskPdtCreate):
+    description: Optional[str] = None  # Import files (CSV, NDJSON, MessagePack) also carry the description
+
+
 class TaskPdtUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     type: Optional[TaskTypeEnum] = None
@@ -22,6 +26,10 @@ class TaskPdtModel(TaskPdtBase):
     id: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Usage counters; None where the endpoint serves the cached catalog without them
+    completion_count: Optional[int] = None
+    scheduled_count: Optional[int] = None
+    active_streak_count: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 
-from core.database import get_db
+from core.database import get_db, SessionLocal
 from . import pydantics as pydantic_models
+from . import search, transfer
+from .cache import task_cache
 from .service import TaskService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100  # Errors reported back per import
+
 
 # Task definition endpoints
 @router.post("/", response_model=pydantic_models.TaskPdtModel)
@@ -43,17 +52,148 @@ def bulk_import_tasks(
 
 
 @router.get("/", response_model=List[pydantic_models.TaskPdtModel])
-def get_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all task definitions"""
+def get_tasks(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    with_counters: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Get all task definitions
+    
+    Served from the task cache. The ETag and Last-Modified headers follow
+    the catalog version, so clients revalidating with If-None-Match or
+    If-Modified-Since get a 304 while nothing changed. Usage counters are
+    only filled in with with_counters, which reads the database directly.
+    """
+    if with_counters:
+        service = TaskService(db)
+        return service.get_tasks(skip=skip, limit=limit)
+    
+    content, version, last_modified = task_cache.get_task_list(db, skip, limit)
+    headers = {"ETag": f'"tasks-{version}-{skip}-{limit}"', "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = headers["ETag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] \
+            or if_none_match.strip() == "*"
+    else:
+        not_modified = last_modified is not None and _not_modified_since(
+            request.headers.get("if-modified-since"), last_modified
+        )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _not_modified_since(header: Optional[str], last_modified: datetime) -> bool:
+    """Whether an If-Modified-Since header is at or after last_modified (second precision)"""
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+@router.get("/search", response_model=List[pydantic_models.TaskPdtModel])
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Search task titles by substring or similarity, prefix matches first (for type-ahead)"""
+    return search.search_tasks(db, q, limit)
+
+
+@router.get("/export")
+def export_tasks(format: str = Query("ndjson", pattern="^(ndjson|csv|msgpack)$")):
+    """
+    Export all task definitions as NDJSON, CSV or MessagePack.
+    
+    The catalog is streamed straight from a server-side cursor, so exports
+    of any size run in constant memory. The output can be fed back to
+    POST /tasks/import unchanged.
+    """
+    if format == "msgpack" and transfer.msgpack is None:
+        raise HTTPException(status_code=400, detail="MessagePack export is not available on this server")
+    
+    def generate():
+        # The request session is closed once the endpoint returns, so the
+        # stream reads through a session of its own
+        db = SessionLocal()
+        try:
+            yield from transfer.encode_records(TaskService(db).iter_task_export(), format)
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type=transfer.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv|msgpack|json)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Import task definitions, skipping titles that already exist.
+    
+    The body is parsed as it is uploaded, in the format given by format or
+    the Content-Type header (NDJSON, CSV, MessagePack, or the legacy
+    {"tasks": [...]} JSON document), and written in batches of
+    IMPORT_BATCH_SIZE tasks. Everything is committed at the end.
+    """
     service = TaskService(db)
-    return service.get_tasks(skip=skip, limit=limit)
+    imported_count = skipped_count = 0
+    errors: List[str] = []
+    
+    async def flush(batch):
+        nonlocal imported_count, skipped_count
+        imported, skipped, batch_errors = await run_in_threadpool(service.import_task_records, batch)
+        imported_count += imported
+        skipped_count += skipped
+        errors.extend(batch_errors[:MAX_IMPORT_ERRORS - len(errors)])
+    
+    try:
+        batch = []
+        records = transfer.decode_records(
+            request.stream(), format or transfer.format_for_media_type(request.headers.get("content-type"))
+        )
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+        await run_in_threadpool(db.commit)
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
+    
+    return {
+        "message": f"Successfully imported {imported_count} tasks",
+        "imported_count": imported_count,
+        "skipped_count": skipped_count,
+        "errors": errors,
+    }
 
 
 @router.get("/{task_id}", response_model=pydantic_models.TaskPdtModel)
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    """Get a specific task definition"""
-    service = TaskService(db)
-    task = service.get_task_by_id(task_id)
+def get_task(task_id: int, with_counters: bool = False, db: Session = Depends(get_db)):
+    """Get a specific task definition; usage counters are only filled in with with_counters"""
+    task = TaskService(db).get_task_by_id(task_id) if with_counters else task_cache.get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -79,55 +219,6 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
     return {"message": "Task deleted successfully"}
 
 
-@router.post("/export")
-def export_tasks_to_json(db: Session = Depends(get_db)):
-    """Export all tasks to JSON format"""
-    service = TaskService(db)
-    tasks = service.get_tasks()
-    
-    export_data = []
-    for task in tasks:
-        task_data = {
-            "title": task.title,
-            "description": task.description,
-            "category": task.category,
-            "difficulty": task.difficulty,
-            "estimated_duration": task.estimated_duration,
-            "tags": task.tags,
-            "is_template": task.is_template
-        }
-        export_data.append(task_data)
-    
-    return {"tasks": export_data}
-
-
-@router.post("/import")
-def import_tasks_from_json(import_data: dict, db: Session = Depends(get_db)):
-    """Import tasks from JSON format"""
-    try:
-        tasks_data = import_data.get("tasks", [])
-        service = TaskService(db)
-        imported_count = 0
-        
-        for task_data in tasks_data:
-            # Check if task already exists by title
-            from .models import TaskModel
-            existing_task = db.query(TaskModel).filter(
-                TaskModel.title == task_data["title"]
-            ).first()
-            
-            if not existing_task:
-                from tasks.pydantics import TaskPdtCreate
-                task_create = TaskPdtCreate(**task_data)
-                service.create_task(task_create)
-                imported_count += 1
-        
-        return {"message": f"Successfully imported {imported_count} tasks"}
-    
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Import failed: {str(e)}")
-
-
 # Scheduled task endpoints
 @router.post("/scheduled", response_model=pydantic_models.ScheduledTaskPdtModel)
 def create_scheduled_task(scheduled_task: pydantic_models.ScheduledTaskPdtCreate, db: Session = Depends(get_db)):
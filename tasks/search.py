@@ -0,0 +1,126 @@
+"""
+Fuzzy task title search for type-ahead.
+
+On Postgres with pg_trgm the search runs against the ix_tasks_title_trgm
+GIN index, matching substrings (ILIKE) and similar titles (the % operator)
+and ranking prefix matches first, then by similarity(). Elsewhere, such as
+SQLite test runs or a server without the extension, an in-memory trigram
+index over all titles gives the same matching and ranking. That index is
+rebuilt whenever the task catalog version moves (see tasks.cache).
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func, or_, exists, text
+from sqlalchemy.orm import Session
+
+from .cache import task_cache
+from .models import TaskModel
+from .pydantics import TaskPdtModel
+
+# Default of pg_trgm.similarity_threshold, used by the % operator
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> Set[str]:
+    """Trigrams of a string the way pg_trgm extracts them: per lowercased word, padded"""
+    result = set()
+    for word in _WORD.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(left: Set[str], right: Set[str]) -> float:
+    """pg_trgm similarity(): shared trigrams over all distinct trigrams"""
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class TrigramIndex:
+    """Inverted index from trigram to task IDs over the whole catalog"""
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self._titles: Dict[int, str] = {}
+        self._trigrams: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, version: str, rows: List[Tuple[int, str]]):
+        """Replace the indexed titles with (task_id, title) rows"""
+        titles, task_trigrams, postings = {}, {}, {}
+        for task_id, title in rows:
+            titles[task_id] = title
+            task_trigrams[task_id] = trigrams(title)
+            for trigram in task_trigrams[task_id]:
+                postings.setdefault(trigram, set()).add(task_id)
+        with self._lock:
+            self.version = version
+            self._titles, self._trigrams, self._postings = titles, task_trigrams, postings
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """IDs of the best matching tasks, ranked like the Postgres search"""
+        needle = query.lower()
+        query_trigrams = trigrams(query)
+        with self._lock:
+            titles, task_trigrams, postings = self._titles, self._trigrams, self._postings
+
+        candidates = set()
+        for trigram in query_trigrams:
+            candidates |= postings.get(trigram, set())
+        if len(needle) < 3 or not candidates:
+            # Too short to share trigrams reliably; substring matching still applies
+            candidates |= {task_id for task_id, title in titles.items() if needle in title.lower()}
+
+        ranked = []
+        for task_id in candidates:
+            title = titles[task_id].lower()
+            score = similarity(query_trigrams, task_trigrams[task_id])
+            if needle in title or score >= SIMILARITY_THRESHOLD:
+                ranked.append((not title.startswith(needle), -score, title, task_id))
+        ranked.sort()
+        return [task_id for *_, task_id in ranked[:limit]]
+
+
+fallback_index = TrigramIndex()
+_trigram_support: Dict[str, bool] = {}
+
+
+def _has_trigram_support(db: Session) -> bool:
+    """Whether the database can serve the search from the pg_trgm index"""
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _trigram_support:
+        _trigram_support[key] = bind.dialect.name == "postgresql" and bool(db.scalar(
+            select(exists().where(text("extname = 'pg_trgm'")).select_from(text("pg_extension")))
+        ))
+    return _trigram_support[key]
+
+
+def search_tasks(db: Session, query: str, limit: int = 20) -> List[TaskPdtModel]:
+    """Tasks whose title contains or resembles query, best matches first"""
+    query = query.strip()
+    if not query:
+        return []
+
+    if _has_trigram_support(db):
+        score = func.similarity(TaskModel.title, query)
+        tasks = db.scalars(
+            select(TaskModel)
+            .where(or_(TaskModel.title.icontains(query, autoescape=True), TaskModel.title.op("%")(query)))
+            .order_by(TaskModel.title.istartswith(query, autoescape=True).desc(), score.desc(), TaskModel.title)
+            .limit(limit)
+        ).all()
+        return [TaskPdtModel.model_validate(task) for task in tasks]
+
+    version, _ = task_cache.sync_version(db)
+    if fallback_index.version != version:
+        fallback_index.rebuild(version, db.execute(select(TaskModel.id, TaskModel.title)).tuples().all())
+    task_ids = fallback_index.search(query, limit)
+    tasks = task_cache.get_tasks(db, task_ids)
+    return [tasks[task_id] for task_id in task_ids if task_id in tasks]
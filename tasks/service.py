@@ -1,5 +1,8 @@
+from sqlalchemy import select, update, insert, func, cast, text, values, column, Integer, String
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
+from pydantic import ValidationError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from .pydantics import (
@@ -8,9 +11,12 @@ from .pydantics import (
     ScheduledTaskPdtCreate, 
     ScheduledTaskPdtUpdate,
     TaskBulkImportItem,
+    TaskImportRecord,
 )
-from .models.enums import TaskStatusEnum as TaskStatus
+from .models.enums import TaskStatusEnum as TaskStatus, TaskTypeEnum
 from tasks.models import TaskModel, ScheduledTaskModel
+from schedules.view_cache import invalidate_after_commit
+from .cache import invalidate_task_cache
 
 
 class TaskService:
@@ -31,67 +37,178 @@ class TaskService:
         self.db.refresh(db_task)
         return db_task
 
-    def bulk_import_tasks(self, tasks: List[TaskBulkImportItem]) -> Tuple[List[TaskModel], List[str], int, int, int]:
+    def bulk_import_tasks(
+        self, tasks: List[TaskBulkImportItem], chunk_size: int = 1000
+    ) -> Tuple[List[TaskModel], List[str], int, int, int]:
         """
         Bulk import tasks from a list
         Returns: (created_tasks, errors, created_count, updated_count, skipped_count)
+        
+        Items whose ID exists update that task, all others are inserted (with
+        their ID when given). Existing IDs are prefetched in one query, then each
+        chunk applies one UPDATE ... FROM VALUES and one multi-row INSERT
+        RETURNING inside a savepoint. A chunk that fails is retried row by row
+        so only its invalid rows are skipped; everything is committed once.
         """
-        created_tasks = []
         errors = []
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
+        requested_ids = [item.id for item in tasks if item.id is not None]
+        existing_ids = set(self.db.scalars(
+            select(TaskModel.id).where(TaskModel.id.in_(set(requested_ids)))
+        )) if requested_ids else set()
+        
+        seen_ids = set()
+        rows = []  # (index, item, is_update)
+        for index, item in enumerate(tasks):
+            if item.id is not None:
+                if item.id in seen_ids:
+                    errors.append(f"Error processing task '{item.title}': duplicate task ID {item.id} in request")
+                    continue
+                seen_ids.add(item.id)
+            rows.append((index, item, item.id in existing_ids))
         
-        for task_item in tasks:
+        imported: Dict[int, TaskModel] = {}
+        failed = set()
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
             try:
-                # If ID is provided, try to update existing task
-                if task_item.id is not None:
-                    existing_task = self.get_task_by_id(task_item.id)
-                    if existing_task:
-                        # Update existing task
-                        existing_task.title = task_item.title
-                        if task_item.type:
-                            existing_task.type = task_item.type.value
-                        existing_task.updated_at = datetime.now(timezone.utc)
-                        self.db.commit()
-                        self.db.refresh(existing_task)
-                        created_tasks.append(existing_task)
-                        updated_count += 1
-                        continue
-                    else:
-                        # ID provided but task doesn't exist, create with specific ID
-                        db_task = TaskModel(
-                            id=task_item.id,
-                            title=task_item.title,
-                            type=task_item.type.value if task_item.type else 'other'
-                        )
-                else:
-                    # No ID provided, create new task with auto-increment
-                    db_task = TaskModel(
-                        title=task_item.title,
-                        type=task_item.type.value if task_item.type else 'other'
-                    )
-                
-                db_task.created_at = datetime.now(timezone.utc)
-                db_task.updated_at = datetime.now(timezone.utc)
-                
-                self.db.add(db_task)
-                self.db.commit()
-                self.db.refresh(db_task)
-                created_tasks.append(db_task)
-                created_count += 1
-                
-            except Exception as e:
-                # Skip this task and log error
-                errors.append(f"Error processing task '{task_item.title}': {str(e)}")
-                skipped_count += 1
-                self.db.rollback()
-        
-        return created_tasks, errors, created_count, updated_count, skipped_count
+                with self.db.begin_nested():
+                    imported.update(self._import_task_rows(chunk))
+            except SQLAlchemyError:
+                # Isolate the invalid rows; the valid ones still go in
+                for row in chunk:
+                    try:
+                        with self.db.begin_nested():
+                            imported.update(self._import_task_rows([row]))
+                    except SQLAlchemyError as e:
+                        failed.add(row[0])
+                        errors.append(f"Error processing task '{row[1].title}': {str(getattr(e, 'orig', None) or e)}")
+        errors.extend(
+            f"Error processing task '{item.title}': task {item.id} was deleted during the import"
+            for index, item, is_update in rows if is_update and index not in imported and index not in failed
+        )
+        
+        if any(item.id is not None and not is_update and index in imported for index, item, is_update in rows):
+            # Explicit IDs bypass the sequence; move it past them
+            self.db.execute(text(
+                "SELECT setval(pg_get_serial_sequence('tasks', 'id'), (SELECT MAX(id) FROM tasks))"
+            ))
+        imported_ids = list({task.id for task in imported.values()})
+        invalidate_after_commit(self.db, clear=True)
+        invalidate_task_cache(self.db)
+        self.db.commit()
+        
+        # Reload the expired tasks in bulk rather than one refresh per task
+        for start in range(0, len(imported_ids), chunk_size):
+            self.db.scalars(select(TaskModel).where(TaskModel.id.in_(imported_ids[start:start + chunk_size]))).all()
+        
+        updated_count = sum(1 for index, _, is_update in rows if is_update and index in imported)
+        created_count = len(imported) - updated_count
+        return (
+            [imported[index] for index in sorted(imported)],
+            errors,
+            created_count,
+            updated_count,
+            len(tasks) - len(imported)
+        )
+
+    def _import_task_rows(self, rows: List[Tuple[int, TaskBulkImportItem, bool]]) -> Dict[int, TaskModel]:
+        """Apply one chunk of bulk import rows; returns the resulting tasks by item index"""
+        now = datetime.now(timezone.utc)
+        imported = {}
+        
+        updates = [(index, item) for index, item, is_update in rows if is_update]
+        if updates:
+            v = values(
+                column("id", Integer), column("title", String), column("type", String), name="imported_tasks"
+            ).data([(item.id, item.title, item.type.name if item.type else None) for _, item in updates])
+            updated = self.db.scalars(
+                update(TaskModel)
+                .where(TaskModel.id == v.c.id)
+                .values(
+                    title=v.c.title,
+                    type=func.coalesce(cast(v.c.type, TaskModel.type.type), TaskModel.type),
+                    updated_at=now
+                )
+                .returning(TaskModel)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            ).all()
+            by_id = {task.id: task for task in updated}
+            # A task deleted since existing_ids was read is not updated; the caller reports it
+            imported.update({index: by_id[item.id] for index, item in updates if item.id in by_id})
+        
+        inserts = [(index, item) for index, item, is_update in rows if not is_update]
+        if inserts:
+            created = self.db.scalars(
+                insert(TaskModel).returning(TaskModel, sort_by_parameter_order=True),
+                [
+                    {
+                        **({"id": item.id} if item.id is not None else {}),
+                        "title": item.title,
+                        "type": item.type or TaskTypeEnum.OTHER,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for _, item in inserts
+                ]
+            ).all()
+            imported.update({index: task for (index, _), task in zip(inserts, created)})
+        
+        return imported
+
+    def iter_task_export(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every task as an export record, in ID order.
+        Rows are read through a server-side cursor batch_size at a time.
+        """
+        rows = self.db.execute(
+            select(TaskModel.title, TaskModel.type, TaskModel.description)
+            .order_by(TaskModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in rows:
+            yield {
+                "title": row.title,
+                "type": row.type.value if row.type else TaskTypeEnum.OTHER.value,
+                "description": row.description,
+            }
+
+    def import_task_records(self, records: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+        """
+        Insert a batch of imported task records, skipping titles that already exist.
+        Existing titles are found with one query and the new tasks are written with
+        one multi-row INSERT; the caller commits.
+        Returns: (imported_count, skipped_count, errors)
+        """
+        errors = []
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            if not isinstance(record, dict):
+                errors.append(f"Invalid task record: {record!r}")
+                continue
+            # CSV leaves absent values as empty strings
+            record = {field: value for field, value in record.items() if value not in ("", None)}
+            try:
+                task = TaskImportRecord.model_validate(record)
+            except ValidationError as e:
+                errors.append(f"Invalid task '{record.get('title')}': {str(e)}")
+                continue
+            candidates.setdefault(task.title, {"title": task.title, "type": task.type, "description": task.description})
+        
+        existing_titles = set(self.db.scalars(
+            select(TaskModel.title).where(TaskModel.title.in_(list(candidates)))
+        )) if candidates else set()
+        new_tasks = [row for title, row in candidates.items() if title not in existing_titles]
+        
+        if new_tasks:
+            now = datetime.now(timezone.utc)
+            self.db.execute(insert(TaskModel).values([{**row, "created_at": now, "updated_at": now} for row in new_tasks]))
+            invalidate_after_commit(self.db, clear=True)
+            invalidate_task_cache(self.db)
+        return len(new_tasks), len(records) - len(new_tasks) - len(errors), errors
 
     def get_tasks(self, skip: int = 0, limit: int = 100) -> List[TaskModel]:
         """Get all tasks with pagination"""
-        return self.db.query(TaskModel).offset(skip).limit(limit).all()
+        return self.db.query(TaskModel).order_by(TaskModel.id).offset(skip).limit(limit).all()
 
     def get_task_by_id(self, task_id: int) -> Optional[TaskModel]:
         """Get a specific task by ID"""
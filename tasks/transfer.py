@@ -0,0 +1,159 @@
+"""
+Wire formats of the task catalog export and import.
+
+Tasks travel as flat records (see EXPORT_FIELDS) in one of three formats:
+NDJSON (one JSON object per line), CSV with a header row, or MessagePack
+(a plain concatenation of maps). Encoders take an iterator of records and
+yield bytes; the decoder consumes an async byte stream and yields records
+as soon as they are complete, so neither side holds the whole catalog.
+"""
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterator
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+EXPORT_FIELDS = ["title", "type", "description"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "msgpack": "application/msgpack",
+}
+
+
+class TransferFormatError(ValueError):
+    """Raised for unsupported formats and malformed payloads"""
+
+
+def format_for_media_type(media_type: str) -> str:
+    """Guess the transfer format from a Content-Type header, defaulting to NDJSON"""
+    media_type = (media_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack"):
+        return "msgpack"
+    if media_type == "application/json":
+        return "json"
+    return "ndjson"
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise TransferFormatError("MessagePack support requires the msgpack package")
+
+
+def encode_records(records: Iterator[Dict[str, Any]], format: str) -> Iterator[bytes]:
+    """Serialize records one by one in the given format"""
+    if format == "ndjson":
+        for record in records:
+            yield (json.dumps(record) + "\n").encode()
+    elif format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    elif format == "msgpack":
+        _require_msgpack()
+        packer = msgpack.Packer()
+        for record in records:
+            yield packer.pack(record)
+    else:
+        raise TransferFormatError(f"Unsupported export format: {format}")
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a UTF-8 byte stream into lines, keeping the line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be a partial line; keep it for the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _decode_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    line_number = 0
+    async for line in _iter_lines(stream):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise TransferFormatError(f"Invalid JSON on line {line_number}: {e}")
+
+
+async def _decode_csv(stream: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    header = None
+    record = ""
+    async for line in _iter_lines(stream):
+        record += line
+        if record.count('"') % 2:
+            continue  # A quoted field spans lines; wait for the rest of the record
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield dict(zip(header, values))
+    if record.strip():
+        raise TransferFormatError("Unterminated quoted field at the end of the CSV")
+
+
+async def _decode_msgpack(stream: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    _require_msgpack()
+    unpacker = msgpack.Unpacker(raw=False)
+    async for chunk in stream:
+        unpacker.feed(chunk)
+        try:
+            for record in unpacker:
+                yield record
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+            raise TransferFormatError(f"Invalid MessagePack data: {e}")
+
+
+async def _decode_json(stream: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    # The legacy {"tasks": [...]} document cannot be parsed incrementally
+    body = b"".join([chunk async for chunk in stream])
+    try:
+        document = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise TransferFormatError(f"Invalid JSON: {e}")
+    for record in document.get("tasks", []) if isinstance(document, dict) else document:
+        yield record
+
+
+DECODERS = {
+    "ndjson": _decode_ndjson,
+    "csv": _decode_csv,
+    "msgpack": _decode_msgpack,
+    "json": _decode_json,
+}
+
+
+def decode_records(stream: AsyncIterator[bytes], format: str) -> AsyncIterator[Dict[str, Any]]:
+    """Parse records out of a byte stream as it arrives"""
+    decoder = DECODERS.get(format)
+    if decoder is None:
+        raise TransferFormatError(f"Unsupported import format: {format}")
+    return decoder(stream)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 
 from core.models import BaseModel
@@ -6,10 +6,17 @@ from core.models import BaseModel
 
 class UserModel(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # The token version sync only reads users who revoked their tokens at least once
+        Index("ix_users_revoked_token_version", "id", "token_version", postgresql_where=text("token_version > 0")),
+    )
     
     user_id = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
+    password_hash = Column(String(255), nullable=True)  # bcrypt; NULL for users that cannot log in
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bump to revoke issued tokens
+    timezone = Column(String(50), nullable=False, default="UTC", server_default="UTC")  # IANA name, e.g. Asia/Ho_Chi_Minh
     
     # Relationships
     streaks = relationship("UserTaskStreakModel", back_populates="user")
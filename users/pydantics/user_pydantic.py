@@ -1,12 +1,25 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, AfterValidator
+from typing import Optional, Annotated
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def _check_timezone(value: str) -> str:
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone {value}")
+    return value
+
+
+TimezoneName = Annotated[str, AfterValidator(_check_timezone)]
 
 
 class UserBasePdtModel(BaseModel):
     user_id: str = Field(..., description="Business logic user ID (like auth ID)")
     name: str = Field(..., min_length=1, max_length=100)
     email: str = Field(..., pattern=r'^[^@]+@[^@]+\.[^@]+$')
+    timezone: TimezoneName = Field("UTC", max_length=50, description="IANA timezone used for end-of-day rollover")
 
 
 class UserPdtCreate(UserBasePdtModel):
@@ -16,6 +29,7 @@ class UserPdtCreate(UserBasePdtModel):
 class UserPdtUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     email: Optional[str] = Field(None, pattern=r'^[^@]+@[^@]+\.[^@]+$')
+    timezone: Optional[TimezoneName] = Field(None, max_length=50)
 
 
 class UserPdtModel(UserBasePdtModel):
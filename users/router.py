@@ -26,7 +26,8 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = UserModel(
         user_id=user.user_id,
         name=user.name,
-        email=user.email
+        email=user.email,
+        timezone=user.timezone
     )
     db_user.created_at = datetime.now(timezone.utc)
     db_user.updated_at = datetime.now(timezone.utc)
@@ -71,6 +72,8 @@ def update_user(user_id: str, user_update: UserUpdate, db: Session = Depends(get
         if existing_email:
             raise HTTPException(status_code=400, detail="Email already registered")
         user.email = user_update.email
+    if user_update.timezone is not None:
+        user.timezone = user_update.timezone
     
     user.updated_at = datetime.now(timezone.utc)
     db.commit()